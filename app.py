@@ -1,70 +1,109 @@
 import sys
 import os
-import certifi
 import logging
+import time
 import pandas as pd
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, UploadFile, Request
+from fastapi import FastAPI, File, UploadFile, Request, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from uvicorn import run as app_run
 
 from networksecurity.exception.exception import NetworkSecurityException
-from networksecurity.logging.logger import logging
+from networksecurity.logging.logger import logging, get_request_logger
 from networksecurity.pipeline.training_pipeline import TrainingPipeline
-from networksecurity.utils.main_utils.utils import load_object
-from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model.estimator import CachedModelLoader
+from networksecurity.serving.prefork import PreforkServer
+from networksecurity.serving import metrics
+from networksecurity.serving.prediction_log import PredictionLog
+from networksecurity.serving.result_store import ResultStore
+from networksecurity.serving.shadow import ShadowScorer
+from networksecurity.cloud.mongo_client import (
+    get_mongo_url,
+    get_async_mongo_client,
+    close_async_mongo_clients,
+)
 from networksecurity.constant.training_pipeline import (
     DATA_INGESTION_COLLECTION_NAME,
     DATA_INGESTION_DATABASE_NAME,
+    PREDICTION_LOG_ENABLED,
+    PREDICTION_LOG_COLLECTION_NAME,
+    PREDICTION_LOG_MAX_QUEUE_ROWS,
+    PREDICTION_LOG_BATCH_SIZE,
+    PREDICTION_LOG_FLUSH_INTERVAL_SECONDS,
+    PREDICTION_LOG_OVERFLOW_POLICY,
+    RESULT_STORE_DIR,
+    RESULT_STORE_CHUNK_ROWS,
+    RESULT_STORE_PAGE_SIZE,
+    RESULT_STORE_MAX_PAGE_SIZE,
+    RESULT_STORE_TTL_SECONDS,
+    SHADOW_MODEL_DIR_ENV_VAR,
+    SHADOW_SAMPLE_RATE,
+    SHADOW_MAX_PENDING,
+    SHADOW_WINDOW_BATCHES,
 )
 
-import pymongo
-
 # ======================================
 # STEP 1: Load environment variables
 # ======================================
 load_dotenv()
-ca = certifi.where()
-
-# Try both possible env variable names for flexibility
-mongo_db_url = os.getenv("MONGODB_URL_KEY") or os.getenv("MONGO_DB_URL")
-
-if not mongo_db_url:
-    raise ValueError(
-        "❌ Environment variable 'MONGODB_URL_KEY' or 'MONGO_DB_URL' is missing.\n"
-        "Please check your .env file and ensure one of these variables is set:\n"
-        "MONGODB_URL_KEY=your_mongo_uri\n"
-        "or\n"
-        "MONGO_DB_URL=your_mongo_uri"
-    )
-
-# Log which variable was used
-if os.getenv("MONGODB_URL_KEY"):
-    logging.info("Using MONGODB_URL_KEY from .env file")
-else:
-    logging.info("Using MONGO_DB_URL from .env file")
 
 # ======================================
 # STEP 2: Connect to MongoDB
 # ======================================
-try:
-    client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca)
-    client.admin.command("ping")
-    logging.info("✅ MongoDB connection successful!")
-except Exception as e:
-    raise NetworkSecurityException(e, sys)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Connects the async MongoDB client on the serving event loop (in every
+    pre-fork worker), so database I/O from routes never blocks the loop.
+    Prediction does not need MongoDB, so the API also starts without it
+    (e.g. for local load tests); only the data source is unavailable then.
+    """
+    app.state.mongo_collection = None
+    app.state.prediction_log = None
+    try:
+        mongo_db_url = get_mongo_url()
+    except ValueError as e:
+        mongo_db_url = None
+        logging.warning(f"{e}; starting without a MongoDB connection")
+
+    if mongo_db_url:
+        try:
+            client = get_async_mongo_client(mongo_db_url)
+            await client.admin.command("ping")
+            app.state.mongo_collection = client[DATA_INGESTION_DATABASE_NAME][DATA_INGESTION_COLLECTION_NAME]
+            logging.info("✅ MongoDB connection successful!")
+        except Exception as e:
+            logging.warning(f"MongoDB is not reachable, continuing without it: {e}")
 
-database = client[DATA_INGESTION_DATABASE_NAME]
-collection = database[DATA_INGESTION_COLLECTION_NAME]
+    # Served predictions are written to MongoDB in the background
+    if PREDICTION_LOG_ENABLED and app.state.mongo_collection is not None:
+        app.state.prediction_log = PredictionLog(
+            client[DATA_INGESTION_DATABASE_NAME][PREDICTION_LOG_COLLECTION_NAME],
+            max_queue_rows=PREDICTION_LOG_MAX_QUEUE_ROWS,
+            batch_size=PREDICTION_LOG_BATCH_SIZE,
+            flush_interval=PREDICTION_LOG_FLUSH_INTERVAL_SECONDS,
+            overflow_policy=PREDICTION_LOG_OVERFLOW_POLICY,
+        )
+        app.state.prediction_log.start()
+    try:
+        yield
+    finally:
+        if app.state.prediction_log is not None:
+            await app.state.prediction_log.close()
+        if shadow_scorer is not None:
+            await shadow_scorer.close()
+        await close_async_mongo_clients()
 
 # ======================================
 # STEP 3: Initialize FastAPI app
 # ======================================
-app = FastAPI(title="Network Security Detection API")
+app = FastAPI(title="Network Security Detection API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -76,18 +115,58 @@ app.add_middleware(
 
 templates = Jinja2Templates(directory="./templates")
 
+# Served model, loaded once and reloaded only when final_model/ changes
+model_loader = CachedModelLoader()
+metrics.register_model_loader(model_loader)
+metrics.register_prediction_log(lambda: getattr(app.state, "prediction_log", None))
+
+# Each /predict result is kept under its own id and rendered one page at a time
+result_store = ResultStore(
+    RESULT_STORE_DIR, chunk_rows=RESULT_STORE_CHUNK_ROWS, ttl_seconds=RESULT_STORE_TTL_SECONDS
+)
+
+# Candidate model scored on a sample of live batches, off the response path
+shadow_model_dir = os.getenv(SHADOW_MODEL_DIR_ENV_VAR)
+shadow_scorer = None
+if shadow_model_dir:
+    shadow_scorer = ShadowScorer(
+        CachedModelLoader(shadow_model_dir),
+        sample_rate=SHADOW_SAMPLE_RATE,
+        max_pending=SHADOW_MAX_PENDING,
+        window_batches=SHADOW_WINDOW_BATCHES,
+    )
+    metrics.register_shadow_scorer(shadow_scorer)
+    logging.info(f"Shadow scoring {SHADOW_SAMPLE_RATE:.0%} of batches with the model in {shadow_model_dir}")
+
+# Per-request messages are rate limited and formatted off the request path
+request_logger = get_request_logger()
+
 # ======================================
 # ROUTES
 # ======================================
 
+def render_result_page(request: Request, result_page):
+    return templates.TemplateResponse(request, "table.html", {
+        "table": result_page.rows.to_html(classes="table table-striped", index=False),
+        "result_id": result_page.result_id,
+        "page": result_page.page,
+        "page_size": result_page.page_size,
+        "n_pages": result_page.n_pages,
+        "n_rows": result_page.n_rows,
+    })
+
+
 @app.get("/", tags=["Root"])
 async def index():
     """Redirect root URL to Swagger docs"""
     return RedirectResponse(url="/docs")
 
 
+# Blocking routes are plain def (run in the threadpool) or hand their work to
+# run_in_threadpool: prefork workers heartbeat from the event loop, and a loop
+# blocked past the heartbeat timeout gets its worker killed mid-request.
 @app.get("/train", tags=["Model Training"])
-async def train_route():
+def train_route():
     """Trigger the training pipeline"""
     try:
         train_pipeline = TrainingPipeline()
@@ -97,35 +176,114 @@ async def train_route():
         raise NetworkSecurityException(e, sys)
 
 
+def score_upload(network_model, file: UploadFile):
+    """
+    Parses and scores an uploaded CSV. CPU bound, so it runs in the threadpool.
+    """
+    stage_seconds = metrics.PREDICT_STAGE_SECONDS
+    # A feature-pruned model only needs some columns; the rest are not parsed
+    with stage_seconds.time(stage="parse"):
+        df = pd.read_csv(file.file, usecols=network_model.required_columns())
+    request_logger.info("Received file with shape: %s", df.shape)
+    scoring_started = time.perf_counter()
+    with stage_seconds.time(stage="transform"):
+        x_transform = network_model.transform(df)
+    with stage_seconds.time(stage="predict"):
+        y_pred = network_model.predict_transformed(x_transform)
+    return df, y_pred, time.perf_counter() - scoring_started
+
+
 @app.post("/predict", tags=["Prediction"])
 async def predict_route(request: Request, file: UploadFile = File(...)):
     """Handle file upload for prediction"""
+    stage_seconds = metrics.PREDICT_STAGE_SECONDS
+    started = time.perf_counter()
     try:
-        df = pd.read_csv(file.file)
-        logging.info(f"Received file with shape: {df.shape}")
+        with metrics.PREDICT_IN_FLIGHT.track_inprogress():
+            if file.size is not None:
+                metrics.PREDICT_REQUEST_BYTES.observe(file.size)
+            # Memory-mapped model artifact if present, else the preprocessor/model pickles
+            with stage_seconds.time(stage="load_model"):
+                network_model = await run_in_threadpool(model_loader.get)
+
+            df, y_pred, scoring_seconds = await run_in_threadpool(score_upload, network_model, file)
+            metrics.PREDICT_ROWS.inc(len(df))
+            if shadow_scorer is not None:
+                # Shallow copy: the candidate sees the features without predicted_column
+                shadow_scorer.submit(
+                    df.copy(deep=False), network_model, model_loader.version, y_pred, scoring_seconds,
+                )
 
-        # Load preprocessor and model
-        preprocessor = load_object("final_model/preprocessor.pkl")
-        final_model = load_object("final_model/model.pkl")
+            # Append predictions
+            df["predicted_column"] = y_pred
+            prediction_log = getattr(request.app.state, "prediction_log", None)
+            if prediction_log is not None:
+                # Only queued here; written to MongoDB off the request path
+                await prediction_log.record(
+                    df, model_version=model_loader.version, latency_seconds=time.perf_counter() - started
+                )
+            with stage_seconds.time(stage="store"):
+                result_id = await run_in_threadpool(result_store.save, df)
 
-        network_model = NetworkModel(preprocessor=preprocessor, model=final_model)
-        y_pred = network_model.predict(df)
+            # Only the first page is rendered; the rest is served by /predictions/{result_id}
+            with stage_seconds.time(stage="render"):
+                response = render_result_page(
+                    request, ResultStore.page_of(df, result_id, 1, RESULT_STORE_PAGE_SIZE)
+                )
+            metrics.PREDICT_REQUESTS.inc(status="ok")
+            return response
 
-        # Append predictions
-        df["predicted_column"] = y_pred
-        df.to_csv("prediction_output/output.csv", index=False)
+    except Exception as e:
+        metrics.PREDICT_REQUESTS.inc(status="error")
+        raise NetworkSecurityException(e, sys)
 
-        # Convert to HTML for display
-        table_html = df.to_html(classes="table table-striped", index=False)
-        return templates.TemplateResponse("table.html", {"request": request, "table": table_html})
 
+@app.get("/predictions/{result_id}", tags=["Prediction"])
+async def prediction_page_route(
+    request: Request,
+    result_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(RESULT_STORE_PAGE_SIZE, ge=1, le=RESULT_STORE_MAX_PAGE_SIZE),
+):
+    """One page of a stored prediction result"""
+    if not result_store.exists(result_id):
+        raise HTTPException(status_code=404, detail="Prediction result not found or expired")
+    try:
+        result_page = await run_in_threadpool(result_store.read_page, result_id, page, page_size)
+        return render_result_page(request, result_page)
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 
+@app.get("/shadow", tags=["Monitoring"])
+async def shadow_route():
+    """Agreement, latency and memory of the live and shadow-scored candidate models"""
+    if shadow_scorer is None:
+        return {"enabled": False, "detail": f"Set {SHADOW_MODEL_DIR_ENV_VAR} to a model directory to enable"}
+    return {"enabled": True, "model_dir": shadow_model_dir, **shadow_scorer.summary()}
+
+
+@app.get("/metrics", tags=["Monitoring"])
+async def metrics_route():
+    """Serving metrics in the Prometheus text format"""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # ======================================
 # STEP 4: Run the app
 # ======================================
 if __name__ == "__main__":
     print("🚀 Starting Network Security FastAPI App...")
-    app_run(app, host="0.0.0.0", port=8000)
+    # WEB_CONCURRENCY > 1 serves from pre-forked workers sharing the loaded model
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        PreforkServer(
+            app,
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+            preload=model_loader.get,
+            model_version=lambda: model_loader.version,
+        ).run()
+    else:
+        app_run(app, host="0.0.0.0", port=8000)
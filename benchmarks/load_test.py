@@ -0,0 +1,287 @@
+"""
+Load generator for the prediction API.
+
+    # open loop, 50 requests/s for 30s against the app in this process
+    python -m benchmarks.load_test --in-process --rate 50 --duration 30
+    # closed loop, 8 concurrent clients against a running server
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 8 --requests 2000
+
+Payloads are replayed from a JSON lines file or synthesized from the schema.
+Each replay line is an object with "rows" (a list of feature dicts) or "csv"
+(CSV text), and optionally "path" (default /predict) and "offset" (seconds
+since the start of the recording, used with --preserve-timing).
+
+In open-loop mode requests are started on a fixed schedule whether or not
+earlier ones finished, and latency is measured from the scheduled start, so a
+stalled server is not hidden by the generator backing off (coordinated
+omission). In closed-loop mode the uncorrected latencies are reported next to
+ones corrected with the expected interval between requests, as HdrHistogram
+does.
+"""
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import TARGET_COLUMN, generate_phishing_data
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+@dataclass
+class Payload:
+    path: str
+    csv: bytes
+    rows: int
+    offset: float = None
+
+
+@dataclass
+class LoadResult:
+    latencies: list = field(default_factory=list)
+    service_times: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    errors: int = 0
+    rows: int = 0
+    dropped: int = 0
+    elapsed: float = 0.0
+
+
+def load_replay(file_path: str, default_path: str) -> list:
+    payloads = []
+    with open(file_path) as file_obj:
+        for line in file_obj:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "csv" in entry:
+                csv_text = entry["csv"]
+                rows = max(0, csv_text.count("\n") - 1)
+            elif "rows" in entry:
+                frame = pd.DataFrame(entry["rows"])
+                csv_text = frame.to_csv(index=False)
+                rows = len(frame)
+            else:
+                raise ValueError(f"Replay line without 'rows' or 'csv': {line[:80]}")
+            payloads.append(Payload(entry.get("path", default_path), csv_text.encode(), rows, entry.get("offset")))
+    if not payloads:
+        raise ValueError(f"No requests found in {file_path}")
+    return payloads
+
+
+def synthesize(n_payloads: int, rows_per_request: int, path: str, seed: int) -> list:
+    frame = generate_phishing_data(n_payloads * rows_per_request, seed=seed).drop(columns=[TARGET_COLUMN])
+    return [
+        Payload(path, frame.iloc[i * rows_per_request:(i + 1) * rows_per_request].to_csv(index=False).encode(),
+                rows_per_request)
+        for i in range(n_payloads)
+    ]
+
+
+def make_client(url: str, app_path: str, timeout: float) -> httpx.AsyncClient:
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=timeout)
+    module_name, _, attribute = app_path.partition(":")
+    app = getattr(importlib.import_module(module_name), attribute or "app")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://in-process", timeout=timeout)
+
+
+async def _send(client, payload: Payload, scheduled: float, result: LoadResult) -> None:
+    sent = time.perf_counter()
+    try:
+        response = await client.post(payload.path, files={"file": ("batch.csv", payload.csv, "text/csv")})
+        status = response.status_code
+    except Exception:
+        status = "error"
+    done = time.perf_counter()
+    result.statuses[status] = result.statuses.get(status, 0) + 1
+    if status != 200:
+        result.errors += 1
+    else:
+        result.rows += payload.rows
+    result.latencies.append(done - scheduled)
+    result.service_times.append(done - sent)
+
+
+async def run_open_loop(client, payloads, rate: float, duration: float, max_requests: int,
+                        poisson: bool, preserve_timing: bool, max_outstanding: int, seed: int) -> LoadResult:
+    """
+    Starts requests on schedule regardless of outstanding ones. Requests that
+    would exceed max_outstanding are counted as dropped instead of queued.
+    """
+    result = LoadResult()
+    rng = random.Random(seed)
+    tasks = set()
+    offsets = [payload.offset for payload in payloads]
+    replay_timing = preserve_timing and None not in offsets
+    if replay_timing:
+        # Loop the recording, one mean interval apart
+        span = offsets[-1] - offsets[0] + (offsets[-1] - offsets[0]) / max(1, len(offsets) - 1)
+        if span <= 0:
+            span = 1.0 / rate
+    start = time.perf_counter()
+    next_offset = 0.0
+
+    for i, payload in enumerate(itertools.cycle(payloads)):
+        if i >= max_requests:
+            break
+        if replay_timing:
+            next_offset = offsets[i % len(payloads)] - offsets[0] + (i // len(payloads)) * span
+        if next_offset > duration:
+            break
+        scheduled = start + next_offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if len(tasks) >= max_outstanding:
+            result.dropped += 1
+        else:
+            task = asyncio.create_task(_send(client, payload, scheduled, result))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if not replay_timing:
+            next_offset += rng.expovariate(rate) if poisson else 1.0 / rate
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run_closed_loop(client, payloads, concurrency: int, duration: float, max_requests: int) -> LoadResult:
+    """
+    concurrency clients each send their next request when the previous one
+    returns.
+    """
+    result = LoadResult()
+    counter = itertools.count()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            if i >= max_requests:
+                return
+            await _send(client, payloads[i % len(payloads)], time.perf_counter(), result)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def corrected_latencies(latencies, expected_interval: float) -> np.ndarray:
+    """
+    Adds the samples a constant-rate client would have seen while a slow
+    response was blocking it (HdrHistogram's recordValueWithExpectedInterval).
+    """
+    values = list(latencies)
+    if expected_interval > 0:
+        for latency in latencies:
+            missed = latency - expected_interval
+            while missed >= expected_interval:
+                values.append(missed)
+                missed -= expected_interval
+    return np.asarray(values)
+
+
+def summarize(result: LoadResult, mode: str, expected_interval: float = None) -> dict:
+    def percentiles(values):
+        values = np.asarray(values)
+        if not len(values):
+            return {}
+        return {f"p{p:g}_ms": float(np.percentile(values, p) * 1000) for p in PERCENTILES}
+
+    completed = len(result.latencies)
+    summary = {
+        "mode": mode,
+        "requests": completed,
+        "errors": result.errors,
+        "dropped": result.dropped,
+        "statuses": {str(status): count for status, count in result.statuses.items()},
+        "elapsed_seconds": result.elapsed,
+        "requests_per_second": completed / result.elapsed if result.elapsed else 0.0,
+        "rows_per_second": result.rows / result.elapsed if result.elapsed else 0.0,
+        "service_time": percentiles(result.service_times),
+    }
+    if mode == "open":
+        # Measured from the scheduled start, so already free of coordinated omission
+        summary["latency"] = percentiles(result.latencies)
+    else:
+        summary["latency_uncorrected"] = percentiles(result.latencies)
+        if expected_interval:
+            summary["latency"] = percentiles(corrected_latencies(result.latencies, expected_interval))
+            summary["expected_interval_ms"] = expected_interval * 1000
+    return summary
+
+
+async def _main(args) -> dict:
+    if args.replay:
+        payloads = load_replay(args.replay, args.path)
+    else:
+        payloads = synthesize(args.synthetic_payloads, args.rows_per_request, args.path, args.seed)
+
+    async with make_client(args.url, args.app, args.timeout) as client:
+        for payload in payloads[:args.warmup]:
+            await client.post(payload.path, files={"file": ("batch.csv", payload.csv, "text/csv")})
+        if args.concurrency:
+            result = await run_closed_loop(client, payloads, args.concurrency, args.duration, args.requests)
+            expected_interval = args.expected_interval_ms / 1000 if args.expected_interval_ms else None
+            if expected_interval is None and result.service_times:
+                # Assume the clients intended to keep the best observed pace
+                expected_interval = float(np.percentile(result.service_times, 50))
+            return summarize(result, "closed", expected_interval)
+        result = await run_open_loop(client, payloads, args.rate, args.duration, args.requests, args.poisson,
+                                     args.preserve_timing, args.max_outstanding, args.seed)
+        return summarize(result, "open")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load generator for the prediction API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="base url of a running server")
+    target.add_argument("--in-process", action="store_true", help="call the ASGI app directly, no network")
+    parser.add_argument("--app", default="app:app", help="module:attribute of the ASGI app for --in-process")
+    parser.add_argument("--path", default="/predict")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rate", type=float, default=10.0, help="open loop: requests started per second")
+    load.add_argument("--concurrency", type=int, help="closed loop: concurrent clients")
+    parser.add_argument("--poisson", action="store_true", help="exponential inter-arrival times")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=sys.maxsize, help="stop after this many requests")
+    parser.add_argument("--max-outstanding", type=int, default=1000)
+    parser.add_argument("--replay", help="JSON lines file of recorded requests")
+    parser.add_argument("--preserve-timing", action="store_true", help="replay with the recorded offsets")
+    parser.add_argument("--rows-per-request", type=int, default=10)
+    parser.add_argument("--synthetic-payloads", type=int, default=200)
+    parser.add_argument("--expected-interval-ms", type=float,
+                        help="closed loop: interval used for coordinated omission correction")
+    parser.add_argument("--warmup", type=int, default=5, help="requests sent before measuring")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(_main(args))
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as file_obj:
+            json.dump(summary, file_obj, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+Benchmarks for every training pipeline stage and the inference path.
+
+    python -m benchmarks.run_benchmarks --scales 10k,1m --batch-sizes 1,100,10000
+
+For each scale a schema-conformant dataset is generated and DataIngestion
+(feature store export and split; the Mongo export needs a server and is not
+timed), DataValidation, DataTransformation, evaluate_models and
+NetworkModel.predict are run in a scratch directory, along with lexical
+feature extraction from raw URLs. Throughput and peak
+memory per stage are appended to a JSON lines history and compared with the
+stored baseline; the exit code is 1 when a stage regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from benchmarks.synthetic_data import TARGET_COLUMN, generate_urls, write_phishing_csv
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.data_transformation import DataTransformation
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.entity.config_entity import (
+    DataIngestionConfig,
+    DataTransformationConfig,
+    DataValidationConfig,
+    TrainingPipelineConfig,
+)
+from networksecurity.utils.main_utils.profiler import RunProfiler
+from networksecurity.utils.main_utils.utils import evaluate_models, load_numpy_array_data, load_object
+from networksecurity.utils.ml_utils.features.url_features import extract_url_features
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model.search import GridSearch
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+# Hyperparameter search cost grows much faster than the other stages, so it
+# runs on a capped sample of the training split
+EVALUATE_MODELS_MAX_ROWS = 20_000
+# URL feature extraction throughput is flat beyond this many URLs
+URL_FEATURES_MAX_ROWS = 1_000_000
+BENCHMARK_MODELS = {
+    "Decision Tree": (DecisionTreeClassifier(random_state=0), {"criterion": ["gini", "entropy"]}),
+    "Random Forest": (RandomForestClassifier(random_state=0, n_jobs=1), {"n_estimators": [16, 64]}),
+    "Logistic Regression": (LogisticRegression(max_iter=200), {}),
+}
+
+
+def _stage_result(stage) -> dict:
+    return {
+        "wall_seconds": stage.wall_seconds,
+        "cpu_seconds": stage.cpu_seconds,
+        "rows": stage.rows,
+        "bytes": stage.bytes,
+        "rows_per_second": stage.rows / stage.wall_seconds if stage.rows and stage.wall_seconds else None,
+        "tracemalloc_peak_bytes": stage.tracemalloc_peak_bytes,
+        "max_rss_bytes": stage.max_rss_bytes,
+    }
+
+
+def _time_inference(network_model, features: pd.DataFrame, batch_size: int, min_seconds: float,
+                    max_repeats: int) -> dict:
+    repeats = int(np.ceil(batch_size / len(features)))
+    batch = pd.concat([features] * repeats, ignore_index=True).iloc[:batch_size] if repeats > 1 else features.iloc[:batch_size]
+    network_model.predict(batch)  # warm up
+
+    timings = []
+    start_time = time.perf_counter()
+    while len(timings) < max_repeats and (time.perf_counter() - start_time < min_seconds or len(timings) < 3):
+        batch_start = time.perf_counter()
+        network_model.predict(batch)
+        timings.append(time.perf_counter() - batch_start)
+    timings = np.asarray(timings)
+    return {
+        "batch_size": batch_size,
+        "repeats": len(timings),
+        "p50_ms": float(np.percentile(timings, 50) * 1000),
+        "p99_ms": float(np.percentile(timings, 99) * 1000),
+        "rows_per_second": float(batch_size / np.median(timings)),
+    }
+
+
+def run_scale(scale_name: str, n_rows: int, batch_sizes, work_dir: str, trace_memory: bool,
+              missing_rate: float, seed: int) -> dict:
+    """
+    Runs every stage on n_rows of synthetic data inside work_dir and returns
+    the per-stage results.
+    """
+    profiler = RunProfiler(trace_memory=trace_memory)
+    results = {}
+    pipeline_config = TrainingPipelineConfig(timestamp=datetime.now())
+
+    raw_file_path = os.path.join(work_dir, "raw", f"phishing_{scale_name}.csv")
+    with profiler.stage("generate_data") as stage:
+        write_phishing_csv(raw_file_path, n_rows, seed=seed, missing_rate=missing_rate)
+        stage.add_rows(n_rows)
+        stage.add_bytes(os.path.getsize(raw_file_path))
+    results["generate_data"] = _stage_result(stage)
+    dataframe = pd.read_csv(raw_file_path)
+
+    ingestion_config = DataIngestionConfig(pipeline_config)
+    data_ingestion = DataIngestion(ingestion_config)
+    with profiler.stage("data_ingestion") as stage:
+        data_ingestion.export_data_into_feature_store(dataframe)
+        data_ingestion.split_data_as_train_test(dataframe)
+        stage.add_rows(len(dataframe))
+        stage.add_bytes(sum(os.path.getsize(path) for path in (
+            ingestion_config.feature_store_file_path,
+            ingestion_config.training_file_path,
+            ingestion_config.testing_file_path,
+        )))
+    results["data_ingestion"] = _stage_result(stage)
+    del dataframe
+    ingestion_artifact = DataIngestionArtifact(
+        trained_file_path=ingestion_config.training_file_path,
+        test_file_path=ingestion_config.testing_file_path,
+    )
+
+    data_validation = DataValidation(ingestion_artifact, DataValidationConfig(pipeline_config))
+    with profiler.stage("data_validation") as stage:
+        validation_artifact = data_validation.initiate_data_validation()
+        stage.add_files(ingestion_artifact.trained_file_path, ingestion_artifact.test_file_path)
+    results["data_validation"] = _stage_result(stage)
+
+    data_transformation = DataTransformation(validation_artifact, DataTransformationConfig(pipeline_config))
+    with profiler.stage("data_transformation") as stage:
+        transformation_artifact = data_transformation.initiate_data_transformation()
+        stage.add_files(ingestion_artifact.trained_file_path, ingestion_artifact.test_file_path)
+    results["data_transformation"] = _stage_result(stage)
+
+    train_arr = load_numpy_array_data(transformation_artifact.transformed_train_file_path)
+    test_arr = load_numpy_array_data(transformation_artifact.transformed_test_file_path)
+    rng = np.random.default_rng(seed)
+    if len(train_arr) > EVALUATE_MODELS_MAX_ROWS:
+        train_arr = train_arr[rng.choice(len(train_arr), EVALUATE_MODELS_MAX_ROWS, replace=False)]
+    if len(test_arr) > EVALUATE_MODELS_MAX_ROWS:
+        test_arr = test_arr[rng.choice(len(test_arr), EVALUATE_MODELS_MAX_ROWS, replace=False)]
+    models = {name: model for name, (model, _) in BENCHMARK_MODELS.items()}
+    params = {name: grid for name, (_, grid) in BENCHMARK_MODELS.items()}
+    with profiler.stage("evaluate_models") as stage:
+        evaluate_models(train_arr[:, :-1], train_arr[:, -1], test_arr[:, :-1], test_arr[:, -1],
+                        models, params, search_strategy=GridSearch(cv=3, n_jobs=-1), profiler=profiler)
+        stage.add_rows(len(train_arr) + len(test_arr))
+    results["evaluate_models"] = _stage_result(stage)
+
+    network_model = NetworkModel(
+        preprocessor=load_object(transformation_artifact.transformed_object_file_path),
+        model=models["Random Forest"],
+    )
+    features = pd.read_csv(ingestion_artifact.test_file_path, nrows=max(batch_sizes)).drop(columns=[TARGET_COLUMN])
+    for batch_size in batch_sizes:
+        with profiler.stage(f"inference.batch_{batch_size}") as stage:
+            inference = _time_inference(network_model, features, batch_size, min_seconds=1.0, max_repeats=1000)
+        result = _stage_result(stage)
+        result.update(inference)
+        results[f"inference.batch_{batch_size}"] = result
+
+    urls = generate_urls(min(n_rows, URL_FEATURES_MAX_ROWS), seed=seed)
+    with profiler.stage("url_features") as stage:
+        extract_url_features(urls)
+        stage.add_rows(len(urls))
+    results["url_features"] = _stage_result(stage)
+    with profiler.stage("predict_urls") as stage:
+        network_model.predict_urls(urls[:max(batch_sizes)])
+        stage.add_rows(min(len(urls), max(batch_sizes)))
+    results["predict_urls"] = _stage_result(stage)
+
+    profiler.write_report(os.path.join(work_dir, "run_report.json"))
+    return results
+
+
+def compare_to_baseline(record: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns a message per stage whose throughput dropped, or whose peak
+    memory grew, by more than tolerance relative to the baseline.
+    """
+    regressions = []
+    for scale_name, stages in record["scales"].items():
+        for stage_name, result in stages.items():
+            reference = baseline.get("scales", {}).get(scale_name, {}).get(stage_name)
+            if not reference:
+                continue
+            if result.get("rows_per_second") and reference.get("rows_per_second"):
+                ratio = result["rows_per_second"] / reference["rows_per_second"]
+                if ratio < 1 - tolerance:
+                    regressions.append(f"{scale_name}/{stage_name}: throughput at {ratio:.0%} of baseline")
+            if result.get("tracemalloc_peak_bytes") and reference.get("tracemalloc_peak_bytes"):
+                ratio = result["tracemalloc_peak_bytes"] / reference["tracemalloc_peak_bytes"]
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{scale_name}/{stage_name}: peak memory at {ratio:.0%} of baseline")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="10k", help=f"comma separated, from {', '.join(SCALES)}")
+    parser.add_argument("--batch-sizes", default="1,100,10000")
+    parser.add_argument("--history", default=os.path.join(RESULTS_DIR, "history.jsonl"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--no-trace-memory", action="store_true",
+                        help="skip tracemalloc, which slows allocation heavy stages")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="share of NaN feature values")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep-work-dir", action="store_true")
+    args = parser.parse_args(argv)
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "trace_memory": not args.no_trace_memory,
+        "missing_rate": args.missing_rate,
+        "scales": {},
+    }
+
+    original_dir = os.getcwd()
+    for scale_name in args.scales.split(","):
+        work_dir = tempfile.mkdtemp(prefix=f"networksecurity_bench_{scale_name}_")
+        # The components use paths relative to the working directory
+        shutil.copytree(os.path.join(REPO_ROOT, "data_schema"), os.path.join(work_dir, "data_schema"))
+        os.chdir(work_dir)
+        try:
+            print(f"Running {scale_name} ({SCALES[scale_name]} rows) in {work_dir}")
+            record["scales"][scale_name] = run_scale(
+                scale_name, SCALES[scale_name], batch_sizes, work_dir,
+                trace_memory=not args.no_trace_memory, missing_rate=args.missing_rate, seed=args.seed,
+            )
+        finally:
+            os.chdir(original_dir)
+            if not args.keep_work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        for stage_name, result in record["scales"][scale_name].items():
+            throughput = f"{result['rows_per_second']:,.0f} rows/s" if result.get("rows_per_second") else "-"
+            peak = result.get("tracemalloc_peak_bytes")
+            peak = f"{peak / 2**20:,.1f} MiB peak" if peak else ""
+            print(f"  {stage_name:<28} {result['wall_seconds']:9.3f}s  {throughput:>20}  {peak}")
+
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a") as file_obj:
+        file_obj.write(json.dumps(record) + "\n")
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file_obj:
+            baseline = json.load(file_obj)
+        if baseline.get("trace_memory") != record["trace_memory"]:
+            print("Baseline was recorded with a different tracemalloc setting, timings are not comparable")
+        regressions = compare_to_baseline(record, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file_obj:
+            json.dump(record, file_obj, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Synthetic phishing data that conforms to data_schema/schema.yaml.
+
+Each feature takes the values and marginal frequencies of the UCI phishing
+dataset the pipeline is trained on, and Result is drawn from a noisy
+linear rule over the strongest features so the models have signal to learn.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import yaml
+
+SCHEMA_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data_schema", "schema.yaml")
+TARGET_COLUMN = "Result"
+
+# value: probability, per feature
+FEATURE_DISTRIBUTIONS = {
+    "having_IP_Address": {-1: 0.34, 1: 0.66},
+    "URL_Length": {-1: 0.81, 0: 0.01, 1: 0.18},
+    "Shortining_Service": {-1: 0.13, 1: 0.87},
+    "having_At_Symbol": {-1: 0.15, 1: 0.85},
+    "double_slash_redirecting": {-1: 0.13, 1: 0.87},
+    "Prefix_Suffix": {-1: 0.87, 1: 0.13},
+    "having_Sub_Domain": {-1: 0.30, 0: 0.33, 1: 0.37},
+    "SSLfinal_State": {-1: 0.32, 0: 0.11, 1: 0.57},
+    "Domain_registeration_length": {-1: 0.67, 1: 0.33},
+    "Favicon": {-1: 0.19, 1: 0.81},
+    "port": {-1: 0.14, 1: 0.86},
+    "HTTPS_token": {-1: 0.16, 1: 0.84},
+    "Request_URL": {-1: 0.41, 1: 0.59},
+    "URL_of_Anchor": {-1: 0.30, 0: 0.48, 1: 0.22},
+    "Links_in_tags": {-1: 0.36, 0: 0.40, 1: 0.24},
+    "SFH": {-1: 0.76, 0: 0.07, 1: 0.17},
+    "Submitting_to_email": {-1: 0.18, 1: 0.82},
+    "Abnormal_URL": {-1: 0.15, 1: 0.85},
+    "Redirect": {0: 0.88, 1: 0.12},
+    "on_mouseover": {-1: 0.12, 1: 0.88},
+    "RightClick": {-1: 0.04, 1: 0.96},
+    "popUpWidnow": {-1: 0.19, 1: 0.81},
+    "Iframe": {-1: 0.09, 1: 0.91},
+    "age_of_domain": {-1: 0.47, 1: 0.53},
+    "DNSRecord": {-1: 0.31, 1: 0.69},
+    "web_traffic": {-1: 0.24, 0: 0.23, 1: 0.53},
+    "Page_Rank": {-1: 0.74, 1: 0.26},
+    "Google_Index": {-1: 0.14, 1: 0.86},
+    "Links_pointing_to_page": {-1: 0.05, 0: 0.56, 1: 0.39},
+    "Statistical_report": {-1: 0.14, 1: 0.86},
+}
+
+# Building blocks of synthetic URLs for the URL feature benchmark
+URL_WORDS = ("secure", "login", "account", "update", "mail", "shop", "news", "bank", "cloud", "app",
+             "verify", "portal", "media", "store", "service", "online", "web", "info", "support", "data")
+URL_TLDS = ("com", "org", "net", "info", "co.uk", "de", "ru", "in", "io", "com.br")
+URL_SHORTENERS = ("bit.ly", "goo.gl", "tinyurl.com", "ow.ly", "t.co", "is.gd")
+
+# Features driving the label, with their weights
+LABEL_WEIGHTS = {
+    "SSLfinal_State": 2.0,
+    "URL_of_Anchor": 1.6,
+    "Prefix_Suffix": 0.8,
+    "web_traffic": 0.6,
+    "having_Sub_Domain": 0.5,
+    "Links_in_tags": 0.4,
+    "Request_URL": 0.3,
+}
+
+
+def schema_columns(schema_file_path: str = SCHEMA_FILE_PATH) -> list:
+    with open(schema_file_path) as file_obj:
+        schema = yaml.safe_load(file_obj)
+    return [list(column)[0].strip() for column in schema["columns"]]
+
+
+def generate_phishing_data(n_rows: int, seed: int = 42, missing_rate: float = 0.0,
+                           schema_file_path: str = SCHEMA_FILE_PATH) -> pd.DataFrame:
+    """
+    Returns n_rows of schema-conformant data in schema column order. With
+    missing_rate > 0 that share of feature values is NaN, to exercise the
+    imputer; the columns are then float.
+    """
+    rng = np.random.default_rng(seed)
+    columns = schema_columns(schema_file_path)
+    data = {}
+    for column in columns:
+        if column == TARGET_COLUMN:
+            continue
+        distribution = FEATURE_DISTRIBUTIONS[column]
+        data[column] = rng.choice(
+            np.array(list(distribution), dtype=np.int8), size=n_rows, p=list(distribution.values())
+        )
+
+    score = sum(weight * data[column] for column, weight in LABEL_WEIGHTS.items())
+    score = score - np.median(score) + rng.normal(0, 1.0, n_rows)
+    data[TARGET_COLUMN] = np.where(score > 0, 1, -1).astype(np.int8)
+
+    df = pd.DataFrame(data)[columns]
+    if missing_rate > 0:
+        features = [column for column in columns if column != TARGET_COLUMN]
+        values = df[features].to_numpy(dtype=float, copy=True)
+        values[rng.random(values.shape) < missing_rate] = np.nan
+        df[features] = values
+    return df
+
+
+def write_phishing_csv(file_path: str, n_rows: int, seed: int = 42, chunk_rows: int = 1_000_000,
+                       missing_rate: float = 0.0) -> str:
+    """
+    Writes n_rows to a CSV in chunks, so 10M rows never sit in memory at once.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        chunk = generate_phishing_data(min(chunk_rows, n_rows - start), seed=seed + i, missing_rate=missing_rate)
+        chunk.to_csv(file_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return file_path
+
+
+def generate_urls(n_urls: int, seed: int = 42) -> list:
+    """
+    Returns n_urls raw URLs mixing the patterns the lexical features look at:
+    IP hosts, shorteners, @ and // in the path, hyphens, subdomains, ports.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(URL_WORDS)
+    schemes = rng.choice(["http://", "https://", ""], n_urls, p=[0.4, 0.5, 0.1])
+    kinds = rng.choice(["domain", "ip", "shortener"], n_urls, p=[0.85, 0.08, 0.07])
+    subdomains = rng.choice([0, 1, 2, 3], n_urls, p=[0.5, 0.3, 0.15, 0.05])
+    tlds = rng.choice(np.array(URL_TLDS), n_urls)
+    path_lengths = rng.integers(0, 6, n_urls)
+
+    urls = []
+    for i in range(n_urls):
+        if kinds[i] == "ip":
+            host = ".".join(str(part) for part in rng.integers(1, 255, 4))
+        elif kinds[i] == "shortener":
+            host = URL_SHORTENERS[i % len(URL_SHORTENERS)]
+        else:
+            labels = list(rng.choice(words, subdomains[i] + 1))
+            if rng.random() < 0.15:
+                labels[-1] += "-" + rng.choice(words)
+            host = ("www." if rng.random() < 0.4 else "") + ".".join(labels) + "." + tlds[i]
+        if rng.random() < 0.05:
+            host += f":{rng.choice([8080, 8443, 21, 443])}"
+        if rng.random() < 0.03:
+            host = "user@" + host
+        path = "/".join(rng.choice(words, path_lengths[i]))
+        if rng.random() < 0.03:
+            path += "//redirect"
+        urls.append(f"{schemes[i]}{host}/{path}")
+    return urls
@@ -1,10 +1,6 @@
-from pymongo.mongo_client import MongoClient
-import os
-from dotenv import load_dotenv
+from networksecurity.cloud.mongo_client import get_mongo_client
 
-load_dotenv()
-uri = os.getenv('MONGO_DB_URL')
-client = MongoClient(uri)
+client = get_mongo_client()
 
 print("="*70)
 print("SEARCHING FOR YOUR DATA IN MONGODB")
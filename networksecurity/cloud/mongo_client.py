@@ -0,0 +1,130 @@
+"""
+Shared MongoDB clients.
+
+A MongoClient holds a connection pool and background monitor threads, so a
+process should create one per cluster and reuse it. get_mongo_client
+returns that shared client, configured from the MONGO_* constants, and
+get_async_mongo_client its asyncio counterpart for the FastAPI routes.
+Clients are not carried across fork(): a child process gets its own.
+"""
+import asyncio
+import atexit
+import os
+import sys
+import threading
+
+import certifi
+import pymongo
+from dotenv import load_dotenv
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.constant import training_pipeline
+
+_clients = {}
+_async_clients = {}
+_lock = threading.Lock()
+
+
+def get_mongo_url() -> str:
+    """
+    Returns the url from the first MONGO_DB_URL_ENV_VARS variable that is set.
+    """
+    load_dotenv()
+    for name in training_pipeline.MONGO_DB_URL_ENV_VARS:
+        url = os.getenv(name)
+        if url:
+            return url
+    raise ValueError(
+        f"MongoDB url not set, set one of {', '.join(training_pipeline.MONGO_DB_URL_ENV_VARS)} in .env"
+    )
+
+
+def mongo_client_options(url: str) -> dict:
+    options = {
+        "maxPoolSize": training_pipeline.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": training_pipeline.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": training_pipeline.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": training_pipeline.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": training_pipeline.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": training_pipeline.MONGO_SOCKET_TIMEOUT_MS,
+        "retryReads": training_pipeline.MONGO_RETRY_READS,
+        "retryWrites": training_pipeline.MONGO_RETRY_WRITES,
+    }
+    # Any tls option turns TLS on, so only set the CA bundle for TLS urls
+    lowered = url.lower()
+    if lowered.startswith("mongodb+srv://") or "tls=true" in lowered or "ssl=true" in lowered:
+        options["tlsCAFile"] = certifi.where()
+    return options
+
+
+def get_mongo_client(url: str = None) -> pymongo.MongoClient:
+    """
+    Returns this process's shared client for url (default: from the
+    environment). Callers must not close it.
+    """
+    try:
+        url = url or get_mongo_url()
+        key = (url, os.getpid())
+        client = _clients.get(key)
+        if client is None:
+            with _lock:
+                client = _clients.get(key)
+                if client is None:
+                    client = pymongo.MongoClient(url, **mongo_client_options(url))
+                    _clients[key] = client
+        return client
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_collection(database_name: str, collection_name: str, url: str = None):
+    return get_mongo_client(url)[database_name][collection_name]
+
+
+def get_async_mongo_client(url: str = None) -> pymongo.AsyncMongoClient:
+    """
+    Returns the shared AsyncMongoClient for url and the running event loop;
+    an async client can only be used from the loop it was created on.
+    """
+    try:
+        url = url or get_mongo_url()
+        key = (url, os.getpid(), id(asyncio.get_running_loop()))
+        client = _async_clients.get(key)
+        if client is None:
+            client = _async_clients[key] = pymongo.AsyncMongoClient(url, **mongo_client_options(url))
+        return client
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+async def close_async_mongo_clients() -> None:
+    """
+    Closes the async clients of the running loop, e.g. on app shutdown.
+    """
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _async_clients if key[2] == loop_id]:
+        await _async_clients.pop(key).close()
+
+
+def close_mongo_clients() -> None:
+    """
+    Closes this process's synchronous clients; runs at exit.
+    """
+    pid = os.getpid()
+    with _lock:
+        for key in [key for key in _clients if key[1] == pid]:
+            try:
+                _clients.pop(key).close()
+            except Exception as e:
+                logging.warning(f"Closing MongoDB client failed: {e}")
+
+
+def _forget_parent_clients() -> None:
+    # The parent's pools and monitor threads are unusable in the child
+    _clients.clear()
+    _async_clients.clear()
+
+
+atexit.register(close_mongo_clients)
+os.register_at_fork(after_in_child=_forget_parent_clients)
@@ -1,12 +1,369 @@
-
+import hashlib
+import json
 import os
+import random
+import shutil
+import sys
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+MANIFEST_FILE_NAME = ".sync_manifest.json"
+# Temp files of interrupted downloads and writers, never synced
+TEMP_FILE_SUFFIXES = (".part", ".tmp", ".lock")
+# Attempts at merging into a remote manifest that other syncs keep updating
+MANIFEST_UPDATE_ATTEMPTS = 10
+
+
+class ObjectStore(ABC):
+    """
+    Minimal object-store interface the sync engine works against.
+    Keys are '/'-separated paths relative to the store root.
+    """
+    @abstractmethod
+    def upload_file(self, local_path: str, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def download_file(self, key: str, local_path: str) -> None:
+        ...
+
+    def read_bytes(self, key: str):
+        """Returns the object's bytes, or None when it does not exist."""
+        return self.read_versioned(key)[0]
+
+    @abstractmethod
+    def read_versioned(self, key: str):
+        """Returns (bytes, version) of the object, or (None, None) when it does not exist."""
+
+    @abstractmethod
+    def write_if_version(self, key: str, data: bytes, version) -> bool:
+        """
+        Writes the object only if its version is still `version` (None: it
+        must not exist yet). Returns False when another writer got there first.
+        """
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Directory-backed object store, used for file:// urls and in tests.
+    """
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, *key.split("/"))
+
+    def upload_file(self, local_path: str, key: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(local_path, f"{path}.part")
+        os.replace(f"{path}.part", path)
+
+    def download_file(self, key: str, local_path: str) -> None:
+        shutil.copyfile(self._path(key), local_path)
+
+    def read_versioned(self, key: str):
+        try:
+            with open(self._path(key), "rb") as file_obj:
+                data = file_obj.read()
+        except FileNotFoundError:
+            return None, None
+        # Content hash as the version, like an S3 ETag
+        return data, hashlib.sha256(data).hexdigest()
+
+    @contextmanager
+    def _locked(self, path: str, timeout: float = 30.0):
+        # O_EXCL lock file, so concurrent processes take turns
+        lock_path = f"{path}.lock"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{lock_path} is held by another writer, remove it if that writer died")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def write_if_version(self, key: str, data: bytes, version) -> bool:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._locked(path):
+            if self.read_versioned(key)[1] != version:
+                return False
+            with open(f"{path}.part", "wb") as file_obj:
+                file_obj.write(data)
+            os.replace(f"{path}.part", path)
+            return True
+
+
+class S3ObjectStore(ObjectStore):
+    """
+    S3 bucket store. Files above multipart_threshold are transferred as
+    concurrent multipart uploads/downloads by boto3's transfer manager.
+    """
+    def __init__(self, bucket: str, multipart_threshold: int = 8 * 1024 * 1024,
+                 multipart_concurrency: int = 4):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+        except ImportError as e:
+            raise ImportError("boto3 is required for s3:// artifact sync, pip install boto3") from e
+
+        self.bucket = bucket
+        self.client = boto3.client("s3")
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            max_concurrency=multipart_concurrency,
+        )
+
+    def upload_file(self, local_path: str, key: str) -> None:
+        self.client.upload_file(local_path, self.bucket, key, Config=self.transfer_config)
+
+    def download_file(self, key: str, local_path: str) -> None:
+        self.client.download_file(self.bucket, key, local_path, Config=self.transfer_config)
+
+    def read_versioned(self, key: str):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            return None, None
+        return response["Body"].read(), response["ETag"]
+
+    def write_if_version(self, key: str, data: bytes, version) -> bool:
+        from botocore.exceptions import ClientError
+
+        condition = {"IfMatch": version} if version is not None else {"IfNoneMatch": "*"}
+        try:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=data, **condition)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("PreconditionFailed", "ConditionalRequestConflict"):
+                return False
+            raise
+
+
+def get_object_store(url: str):
+    """
+    Returns the (store, key prefix) for an s3://bucket/prefix or file:///dir url.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "s3":
+        return S3ObjectStore(parsed.netloc), parsed.path.strip("/")
+    if parsed.scheme in ("", "file"):
+        return LocalObjectStore(parsed.netloc + parsed.path if parsed.scheme else url), ""
+    raise ValueError(f"Unsupported artifact store url: {url}")
+
+
+@dataclass
+class SyncResult:
+    source: str
+    destination: str
+    transferred: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    bytes_transferred: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+def _sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 class S3Sync:
-    def sync_folder_to_s3(self,folder,aws_bucket_url):
-        command = f"aws s3 sync {folder} {aws_bucket_url} "
-        os.system(command)
+    """
+    Syncs an artifact folder with an object store. Each side keeps a manifest
+    of file content hashes, so only new or changed files are transferred.
+    Transfers run concurrently and are retried with exponential backoff; the
+    outcome is returned as a SyncResult.
+
+    store overrides the store derived from the url, e.g. a LocalObjectStore in tests.
+    """
+    def __init__(self, store: ObjectStore = None, max_workers: int = 8, max_retries: int = 3,
+                 retry_backoff_seconds: float = 1.0):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    def _resolve(self, aws_bucket_url: str):
+        if self.store is not None:
+            return self.store, urlparse(aws_bucket_url).path.strip("/")
+        return get_object_store(aws_bucket_url)
+
+    @staticmethod
+    def _key(prefix: str, relative_path: str) -> str:
+        return f"{prefix}/{relative_path}" if prefix else relative_path
+
+    def local_manifest(self, folder: str) -> dict:
+        """
+        Hashes every file under folder, reusing hashes from the previous local
+        manifest for files whose size and mtime did not change. Leftover
+        temp files (TEMP_FILE_SUFFIXES) are not part of the folder.
+        """
+        manifest_path = os.path.join(folder, MANIFEST_FILE_NAME)
+        previous = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as file_obj:
+                previous = json.load(file_obj)
+
+        manifest = {}
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                relative_path = os.path.relpath(path, folder).replace(os.sep, "/")
+                if relative_path == MANIFEST_FILE_NAME or name.endswith(TEMP_FILE_SUFFIXES):
+                    continue
+                stat = os.stat(path)
+                entry = previous.get(relative_path)
+                if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    manifest[relative_path] = entry
+                else:
+                    manifest[relative_path] = {
+                        "sha256": _sha256(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                    }
+
+        with open(manifest_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2, sort_keys=True)
+        return manifest
+
+    def _remote_manifest(self, store: ObjectStore, prefix: str) -> dict:
+        data = store.read_bytes(self._key(prefix, MANIFEST_FILE_NAME))
+        return json.loads(data) if data else {}
+
+    def _update_remote_manifest(self, store: ObjectStore, prefix: str, entries: dict) -> None:
+        """
+        Merges entries into the remote manifest with a conditional write,
+        re-reading and merging again when another sync updated it meanwhile.
+        """
+        key = self._key(prefix, MANIFEST_FILE_NAME)
+        for attempt in range(MANIFEST_UPDATE_ATTEMPTS):
+            data, version = store.read_versioned(key)
+            remote = json.loads(data) if data else {}
+            remote.update(entries)
+            if store.write_if_version(key, json.dumps(remote, indent=2, sort_keys=True).encode(), version):
+                return
+            logging.info(f"Remote manifest {key} changed during sync, merging again")
+            time.sleep(self.retry_backoff_seconds * random.random())
+        raise RuntimeError(f"Could not update {key}, it kept changing for {MANIFEST_UPDATE_ATTEMPTS} attempts")
+
+    def _with_retries(self, action, *args):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return action(*args)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+
+    def _run_transfers(self, transfers: dict, result: SyncResult, sizes: dict) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._with_retries, action, *args): relative_path
+                for relative_path, (action, args) in transfers.items()
+            }
+            for future in as_completed(futures):
+                relative_path = futures[future]
+                try:
+                    future.result()
+                    result.transferred.append(relative_path)
+                    result.bytes_transferred += sizes[relative_path]
+                except Exception as e:
+                    result.failed[relative_path] = str(e)
+
+    def sync_folder_to_s3(self, folder, aws_bucket_url) -> SyncResult:
+        try:
+            start_time = time.perf_counter()
+            store, prefix = self._resolve(aws_bucket_url)
+            result = SyncResult(source=folder, destination=aws_bucket_url)
+
+            local = self.local_manifest(folder)
+            remote = self._remote_manifest(store, prefix)
+
+            transfers = {}
+            for relative_path, entry in local.items():
+                if remote.get(relative_path, {}).get("sha256") == entry["sha256"]:
+                    result.skipped.append(relative_path)
+                else:
+                    local_path = os.path.join(folder, *relative_path.split("/"))
+                    transfers[relative_path] = (store.upload_file, (local_path, self._key(prefix, relative_path)))
+            self._run_transfers(transfers, result, {path: local[path]["size"] for path in transfers})
+
+            # Only record what actually reached the store
+            if result.transferred:
+                self._update_remote_manifest(store, prefix, {
+                    relative_path: {key: local[relative_path][key] for key in ("sha256", "size")}
+                    for relative_path in result.transferred
+                })
+
+            result.duration_seconds = time.perf_counter() - start_time
+            logging.info(
+                f"Synced {folder} to {aws_bucket_url}: {len(result.transferred)} uploaded, "
+                f"{len(result.skipped)} unchanged, {len(result.failed)} failed, "
+                f"{result.bytes_transferred} bytes in {result.duration_seconds:.2f}s"
+            )
+            return result
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def sync_folder_from_s3(self, folder, aws_bucket_url) -> SyncResult:
+        try:
+            start_time = time.perf_counter()
+            store, prefix = self._resolve(aws_bucket_url)
+            result = SyncResult(source=aws_bucket_url, destination=folder)
+
+            os.makedirs(folder, exist_ok=True)
+            local = self.local_manifest(folder)
+            remote = self._remote_manifest(store, prefix)
+
+            def download(key, local_path, expected_sha256):
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                tmp_path = f"{local_path}.part"
+                store.download_file(key, tmp_path)
+                if _sha256(tmp_path) != expected_sha256:
+                    os.remove(tmp_path)
+                    raise IOError(f"Checksum mismatch for {key}")
+                os.replace(tmp_path, local_path)
+
+            transfers = {}
+            for relative_path, entry in remote.items():
+                if local.get(relative_path, {}).get("sha256") == entry["sha256"]:
+                    result.skipped.append(relative_path)
+                else:
+                    local_path = os.path.join(folder, *relative_path.split("/"))
+                    transfers[relative_path] = (
+                        download, (self._key(prefix, relative_path), local_path, entry["sha256"])
+                    )
+            self._run_transfers(transfers, result, {path: remote[path]["size"] for path in transfers})
+            self.local_manifest(folder)
 
-    def sync_folder_from_s3(self,folder,aws_bucket_url):
-        command = f"aws s3 sync  {aws_bucket_url} {folder} "
-        os.system(command)
+            result.duration_seconds = time.perf_counter() - start_time
+            logging.info(
+                f"Synced {aws_bucket_url} to {folder}: {len(result.transferred)} downloaded, "
+                f"{len(result.skipped)} unchanged, {len(result.failed)} failed, "
+                f"{result.bytes_transferred} bytes in {result.duration_seconds:.2f}s"
+            )
+            return result
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
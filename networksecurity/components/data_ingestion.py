@@ -8,13 +8,10 @@ import os
 import sys
 import numpy as np
 import pandas as pd
-import pymongo
 from typing import List
 from sklearn.model_selection import train_test_split
-from dotenv import load_dotenv
-
-load_dotenv()
-MONGO_DB_URL = os.getenv("MONGO_DB_URL")
+from networksecurity.cloud.mongo_client import get_collection
+from networksecurity.constant.training_pipeline import MONGO_READ_BATCH_SIZE
 
 
 class DataIngestion:
@@ -34,12 +31,8 @@ class DataIngestion:
             
             logging.info(f"Connecting to MongoDB: {database_name}.{collection_name}")
             
-            # Check if MONGO_DB_URL is loaded
-            if not MONGO_DB_URL:
-                raise ValueError("MONGO_DB_URL is not set in environment variables")
-            
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL)
-            collection = self.mongo_client[database_name][collection_name]
+            # Shared pooled client, configured in networksecurity/cloud/mongo_client.py
+            collection = get_collection(database_name, collection_name)
             
             # Check if collection exists and has data
             document_count = collection.count_documents({})
@@ -51,13 +44,12 @@ class DataIngestion:
                     f"Please run 'python push_data.py' to insert data into MongoDB first."
                 )
 
-            df = pd.DataFrame(list(collection.find()))
+            # _id is dropped by the server instead of being sent and discarded
+            cursor = collection.find({}, {"_id": 0}).batch_size(MONGO_READ_BATCH_SIZE)
+            df = pd.DataFrame(list(cursor))
             
             logging.info(f"DataFrame created with shape: {df.shape}")
             
-            if "_id" in df.columns.to_list():
-                df = df.drop(columns=["_id"], axis=1)
-            
             df.replace({"na": np.nan}, inplace=True)
             
             logging.info(f"Data export completed. Final DataFrame shape: {df.shape}")
@@ -19,7 +19,7 @@ from networksecurity.entity.artifact_entity import (
 from networksecurity.entity.config_entity import DataTransformationConfig
 from networksecurity.exception.exception import NetworkSecurityException 
 from networksecurity.logging.logger import logging
-from networksecurity.utils.main_utils.utils import save_numpy_array_data,save_object
+from networksecurity.utils.main_utils.utils import save_numpy_array_data,save_object,write_final_model_reference
 
 class DataTransformation:
     def __init__(self,data_validation_artifact:DataValidationArtifact,
@@ -36,6 +36,19 @@ class DataTransformation:
             return pd.read_csv(file_path)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def split_input_target(df: pd.DataFrame):
+        """
+        Splits a validated frame into its input features and the target
+        column, with the -1 label mapped to 0.
+        """
+        try:
+            if TARGET_COLUMN not in df.columns:
+                raise ValueError(f"Target column '{TARGET_COLUMN}' not found. Available: {df.columns.tolist()}. Fix constant or data schema.")
+            return df.drop(columns=[TARGET_COLUMN]), df[TARGET_COLUMN].replace(-1, 0)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
         
     def get_data_transformer_object(cls)->Pipeline:
         """
@@ -74,21 +87,9 @@ class DataTransformation:
             logging.info(f"Test DF columns: {test_df.columns.tolist()}")
             logging.info(f"TARGET_COLUMN value: {TARGET_COLUMN}")
 
-            # Validate target column exists
-            if TARGET_COLUMN not in train_df.columns:
-                raise ValueError(f"Target column '{TARGET_COLUMN}' not found in train_df. Available: {train_df.columns.tolist()}. Fix constant or data schema.")
-            if TARGET_COLUMN not in test_df.columns:
-                raise ValueError(f"Target column '{TARGET_COLUMN}' not found in test_df. Available: {test_df.columns.tolist()}.")
-
-            ## training dataframe
-            input_feature_train_df=train_df.drop(columns=[TARGET_COLUMN],axis=1)
-            target_feature_train_df = train_df[TARGET_COLUMN]
-            target_feature_train_df = target_feature_train_df.replace(-1, 0)
-
-            #testing dataframe
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
-            target_feature_test_df = test_df[TARGET_COLUMN]
-            target_feature_test_df = target_feature_test_df.replace(-1, 0)
+            ## training and testing dataframes
+            input_feature_train_df, target_feature_train_df = DataTransformation.split_input_target(train_df)
+            input_feature_test_df, target_feature_test_df = DataTransformation.split_input_target(test_df)
 
             preprocessor=self.get_data_transformer_object()
 
@@ -101,11 +102,16 @@ class DataTransformation:
             test_arr = np.c_[ transformed_input_test_feature, np.array(target_feature_test_df) ]
 
             #save numpy array data
-            save_numpy_array_data( self.data_transformation_config.transformed_train_file_path, array=train_arr, )
-            save_numpy_array_data( self.data_transformation_config.transformed_test_file_path,array=test_arr,)
-            save_object( self.data_transformation_config.transformed_object_file_path, preprocessor_object,)
+            config = self.data_transformation_config
+            save_numpy_array_data( config.transformed_train_file_path, array=train_arr, compress=config.compress_artifacts,
+                codec=config.compression_codec, level=config.compression_level,)
+            save_numpy_array_data( config.transformed_test_file_path,array=test_arr, compress=config.compress_artifacts,
+                codec=config.compression_codec, level=config.compression_level,)
+            save_object( config.transformed_object_file_path, preprocessor_object, compress=config.compress_artifacts,
+                codec=config.compression_codec, level=config.compression_level,)
 
             save_object( "final_model/preprocessor.pkl", preprocessor_object,)
+            write_final_model_reference(config.model_dir, config.artifact_dir)
 
 
             #preparing artifacts
@@ -113,7 +119,9 @@ class DataTransformation:
             data_transformation_artifact=DataTransformationArtifact(
                 transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
-                transformed_test_file_path=self.data_transformation_config.transformed_test_file_path
+                transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+                raw_train_file_path=self.data_validation_artifact.valid_train_file_path,
+                raw_test_file_path=self.data_validation_artifact.valid_test_file_path,
             )
             return data_transformation_artifact
 
@@ -1,17 +1,25 @@
 import os
 import sys
+import time
 
 from networksecurity.exception.exception import NetworkSecurityException 
 from networksecurity.logging.logger import logging
 
 from networksecurity.entity.artifact_entity import DataTransformationArtifact,ModelTrainerArtifact
 from networksecurity.entity.config_entity import ModelTrainerConfig
+from networksecurity.components.data_transformation import DataTransformation
 
 from networksecurity.utils.ml_utils.model.estimator import NetworkModel
-from networksecurity.utils.main_utils.utils import save_object,load_object
-from networksecurity.utils.main_utils.utils import load_numpy_array_data,evaluate_models
+from networksecurity.utils.main_utils.utils import save_object,load_object,save_model_artifact,write_final_model_reference
+from networksecurity.utils.main_utils.utils import load_numpy_array_data,evaluate_models,collapse_duplicate_rows
 from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
+from networksecurity.utils.ml_utils.model.search import get_search_strategy,fit_weighted
+from networksecurity.utils.ml_utils.model.fit_cache import FitCache
+from networksecurity.utils.ml_utils.model.latency import measure_inference_cost
+from networksecurity.utils.ml_utils.model.feature_selection import prune_features,fit_subset_preprocessor
+from networksecurity.utils.ml_utils.experiment_tracker import get_experiment_tracker
 
+from sklearn.base import clone
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import r2_score
 from sklearn.neighbors import KNeighborsClassifier
@@ -21,56 +29,162 @@ from sklearn.ensemble import (
     GradientBoostingClassifier,
     RandomForestClassifier,
 )
-import mlflow
-from urllib.parse import urlparse
-
-import dagshub
-# Fixed: Set consistent URIs and auth for YOUR repo (replace YOUR_DAGSHUB_TOKEN with actual token)
-#os.environ["MLFLOW_TRACKING_URI"] = "https://dagshub.com/MaheshkumarGovind/networkseurity.mlflow"
-#os.environ["MLFLOW_TRACKING_USERNAME"] = "MaheshkumarGovind"
-#os.environ["MLFLOW_TRACKING_PASSWORD"] = "YOUR_DAGSHUB_TOKEN"  # Generate at https://dagshub.com/user/settings/tokens
-mlflow.set_registry_uri("https://dagshub.com/MaheshkumarGovind/networkseurity.mlflow")
-dagshub.init(repo_owner='MaheshkumarGovind', repo_name='networkseurity', mlflow=True)
 
 
 class ModelTrainer:
-    def __init__(self,model_trainer_config:ModelTrainerConfig,data_transformation_artifact:DataTransformationArtifact):
+    def __init__(self,model_trainer_config:ModelTrainerConfig,data_transformation_artifact:DataTransformationArtifact,
+                 profiler=None):
         try:
             self.model_trainer_config=model_trainer_config
             self.data_transformation_artifact=data_transformation_artifact
+            self.profiler=profiler
         except Exception as e:
             raise NetworkSecurityException(e,sys)
+
+    def get_search_strategy(self):
+        """
+        Builds the hyperparameter search strategy selected in the trainer config.
+        """
+        search_kwargs = {
+            "cv": self.model_trainer_config.search_cv,
+            "n_jobs": -1,
+            "cv_seed": self.model_trainer_config.search_cv_seed,
+            "cache": None,
+        }
+        if self.model_trainer_config.fit_cache_dir:
+            search_kwargs["cache"] = FitCache(
+                self.model_trainer_config.fit_cache_dir,
+                max_bytes=self.model_trainer_config.fit_cache_max_bytes,
+            )
+        if self.model_trainer_config.search_strategy == "halving":
+            search_kwargs["factor"] = self.model_trainer_config.halving_factor
+            search_kwargs["time_budget"] = self.model_trainer_config.search_time_budget
+            search_kwargs["audit"] = self.model_trainer_config.search_audit
+        logging.info(f"Using {self.model_trainer_config.search_strategy} search with {search_kwargs}")
+        return get_search_strategy(self.model_trainer_config.search_strategy, **search_kwargs)
         
+    def select_best_model(self,model_report:dict,models:dict,X_sample):
+        """
+        Measures every candidate's inference latency and size on a held-out
+        sample, then picks the fastest model (by single-row p99) whose test F1
+        is within selection_f1_epsilon of the best model that meets the p99 budget.
+
+        Returns the best model name and its latency artifact.
+        """
+        epsilon = self.model_trainer_config.selection_f1_epsilon
+        p99_budget_ms = self.model_trainer_config.selection_p99_budget_ms
+
+        latencies = {}
+        for model_name, model in models.items():
+            latencies[model_name] = measure_inference_cost(model, X_sample)
+            model_report[model_name].update(vars(latencies[model_name]))
+            logging.info(f"{model_name}: test_f1={model_report[model_name]['test_f1']:.4f}, {latencies[model_name]}")
+
+        eligible = list(models)
+        if p99_budget_ms is not None:
+            eligible = [name for name in models if latencies[name].single_row_p99_ms <= p99_budget_ms]
+            if not eligible:
+                logging.warning(f"No model meets the {p99_budget_ms}ms p99 budget, choosing among all models")
+                eligible = list(models)
+
+        best_f1 = max(model_report[name]["test_f1"] for name in eligible)
+        within_epsilon = [name for name in eligible if model_report[name]["test_f1"] >= best_f1 - epsilon]
+        best_model_name = min(within_epsilon, key=lambda name: latencies[name].single_row_p99_ms)
+
+        logging.info(
+            f"Selected {best_model_name} (test_f1={model_report[best_model_name]['test_f1']:.4f}, "
+            f"p99={latencies[best_model_name].single_row_p99_ms:.3f}ms) from {within_epsilon} "
+            f"within {epsilon} of the best test_f1 {best_f1:.4f}"
+        )
+        return best_model_name, latencies[best_model_name]
+
+    def report_collapse_speedup(self,best_model,X_train,y_train,X_fit,y_fit,sample_weight):
+        """
+        Times one fit of the selected model on the expanded and on the
+        duplicate-collapsed train data and logs the compression and speedup.
+        Opt-in diagnostic (report_collapse_speedup): it costs two extra fits.
+        """
+        start_time = time.perf_counter()
+        clone(best_model).fit(X_train, y_train)
+        expanded_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        fit_weighted(clone(best_model), X_fit, y_fit, sample_weight)
+        collapsed_time = time.perf_counter() - start_time
+
+        logging.info(
+            f"Duplicate collapsing: {len(X_train)} -> {len(X_fit)} rows "
+            f"({len(X_train) / len(X_fit):.2f}x compression), {type(best_model).__name__} fit "
+            f"{expanded_time:.3f}s -> {collapsed_time:.3f}s ({expanded_time / max(collapsed_time, 1e-9):.2f}x speedup)"
+        )
+
+    def refit_on_feature_subset(self,model,preprocessor,feature_pruning_artifact):
+        """
+        Refits the pruned model on the raw train rows imputed by a preprocessor
+        fit on only the selected columns, which is what serving will feed it.
+        The subset is kept only if test F1 stays within the pruning tolerance
+        of the full model; otherwise returns None and the full model is used.
+        """
+        train_df = DataTransformation.read_data(self.data_transformation_artifact.raw_train_file_path)
+        test_df = DataTransformation.read_data(self.data_transformation_artifact.raw_test_file_path)
+        X_train_raw, y_train = DataTransformation.split_input_target(train_df)
+        X_test_raw, y_test = DataTransformation.split_input_target(test_df)
+        y_train, y_test = y_train.to_numpy(), y_test.to_numpy()
+
+        preprocessor, feature_columns = fit_subset_preprocessor(
+            preprocessor, X_train_raw, feature_pruning_artifact.feature_indices
+        )
+        X_train = preprocessor.transform(X_train_raw[feature_columns])
+        x_test = preprocessor.transform(X_test_raw[feature_columns])
+
+        X_fit, y_fit, sample_weight = X_train, y_train, None
+        if self.model_trainer_config.collapse_duplicates:
+            X_fit, y_fit, sample_weight = collapse_duplicate_rows(X_train, y_train)
+        model = fit_weighted(clone(model), X_fit, y_fit, sample_weight)
+        test_f1 = get_classification_score(y_true=y_test, y_pred=model.predict(x_test)).f1_score
+        feature_pruning_artifact.refits += 1
+
+        min_f1 = feature_pruning_artifact.baseline_f1 - self.model_trainer_config.feature_pruning_f1_tolerance
+        if test_f1 < min_f1:
+            logging.warning(
+                f"Refit on {len(feature_columns)} separately imputed columns scored test_f1={test_f1:.4f}, "
+                f"below {min_f1:.4f}; keeping all {feature_pruning_artifact.n_features_before} features"
+            )
+            feature_pruning_artifact.feature_indices = list(range(feature_pruning_artifact.n_features_before))
+            feature_pruning_artifact.selected_f1 = feature_pruning_artifact.baseline_f1
+            return None
+
+        feature_pruning_artifact.selected_f1 = test_f1
+        logging.info(f"Pruned model uses {len(feature_columns)} columns (test_f1={test_f1:.4f}): {feature_columns}")
+        return model, preprocessor, feature_columns, X_train, y_train, x_test, y_test
+
     def track_mlflow(self,best_model,classificationmetric,X_data_sample):
+        """
+        Buffers the run locally; a background uploader syncs it to the
+        MLflow/DagsHub remote so training never waits on the network.
+        """
         try:
-            tracking_url_type_store = urlparse(mlflow.get_tracking_uri()).scheme
-            with mlflow.start_run():
-                f1_score=classificationmetric.f1_score
-                precision_score=classificationmetric.precision_score
-                recall_score=classificationmetric.recall_score
-                
-                mlflow.log_metric("f1_score",f1_score)
-                mlflow.log_metric("precision",precision_score)
-                mlflow.log_metric("recall_score",recall_score)
-                
-                # Create input example from sample data
-                input_example = X_data_sample[:5] if len(X_data_sample) >= 5 else X_data_sample
-                
-                # Log model with signature and input example (fixes warnings)
-                # Fixed: Use 'name' instead of deprecated 'artifact_path'
-                if tracking_url_type_store != "file":
-                    mlflow.sklearn.log_model(
-                        best_model, 
-                        name="model",  # Fixed: Use 'name' param
-                        registered_model_name=str(type(best_model).__name__),
-                        input_example=input_example
-                    )
-                else:
-                    mlflow.sklearn.log_model(
-                        best_model, 
-                        name="model",  # Fixed: Use 'name' param
-                        input_example=input_example
-                    )
+            tracker = get_experiment_tracker(
+                self.model_trainer_config.tracking_buffer_dir,
+                registry_uri=self.model_trainer_config.tracking_registry_uri,
+                dagshub_repo_owner=self.model_trainer_config.dagshub_repo_owner,
+                dagshub_repo_name=self.model_trainer_config.dagshub_repo_name,
+                max_retries=self.model_trainer_config.tracking_max_retries,
+            )
+            metrics = {
+                "f1_score": classificationmetric.f1_score,
+                "precision": classificationmetric.precision_score,
+                "recall_score": classificationmetric.recall_score,
+            }
+            # Create input example from sample data
+            input_example = X_data_sample[:5] if len(X_data_sample) >= 5 else X_data_sample
+            tracker.log_run(
+                metrics,
+                best_model,
+                input_example=input_example,
+                registered_model_name=str(type(best_model).__name__),
+                params=best_model.get_params(deep=False),
+            )
         except Exception as e:
             logging.error(f"MLflow tracking failed: {e}")
             # Fallback: Save locally without MLflow
@@ -80,12 +194,15 @@ class ModelTrainer:
 
         
     def train_model(self,X_train,y_train,x_test,y_test):
+        # Fixed seeds: the warm-start search scores smaller ensembles from prefixes
+        # of one fit, which only equal separate smaller fits for a fixed random_state
+        random_state = self.model_trainer_config.random_state
         models = {
-                "Random Forest": RandomForestClassifier(verbose=1),
-                "Decision Tree": DecisionTreeClassifier(),
-                "Gradient Boosting": GradientBoostingClassifier(verbose=1),
-                "Logistic Regression": LogisticRegression(verbose=1),
-                "AdaBoost": AdaBoostClassifier(),
+                "Random Forest": RandomForestClassifier(verbose=1,random_state=random_state),
+                "Decision Tree": DecisionTreeClassifier(random_state=random_state),
+                "Gradient Boosting": GradientBoostingClassifier(verbose=1,random_state=random_state),
+                "Logistic Regression": LogisticRegression(verbose=1,random_state=random_state),
+                "AdaBoost": AdaBoostClassifier(random_state=random_state),
             }
         params={
             "Decision Tree": {
@@ -114,25 +231,48 @@ class ModelTrainer:
             }
             
         }
-        model_report:dict=evaluate_models(X_train=X_train,y_train=y_train,X_test=x_test,y_test=y_test,
-                                          models=models,param=params)
-        
-        ## To get best model score from dict
-        # Handle both dict and numeric values in model_report
-        best_model_score = None
-        best_model_name = None
+        ## Optionally train on unique rows weighted by how often they occur
+        X_fit, y_fit, sample_weight = X_train, y_train, None
+        if self.model_trainer_config.collapse_duplicates:
+            X_fit, y_fit, sample_weight = collapse_duplicate_rows(X_train, y_train)
+
+        model_report:dict=evaluate_models(X_train=X_fit,y_train=y_fit,X_test=x_test,y_test=y_test,
+                                          models=models,param=params,
+                                          search_strategy=self.get_search_strategy(),
+                                          sample_weight=sample_weight,
+                                          profiler=self.profiler)
         
-        for model_name, score_or_dict in model_report.items():
-            # If the value is a dict, extract the score (assuming key like 'test_score' or similar)
-            if isinstance(score_or_dict, dict):
-                current_score = score_or_dict.get('test_score', score_or_dict.get('score', 0))
-            else:
-                current_score = score_or_dict
-            
-            if best_model_score is None or current_score > best_model_score:
-                best_model_score = current_score
-                best_model_name = model_name
+        ## Pick the best model on the accuracy/latency trade-off from the trainer config
+        best_model_name, latency_metric = self.select_best_model(
+            model_report, models, x_test[:self.model_trainer_config.latency_sample_rows]
+        )
         best_model = models[best_model_name]
+        if sample_weight is not None and self.model_trainer_config.report_collapse_speedup:
+            self.report_collapse_speedup(best_model,X_train,y_train,X_fit,y_fit,sample_weight)
+
+        preprocessor = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
+
+        ## Optionally refit on the fewest features that keep test F1 within tolerance
+        feature_pruning_artifact = None
+        feature_columns = None
+        if self.model_trainer_config.feature_pruning:
+            if not (self.data_transformation_artifact.raw_train_file_path and
+                    self.data_transformation_artifact.raw_test_file_path):
+                logging.warning("Feature pruning needs the raw train/test files to refit the preprocessor, skipping it")
+            else:
+                pruned_model, feature_pruning_artifact = prune_features(
+                    best_model, X_fit, y_fit, x_test, y_test, sample_weight=sample_weight,
+                    f1_tolerance=self.model_trainer_config.feature_pruning_f1_tolerance,
+                    method=self.model_trainer_config.feature_pruning_importance,
+                    min_features=self.model_trainer_config.feature_pruning_min_features,
+                )
+                if len(feature_pruning_artifact.feature_indices) < X_train.shape[1]:
+                    pruned = self.refit_on_feature_subset(pruned_model, preprocessor, feature_pruning_artifact)
+                    if pruned is not None:
+                        best_model, preprocessor, feature_columns, X_train, y_train, x_test, y_test = pruned
+                        latency_metric = measure_inference_cost(
+                            best_model, x_test[:self.model_trainer_config.latency_sample_rows]
+                        )
         y_train_pred=best_model.predict(X_train)
 
         classification_train_metric=get_classification_score(y_true=y_train,y_pred=y_train_pred)
@@ -147,22 +287,26 @@ class ModelTrainer:
         # with mlflow.start_run(nested=True):
         #     self.track_mlflow(best_model, classification_train_metric, X_train)  # No model log here
 
-        preprocessor = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
-            
         model_dir_path = os.path.dirname(self.model_trainer_config.trained_model_file_path)
         os.makedirs(model_dir_path,exist_ok=True)
 
-        Network_Model=NetworkModel(preprocessor=preprocessor,model=best_model)
+        Network_Model=NetworkModel(preprocessor=preprocessor,model=best_model,feature_columns=feature_columns)
         # BUGFIX: Changed NetworkModel to Network_Model (the instance, not the class)
         save_object(self.model_trainer_config.trained_model_file_path,obj=Network_Model)
-        
-        #model pusher (fixed: use dynamic path instead of hardcoded)
-        # save_object("final_model/model.pkl",best_model)  # Commented out; use artifact path
+        # Memory-mappable copy shared by serving workers (see load_network_model)
+        save_model_artifact(self.model_trainer_config.trained_model_artifact_dir,Network_Model)
+
+        ## Publish to final_model/network_model: an atomic symlink flip, so workers
+        ## reloading through CachedModelLoader see the old or the new model
+        save_model_artifact(self.model_trainer_config.final_model_artifact_dir,Network_Model)
+        write_final_model_reference(self.model_trainer_config.model_dir,self.model_trainer_config.artifact_dir)
         
         ## Model Trainer Artifact
         model_trainer_artifact=ModelTrainerArtifact(trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                              train_metric_artifact=classification_train_metric,
-                             test_metric_artifact=classification_test_metric
+                             test_metric_artifact=classification_test_metric,
+                             latency_metric_artifact=latency_metric,
+                             feature_pruning_artifact=feature_pruning_artifact
                              )
         logging.info(f"Model trainer artifact: {model_trainer_artifact}")
         return model_trainer_artifact
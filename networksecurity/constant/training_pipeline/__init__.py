@@ -19,6 +19,22 @@ SCHEMA_FILE_PATH = os.path.join("data_schema", "schema.yaml")
 SAVED_MODEL_DIR =os.path.join("saved_models")
 MODEL_FILE_NAME = "model.pkl"
 
+## served model: memory-mappable NetworkModel artifact, with the pickles as fallback
+FINAL_MODEL_DIR: str = "final_model"
+MODEL_ARTIFACT_DIR_NAME: str = "network_model"
+FINAL_MODEL_PREPROCESSOR_FILE_NAME: str = "preprocessor.pkl"
+
+## run directories under ARTIFACT_DIR kept after a training run; the run
+## referenced by final_model/run.json is always kept
+ARTIFACT_RETENTION_KEEP_LAST: int = 5
+
+## per-stage profiling written to the run's artifact dir; set the sampling
+## interval (seconds) to also dump folded stacks for a flame graph
+RUN_REPORT_FILE_NAME: str = "run_report.json"
+RUN_PROFILE_FOLDED_FILE_NAME: str = "profile.folded"
+RUN_PROFILE_TRACE_MEMORY: bool = True
+RUN_PROFILE_SAMPLING_INTERVAL: float = None
+
 
 
 
@@ -32,6 +48,47 @@ DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATION: float = 0.2
 
+## shared MongoDB client (networksecurity/cloud/mongo_client.py); the url is
+## read from the first of these environment variables that is set
+MONGO_DB_URL_ENV_VARS: tuple = ("MONGODB_URL_KEY", "MONGO_DB_URL")
+MONGO_MAX_POOL_SIZE: int = 50
+MONGO_MIN_POOL_SIZE: int = 0
+MONGO_MAX_IDLE_TIME_MS: int = 60_000
+MONGO_CONNECT_TIMEOUT_MS: int = 10_000
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10_000
+## None: no limit, long exports stream for as long as they need
+MONGO_SOCKET_TIMEOUT_MS: int = None
+MONGO_RETRY_READS: bool = True
+MONGO_RETRY_WRITES: bool = True
+## documents per round trip when reading whole collections
+MONGO_READ_BATCH_SIZE: int = 10_000
+
+## served predictions are queued in memory and written to this collection in
+## the background; overflow policy: "drop_newest", "drop_oldest" or "block"
+PREDICTION_LOG_ENABLED: bool = True
+PREDICTION_LOG_COLLECTION_NAME: str = "PredictionLog"
+PREDICTION_LOG_MAX_QUEUE_ROWS: int = 100_000
+PREDICTION_LOG_BATCH_SIZE: int = 1000
+PREDICTION_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+PREDICTION_LOG_OVERFLOW_POLICY: str = "drop_newest"
+
+## /predict results are stored per request under a random id and shown page
+## by page; results older than the TTL are removed
+RESULT_STORE_DIR: str = "prediction_output"
+RESULT_STORE_CHUNK_ROWS: int = 5000
+RESULT_STORE_PAGE_SIZE: int = 100
+RESULT_STORE_MAX_PAGE_SIZE: int = 1000
+RESULT_STORE_TTL_SECONDS: float = 24 * 60 * 60
+
+## shadow scoring: set this environment variable to a model directory (same
+## layout as final_model, e.g. a model_trainer/trained_model dir) to score a
+## sampled share of /predict batches with it in the background; batches are
+## skipped while MAX_PENDING are waiting. Stats are served at /shadow.
+SHADOW_MODEL_DIR_ENV_VAR: str = "SHADOW_MODEL_DIR"
+SHADOW_SAMPLE_RATE: float = 0.1
+SHADOW_MAX_PENDING: int = 4
+SHADOW_WINDOW_BATCHES: int = 1000
+
 """
 Data Validation related constant start with DATA_VALIDATION VAR NAME
 """
@@ -59,6 +116,13 @@ DATA_TRANSFORMATION_TRAIN_FILE_PATH: str = "train.npy"
 
 DATA_TRANSFORMATION_TEST_FILE_PATH: str = "test.npy"
 
+## opt in to storing transformed arrays and the preprocessing object in the
+## compressed chunked container (.npyc instead of .npy, read back only through
+## load_numpy_array_data/load_object); codec None picks zstd when installed, else zlib
+DATA_TRANSFORMATION_COMPRESS_ARTIFACTS: bool = False
+DATA_TRANSFORMATION_COMPRESSION_CODEC: str = None
+DATA_TRANSFORMATION_COMPRESSION_LEVEL: int = None
+
 
 """
 Model Trainer ralated constant start with MODE TRAINER VAR NAME
@@ -69,5 +133,60 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD: float = 0.05
+## random_state of every searched estimator
+MODEL_TRAINER_RANDOM_STATE: int = 42
+
+## hyperparameter search: "grid" (exhaustive), "halving" (successive halving)
+## or "warm_start" (one fit per ensemble, smaller n_estimators scored from prefixes)
+MODEL_TRAINER_SEARCH_STRATEGY: str = "warm_start"
+MODEL_TRAINER_SEARCH_CV: int = 3
+MODEL_TRAINER_HALVING_FACTOR: int = 3
+## wall-clock budget in seconds for the halving search, None for no limit
+MODEL_TRAINER_SEARCH_TIME_BUDGET: float = None
+## halving only: also run the exhaustive grid and report the score given up
+MODEL_TRAINER_SEARCH_AUDIT: bool = False
+## seed for shuffled cv splits, None keeps the unshuffled StratifiedKFold of GridSearchCV
+MODEL_TRAINER_SEARCH_CV_SEED: int = None
+## on-disk memo of candidate fits shared across training runs
+MODEL_TRAINER_FIT_CACHE_DIR: str = "fit_cache"
+MODEL_TRAINER_FIT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+## train on unique (features, label) rows weighted by their counts
+MODEL_TRAINER_COLLAPSE_DUPLICATES: bool = False
+## also time one expanded vs collapsed fit of the selected model (two extra fits)
+MODEL_TRAINER_REPORT_COLLAPSE_SPEEDUP: bool = False
+## optional step after model selection: rank features ("auto", "native" or
+## "permutation" importance) and keep the fewest whose refit test F1 is within
+## the tolerance of the model on all features; serving then only reads those
+MODEL_TRAINER_FEATURE_PRUNING: bool = False
+MODEL_TRAINER_FEATURE_PRUNING_F1_TOLERANCE: float = 0.005
+MODEL_TRAINER_FEATURE_PRUNING_IMPORTANCE: str = "auto"
+MODEL_TRAINER_FEATURE_PRUNING_MIN_FEATURES: int = 1
+
+## model selection: fastest model whose test F1 is within EPSILON of the best,
+## among models whose single-row p99 latency fits the budget (None for no budget)
+MODEL_TRAINER_SELECTION_F1_EPSILON: float = 0.0
+MODEL_TRAINER_SELECTION_P99_BUDGET_MS: float = None
+MODEL_TRAINER_LATENCY_SAMPLE_ROWS: int = 1000
+
+## experiment tracking: runs are buffered locally and synced in the background.
+## Set MLFLOW_TRACKING_URI (e.g. file:///tmp/mlruns) to use another tracking server.
+MODEL_TRAINER_TRACKING_BUFFER_DIR: str = "mlflow_buffer"
+MODEL_TRAINER_TRACKING_REGISTRY_URI: str = "https://dagshub.com/MaheshkumarGovind/networkseurity.mlflow"
+MODEL_TRAINER_DAGSHUB_REPO_OWNER: str = "MaheshkumarGovind"
+MODEL_TRAINER_DAGSHUB_REPO_NAME: str = "networkseurity"
+MODEL_TRAINER_TRACKING_MAX_RETRIES: int = 5
+
+TRAINING_BUCKET_NAME = "netwworksecurity"
 
-TRAINING_BUCKET_NAME = "netwworksecurity"
\ No newline at end of file
+"""
+Batch Prediction related constant start with BATCH_PREDICTION VAR NAME
+"""
+BATCH_PREDICTION_DIR_NAME: str = "batch_prediction"
+BATCH_PREDICTION_MANIFEST_FILE_NAME: str = "manifest.jsonl"
+BATCH_PREDICTION_PREDICTION_COLUMN: str = "predicted_column"
+## CSV input is split into byte ranges of about this size, Mongo input into
+## chunks of this many documents; each chunk becomes one output partition
+BATCH_PREDICTION_CHUNK_BYTES: int = 32 * 1024 * 1024
+BATCH_PREDICTION_CHUNK_ROWS: int = 250_000
+## worker processes, None for one per core
+BATCH_PREDICTION_WORKERS: int = None
@@ -19,6 +19,9 @@ class DataTransformationArtifact:
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    # Validated rows the arrays were built from, used to refit on a feature subset
+    raw_train_file_path: str = None
+    raw_test_file_path: str = None
 
 @dataclass
 class ClassificationMetricArtifact:
@@ -26,8 +29,37 @@ class ClassificationMetricArtifact:
     precision_score: float
     recall_score: float
     
+@dataclass
+class ModelLatencyArtifact:
+    single_row_p50_ms: float
+    single_row_p99_ms: float
+    batch_size: int
+    batch_latency_ms: float
+    batch_rows_per_second: float
+    serialized_size_bytes: int
+
+@dataclass
+class FeaturePruningArtifact:
+    n_features_before: int
+    feature_indices: list
+    baseline_f1: float
+    selected_f1: float
+    refits: int
+
 @dataclass
 class ModelTrainerArtifact:
     trained_model_file_path: str
     train_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
+    latency_metric_artifact: ModelLatencyArtifact = None
+    feature_pruning_artifact: FeaturePruningArtifact = None
+
+@dataclass
+class BatchPredictionArtifact:
+    output_dir: str
+    manifest_file_path: str
+    partition_file_paths: list
+    rows_scored: int
+    partitions_scored: int
+    partitions_skipped: int
+    duration_seconds: float
@@ -14,6 +14,11 @@ class TrainingPipelineConfig:
         self.artifact_dir=os.path.join(self.artifact_name,timestamp)
         self.model_dir=os.path.join("final_model")
         self.timestamp: str=timestamp
+        self.artifact_retention_keep_last: int = training_pipeline.ARTIFACT_RETENTION_KEEP_LAST
+        self.run_report_file_path: str = os.path.join(self.artifact_dir, training_pipeline.RUN_REPORT_FILE_NAME)
+        self.run_profile_folded_file_path: str = os.path.join(self.artifact_dir, training_pipeline.RUN_PROFILE_FOLDED_FILE_NAME)
+        self.run_profile_trace_memory: bool = training_pipeline.RUN_PROFILE_TRACE_MEMORY
+        self.run_profile_sampling_interval: float = training_pipeline.RUN_PROFILE_SAMPLING_INTERVAL
 
 
 
@@ -53,11 +58,17 @@ class DataValidationConfig:
 
 class DataTransformationConfig:
      def __init__(self,training_pipeline_config:TrainingPipelineConfig):
+        self.artifact_dir: str = training_pipeline_config.artifact_dir
+        self.model_dir: str = training_pipeline_config.model_dir
+        self.compress_artifacts: bool = training_pipeline.DATA_TRANSFORMATION_COMPRESS_ARTIFACTS
+        self.compression_codec: str = training_pipeline.DATA_TRANSFORMATION_COMPRESSION_CODEC
+        self.compression_level: int = training_pipeline.DATA_TRANSFORMATION_COMPRESSION_LEVEL
+        array_extension = "npyc" if self.compress_artifacts else "npy"
         self.data_transformation_dir: str = os.path.join( training_pipeline_config.artifact_dir,training_pipeline.DATA_TRANSFORMATION_DIR_NAME )
         self.transformed_train_file_path: str = os.path.join( self.data_transformation_dir,training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TRAIN_FILE_NAME.replace("csv", "npy"),)
+            training_pipeline.TRAIN_FILE_NAME.replace("csv", array_extension),)
         self.transformed_test_file_path: str = os.path.join(self.data_transformation_dir,  training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TEST_FILE_NAME.replace("csv", "npy"), )
+            training_pipeline.TEST_FILE_NAME.replace("csv", array_extension), )
         self.transformed_object_file_path: str = os.path.join( self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
             training_pipeline.PREPROCESSING_OBJECT_FILE_NAME,)
         
@@ -70,5 +81,58 @@ class ModelTrainerConfig:
             self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR, 
             training_pipeline.MODEL_FILE_NAME
         )
+        self.trained_model_artifact_dir: str = os.path.join(
+            self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR,
+            training_pipeline.MODEL_ARTIFACT_DIR_NAME
+        )
+        # Serving reads the artifact published here (see load_network_model)
+        self.artifact_dir: str = training_pipeline_config.artifact_dir
+        self.model_dir: str = training_pipeline_config.model_dir
+        self.final_model_artifact_dir: str = os.path.join(
+            self.model_dir, training_pipeline.MODEL_ARTIFACT_DIR_NAME
+        )
         self.expected_accuracy: float = training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
-        self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
\ No newline at end of file
+        self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
+        self.random_state: int = training_pipeline.MODEL_TRAINER_RANDOM_STATE
+        self.search_strategy: str = training_pipeline.MODEL_TRAINER_SEARCH_STRATEGY
+        self.search_cv: int = training_pipeline.MODEL_TRAINER_SEARCH_CV
+        self.halving_factor: int = training_pipeline.MODEL_TRAINER_HALVING_FACTOR
+        self.search_time_budget: float = training_pipeline.MODEL_TRAINER_SEARCH_TIME_BUDGET
+        self.search_audit: bool = training_pipeline.MODEL_TRAINER_SEARCH_AUDIT
+        self.search_cv_seed: int = training_pipeline.MODEL_TRAINER_SEARCH_CV_SEED
+        self.fit_cache_dir: str = training_pipeline.MODEL_TRAINER_FIT_CACHE_DIR
+        self.fit_cache_max_bytes: int = training_pipeline.MODEL_TRAINER_FIT_CACHE_MAX_BYTES
+        self.collapse_duplicates: bool = training_pipeline.MODEL_TRAINER_COLLAPSE_DUPLICATES
+        self.report_collapse_speedup: bool = training_pipeline.MODEL_TRAINER_REPORT_COLLAPSE_SPEEDUP
+        self.feature_pruning: bool = training_pipeline.MODEL_TRAINER_FEATURE_PRUNING
+        self.feature_pruning_f1_tolerance: float = training_pipeline.MODEL_TRAINER_FEATURE_PRUNING_F1_TOLERANCE
+        self.feature_pruning_importance: str = training_pipeline.MODEL_TRAINER_FEATURE_PRUNING_IMPORTANCE
+        self.feature_pruning_min_features: int = training_pipeline.MODEL_TRAINER_FEATURE_PRUNING_MIN_FEATURES
+        self.selection_f1_epsilon: float = training_pipeline.MODEL_TRAINER_SELECTION_F1_EPSILON
+        self.selection_p99_budget_ms: float = training_pipeline.MODEL_TRAINER_SELECTION_P99_BUDGET_MS
+        self.latency_sample_rows: int = training_pipeline.MODEL_TRAINER_LATENCY_SAMPLE_ROWS
+        self.tracking_buffer_dir: str = training_pipeline.MODEL_TRAINER_TRACKING_BUFFER_DIR
+        self.tracking_registry_uri: str = training_pipeline.MODEL_TRAINER_TRACKING_REGISTRY_URI
+        self.dagshub_repo_owner: str = training_pipeline.MODEL_TRAINER_DAGSHUB_REPO_OWNER
+        self.dagshub_repo_name: str = training_pipeline.MODEL_TRAINER_DAGSHUB_REPO_NAME
+        self.tracking_max_retries: int = training_pipeline.MODEL_TRAINER_TRACKING_MAX_RETRIES
+
+
+class BatchPredictionConfig:
+    def __init__(self, input_path: str = None, mongo_query: dict = None, output_dir: str = None,
+                 timestamp=None):
+        timestamp = (timestamp or datetime.now()).strftime("%m_%d_%Y_%H_%M_%S")
+        # CSV file or directory of CSVs (e.g. a feature store); Mongo when not set
+        self.input_path: str = input_path
+        self.mongo_query: dict = mongo_query or {}
+        self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
+        # Pass the output_dir of an interrupted job to resume it
+        self.output_dir: str = output_dir or os.path.join(training_pipeline.BATCH_PREDICTION_DIR_NAME, timestamp)
+        self.manifest_file_path: str = os.path.join(self.output_dir, training_pipeline.BATCH_PREDICTION_MANIFEST_FILE_NAME)
+        self.model_dir: str = training_pipeline.FINAL_MODEL_DIR
+        self.target_column: str = training_pipeline.TARGET_COLUMN
+        self.prediction_column: str = training_pipeline.BATCH_PREDICTION_PREDICTION_COLUMN
+        self.chunk_bytes: int = training_pipeline.BATCH_PREDICTION_CHUNK_BYTES
+        self.chunk_rows: int = training_pipeline.BATCH_PREDICTION_CHUNK_ROWS
+        self.workers: int = training_pipeline.BATCH_PREDICTION_WORKERS or os.cpu_count() or 1
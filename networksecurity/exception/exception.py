@@ -3,6 +3,14 @@ from networksecurity.logging.logger import logging
 
 class NetworkSecurityException(Exception):
     def __init__(self, error_message: str, error_details):
+        if isinstance(error_message, NetworkSecurityException):
+            # Re-wrapped on its way up the stack: keep where it was first
+            # raised and do not log it again
+            self.error_message = error_message.error_message
+            self.lineno = error_message.lineno
+            self.file_name = error_message.file_name
+            return
+
         self.error_message = error_message
         # Use sys.exc_info() for current traceback (expects error_details = sys)
         _, _, exc_tb = error_details.exc_info()
@@ -13,8 +21,8 @@ class NetworkSecurityException(Exception):
             self.lineno = "Unknown"
             self.file_name = "Unknown"
         
-        # Log the error
-        logging.error(str(self))
+        # Log the error (formatted later by the log writer thread)
+        logging.error("%s", self)
     
     def __str__(self):
-        return f"Error occurred in Python script: [{self.file_name}] at line [{self.lineno}] with message: [{self.error_message}]"
\ No newline at end of file
+        return f"Error occurred in Python script: [{self.file_name}] at line [{self.lineno}] with message: [{self.error_message}]"
@@ -1,5 +1,10 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
 # Create logs folder if not exists
@@ -10,12 +15,119 @@ os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILE)
 
-# Configure logging
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+LOG_FORMAT = "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s"
+# Records waiting for the writer thread; further records are dropped and counted
+LOG_QUEUE_SIZE = 10000
+# Per-request messages: steady rate and burst allowed per message template
+REQUEST_LOG_RATE_PER_SECOND = 5.0
+REQUEST_LOG_BURST = 20
+
+
+# Argument types whose value cannot change between the log call and the writer
+_IMMUTABLE_ARG_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+
+def _is_immutable(value) -> bool:
+    if type(value) in (tuple, frozenset):
+        return all(_is_immutable(item) for item in value)
+    return type(value) in _IMMUTABLE_ARG_TYPES
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on the log queue without formatting them, so the caller only
+    pays for creating the record. The listener thread merges args and
+    formats, except for records with a mutable argument (a list, a dict, an
+    object), whose message is merged here so later changes do not leak into
+    the log. Records are dropped, not waited for, when the queue is full.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if record.args and not _is_immutable(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template. Records over the limit are dropped;
+    the next record let through notes how many similar ones were suppressed.
+    """
+    def __init__(self, rate_per_second: float = REQUEST_LOG_RATE_PER_SECOND, burst: int = REQUEST_LOG_BURST):
+        super().__init__()
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._buckets) > 10000:
+                # Interpolated messages never repeat, do not let them pile up
+                self._buckets.clear()
+            tokens, last, suppressed = self._buckets.get(record.msg, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate_per_second)
+            if tokens < 1:
+                self._buckets[record.msg] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[record.msg] = (tokens - 1, now, 0)
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+        return True
+
+
+def _start_listener():
+    global _queue_handler, _listener
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    if _queue_handler is None:
+        _queue_handler = DeferredQueueHandler(log_queue)
+    else:
+        _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, _file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """
+    Writes out every queued record and stops the writer thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_in_child():
+    # The parent's writer thread does not exist in a forked child, and its
+    # queue lock may have been held at fork time, so start over on a new queue
+    global _listener
+    _listener = None
+    _start_listener()
+
+
+_queue_handler = None
+_listener = None
+_file_handler = logging.FileHandler(LOG_FILE_PATH)
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_start_listener()
+
+_root = logging.getLogger()
+_root.setLevel(logging.INFO)
+_root.addHandler(_queue_handler)
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
 
 # Create logger instance
 logger = logging.getLogger(__name__)
@@ -24,3 +136,15 @@ logger = logging.getLogger(__name__)
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(logging.Formatter("[ %(asctime)s ] %(levelname)s - %(message)s"))
 logger.addHandler(console_handler)
+
+
+def get_request_logger(name: str = "networksecurity.requests") -> logging.Logger:
+    """
+    Logger for per-request messages, rate limited per message template.
+    Log with %-style args (request_logger.info("shape %s", shape)) so
+    suppressed records are never formatted.
+    """
+    request_logger = logging.getLogger(name)
+    if not any(isinstance(f, RateLimitFilter) for f in request_logger.filters):
+        request_logger.addFilter(RateLimitFilter())
+    return request_logger
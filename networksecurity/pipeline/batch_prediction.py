@@ -0,0 +1,352 @@
+"""
+Out-of-core batch scoring with the served NetworkModel.
+
+The input (a CSV file, a directory of CSVs such as a feature store, or a
+Mongo query) is cut into chunks that worker processes score independently.
+The model is loaded once in the parent before the workers are forked, so they
+share it copy-on-write. Each chunk is written to its own part-NNNNN.csv, and
+every finished partition is appended to manifest.jsonl, so re-running the
+job with the same output_dir only scores what is missing.
+
+    python -m networksecurity.pipeline.batch_prediction --input data.csv --output-dir batch_prediction/job1
+"""
+import argparse
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.entity.config_entity import BatchPredictionConfig
+from networksecurity.entity.artifact_entity import BatchPredictionArtifact
+from networksecurity.cloud.mongo_client import get_collection
+from networksecurity.constant.training_pipeline import MONGO_READ_BATCH_SIZE
+from networksecurity.utils.ml_utils.model.estimator import CachedModelLoader, load_network_model
+
+# Model used by the workers; set in the parent before forking
+_WORKER_MODEL = None
+
+
+def _init_worker(model_dir: str) -> None:
+    global _WORKER_MODEL
+    try:
+        # One BLAS/OpenMP thread per worker, the processes already use every core
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=1)
+    except ImportError:
+        pass
+    if _WORKER_MODEL is None:
+        # Start methods other than fork do not inherit the parent's model
+        _WORKER_MODEL = load_network_model(model_dir)
+
+
+def _score_and_write(df: pd.DataFrame, output_path: str, target_column: str, prediction_column: str) -> int:
+    features = df.drop(columns=[target_column], errors="ignore")
+    df[prediction_column] = _WORKER_MODEL.predict(features) if len(df) else []
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, output_path)
+    return len(df)
+
+
+def _score_csv_range(task: dict) -> dict:
+    started = time.perf_counter()
+    with open(task["source"], "rb") as file_obj:
+        header = file_obj.readline()
+        file_obj.seek(task["start"])
+        data = file_obj.read(task["end"] - task["start"])
+    df = pd.read_csv(io.BytesIO(header + data))
+    df.replace({"na": np.nan}, inplace=True)
+    rows = _score_and_write(df, task["output"], task["target_column"], task["prediction_column"])
+    return {**_entry(task), "rows": rows, "seconds": time.perf_counter() - started}
+
+
+def _score_frame(task: dict, df: pd.DataFrame) -> dict:
+    started = time.perf_counter()
+    rows = _score_and_write(df, task["output"], task["target_column"], task["prediction_column"])
+    return {**_entry(task), "rows": rows, "seconds": time.perf_counter() - started}
+
+
+def _entry(task: dict) -> dict:
+    return {key: task[key] for key in ("partition", "output", "source", "start", "end", "last_id") if key in task}
+
+
+class BatchManifest:
+    """
+    Append-only progress log: a job line describing the input and model,
+    then one line per finished partition.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file_obj = None
+
+    def open(self, job: dict) -> dict:
+        """
+        Returns the finished partitions of an earlier run of the same job.
+        """
+        completed = {}
+        # Compare as stored, e.g. ObjectIds in a query become strings
+        job = json.loads(json.dumps(job, default=str))
+        if os.path.exists(self.file_path):
+            with open(self.file_path) as file_obj:
+                lines = file_obj.read().splitlines()
+            try:
+                previous_job = json.loads(lines[0])["job"] if lines else None
+            except json.JSONDecodeError:
+                # Crashed while writing the job line, nothing was scored yet
+                previous_job, lines = None, []
+            if previous_job is not None and previous_job != job:
+                raise ValueError(
+                    f"{self.file_path} belongs to a different job (input, chunking or model changed); "
+                    f"use a new output_dir"
+                )
+            for line in lines[1:]:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Line cut short by a crash, that partition is redone
+                    continue
+                if os.path.exists(entry["output"]):
+                    completed[entry["partition"]] = entry
+            if not lines:
+                os.remove(self.file_path)
+
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        new_file = not os.path.exists(self.file_path)
+        self._file_obj = open(self.file_path, "a")
+        if new_file:
+            self._append({"job": job})
+        return completed
+
+    def _append(self, record: dict) -> None:
+        self._file_obj.write(json.dumps(record, default=str) + "\n")
+        self._file_obj.flush()
+        os.fsync(self._file_obj.fileno())
+
+    def record(self, entry: dict) -> None:
+        self._append(entry)
+
+    def close(self) -> None:
+        if self._file_obj is not None:
+            self._file_obj.close()
+            self._file_obj = None
+
+
+def split_csv(file_path: str, chunk_bytes: int) -> list:
+    """
+    Splits the data rows of a CSV into (start, end) byte ranges of about
+    chunk_bytes, ending on line boundaries. Fields must not contain newlines.
+    """
+    size = os.path.getsize(file_path)
+    ranges = []
+    with open(file_path, "rb") as file_obj:
+        file_obj.readline()
+        start = file_obj.tell()
+        while start < size:
+            file_obj.seek(min(start + chunk_bytes, size))
+            if file_obj.tell() < size:
+                file_obj.readline()
+            end = file_obj.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+class BatchPrediction:
+    def __init__(self, batch_prediction_config: BatchPredictionConfig):
+        try:
+            self.batch_prediction_config = batch_prediction_config
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _input_files(self) -> list:
+        input_path = self.batch_prediction_config.input_path
+        if os.path.isdir(input_path):
+            files = sorted(glob.glob(os.path.join(input_path, "**", "*.csv"), recursive=True))
+        else:
+            files = [input_path]
+        if not files:
+            raise ValueError(f"No CSV files found in {input_path}")
+        return files
+
+    def _job(self, model_version: str) -> dict:
+        config = self.batch_prediction_config
+        job = {"model_version": model_version}
+        if config.input_path:
+            job["input"] = [
+                {"path": os.path.abspath(path), "size": os.path.getsize(path),
+                 "mtime_ns": os.stat(path).st_mtime_ns}
+                for path in self._input_files()
+            ]
+            job["chunk_bytes"] = config.chunk_bytes
+        else:
+            job["input"] = {"database": config.database_name, "collection": config.collection_name,
+                            "query": config.mongo_query}
+            job["chunk_rows"] = config.chunk_rows
+        return job
+
+    def _partition_path(self, partition: int) -> str:
+        return os.path.join(self.batch_prediction_config.output_dir, f"part-{partition:05d}.csv")
+
+    def _csv_tasks(self):
+        config = self.batch_prediction_config
+        partition = 0
+        for file_path in self._input_files():
+            for start, end in split_csv(file_path, config.chunk_bytes):
+                yield {"partition": partition, "output": self._partition_path(partition), "source": file_path,
+                       "start": start, "end": end}, None
+                partition += 1
+
+    def _mongo_tasks(self, completed: dict):
+        """
+        Reads the collection in _id order. Resumes after the last document of
+        the longest run of finished partitions; finished ones after it are read
+        again but not rescored.
+        """
+        from bson import json_util
+
+        config = self.batch_prediction_config
+        partition = 0
+        while partition in completed:
+            partition += 1
+        query = dict(config.mongo_query)
+        if partition:
+            last_id = json_util.loads(completed[partition - 1]["last_id"])
+            query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+
+        collection = get_collection(config.database_name, config.collection_name)
+        cursor = collection.find(query).sort("_id", 1).batch_size(min(config.chunk_rows, MONGO_READ_BATCH_SIZE))
+        with cursor:
+            batch = []
+            for document in cursor:
+                batch.append(document)
+                if len(batch) == config.chunk_rows:
+                    yield self._mongo_task(partition, batch)
+                    partition, batch = partition + 1, []
+            if batch:
+                yield self._mongo_task(partition, batch)
+
+    def _mongo_task(self, partition: int, documents: list):
+        from bson import json_util
+
+        df = pd.DataFrame(documents)
+        last_id = json_util.dumps(df["_id"].iloc[-1])
+        df = df.drop(columns=["_id"])
+        df.replace({"na": np.nan}, inplace=True)
+        return {"partition": partition, "output": self._partition_path(partition), "last_id": last_id}, df
+
+    def initiate_batch_prediction(self) -> BatchPredictionArtifact:
+        global _WORKER_MODEL
+        try:
+            config = self.batch_prediction_config
+            started = time.perf_counter()
+            model_loader = CachedModelLoader(config.model_dir)
+            _WORKER_MODEL = model_loader.get()
+
+            manifest = BatchManifest(config.manifest_file_path)
+            completed = manifest.open(self._job(model_loader.version))
+            if completed:
+                logging.info(f"Resuming batch prediction, {len(completed)} partitions already scored")
+
+            if config.input_path:
+                tasks = self._csv_tasks()
+            else:
+                tasks = self._mongo_tasks(completed)
+
+            # Fork where available so workers share the already loaded model
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+            max_pending = 2 * config.workers
+            rows_scored = scored = skipped = 0
+            failed = []
+            partition_paths = {partition: entry["output"] for partition, entry in completed.items()}
+
+            def collect(futures):
+                nonlocal rows_scored, scored
+                for future in futures:
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        failed.append(e)
+                        logging.error(f"Batch prediction partition failed: {e}")
+                        continue
+                    manifest.record(entry)
+                    partition_paths[entry["partition"]] = entry["output"]
+                    rows_scored += entry["rows"]
+                    scored += 1
+                    elapsed = time.perf_counter() - started
+                    logging.info(
+                        f"Scored partition {entry['partition']} ({entry['rows']} rows in {entry['seconds']:.2f}s), "
+                        f"{rows_scored / elapsed:.0f} rows/s overall"
+                    )
+
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=config.workers,
+                    mp_context=multiprocessing.get_context(start_method),
+                    initializer=_init_worker,
+                    initargs=(config.model_dir,),
+                ) as executor:
+                    pending = set()
+                    for task, df in tasks:
+                        if task["partition"] in completed:
+                            skipped += 1
+                            continue
+                        task["target_column"] = config.target_column
+                        task["prediction_column"] = config.prediction_column
+                        # Bound the chunks held in memory while workers are busy
+                        while len(pending) >= max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                        if df is None:
+                            pending.add(executor.submit(_score_csv_range, task))
+                        else:
+                            pending.add(executor.submit(_score_frame, task, df))
+                    collect(wait(pending).done)
+            finally:
+                manifest.close()
+
+            if failed:
+                raise RuntimeError(
+                    f"{len(failed)} partitions failed, run again with output_dir={config.output_dir} to resume"
+                )
+
+            batch_prediction_artifact = BatchPredictionArtifact(
+                output_dir=config.output_dir,
+                manifest_file_path=config.manifest_file_path,
+                partition_file_paths=[partition_paths[partition] for partition in sorted(partition_paths)],
+                rows_scored=rows_scored,
+                partitions_scored=scored,
+                partitions_skipped=skipped,
+                duration_seconds=time.perf_counter() - started,
+            )
+            logging.info(f"Batch prediction completed: {batch_prediction_artifact}")
+            return batch_prediction_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV, a directory of CSVs or a Mongo query in batch")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="CSV file or directory of CSV files")
+    source.add_argument("--mongo-query", help="JSON filter on the ingestion collection, e.g. '{}'")
+    parser.add_argument("--output-dir", help="job directory; pass an existing one to resume")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    batch_prediction_config = BatchPredictionConfig(
+        input_path=args.input,
+        mongo_query=json.loads(args.mongo_query) if args.mongo_query else None,
+        output_dir=args.output_dir,
+    )
+    if args.workers:
+        batch_prediction_config.workers = args.workers
+    print(BatchPrediction(batch_prediction_config).initiate_batch_prediction())
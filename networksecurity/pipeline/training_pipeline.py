@@ -8,6 +8,8 @@ from networksecurity.components.data_ingestion import DataIngestion
 from networksecurity.components.data_validation import DataValidation
 from networksecurity.components.data_transformation import DataTransformation
 from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.utils.main_utils.utils import prune_artifact_runs
+from networksecurity.utils.main_utils.profiler import RunProfiler, profile_stage
 
 from networksecurity.entity.config_entity import (
     TrainingPipelineConfig,
@@ -28,6 +30,8 @@ from networksecurity.entity.artifact_entity import (
 class TrainingPipeline:
     def __init__(self):
         self.training_pipeline_config = TrainingPipelineConfig()
+        # Set by run_pipeline; the start_* stages are recorded in its run report
+        self.profiler = None
     
     def start_data_ingestion(self) -> DataIngestionArtifact:
         try:
@@ -38,7 +42,9 @@ class TrainingPipeline:
             data_ingestion = DataIngestion(
                 data_ingestion_config=self.data_ingestion_config
             )
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+            with profile_stage(self.profiler, "data_ingestion") as stage:
+                data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+                stage.add_files(data_ingestion_artifact.trained_file_path, data_ingestion_artifact.test_file_path)
             logging.info(f"Data ingestion completed: {data_ingestion_artifact}")
             return data_ingestion_artifact
         except Exception as e:
@@ -54,7 +60,9 @@ class TrainingPipeline:
                 data_validation_config=data_validation_config
             )
             logging.info("Starting data validation")
-            data_validation_artifact = data_validation.initiate_data_validation()
+            with profile_stage(self.profiler, "data_validation") as stage:
+                data_validation_artifact = data_validation.initiate_data_validation()
+                stage.add_files(data_ingestion_artifact.trained_file_path, data_ingestion_artifact.test_file_path)
             return data_validation_artifact
         except Exception as e:
             raise NetworkSecurityException(e, sys)
@@ -74,7 +82,12 @@ class TrainingPipeline:
             )
 
             logging.info("Starting data transformation")
-            data_transformation_artifact = data_transformation.initiate_data_transformation()
+            with profile_stage(self.profiler, "data_transformation") as stage:
+                data_transformation_artifact = data_transformation.initiate_data_transformation()
+                stage.add_files(
+                    data_transformation_artifact.transformed_train_file_path,
+                    data_transformation_artifact.transformed_test_file_path,
+                )
             logging.info(f"Data transformation completed: {data_transformation_artifact}")
             return data_transformation_artifact
         except Exception as e:
@@ -89,9 +102,15 @@ class TrainingPipeline:
             model_trainer = ModelTrainer(
                 data_transformation_artifact=data_transformation_artifact,
                 model_trainer_config=self.model_trainer_config,
+                profiler=self.profiler,
             )
             logging.info("Starting model training")
-            model_trainer_artifact = model_trainer.initiate_model_trainer()
+            with profile_stage(self.profiler, "model_trainer") as stage:
+                model_trainer_artifact = model_trainer.initiate_model_trainer()
+                stage.add_files(
+                    data_transformation_artifact.transformed_train_file_path,
+                    data_transformation_artifact.transformed_test_file_path,
+                )
             logging.info(f"Model training completed: {model_trainer_artifact}")
             return model_trainer_artifact
         except Exception as e:
@@ -100,6 +119,10 @@ class TrainingPipeline:
     def run_pipeline(self):
         try:
             logging.info("=== Training Pipeline Started ===")
+            self.profiler = RunProfiler(
+                trace_memory=self.training_pipeline_config.run_profile_trace_memory,
+                sample_interval=self.training_pipeline_config.run_profile_sampling_interval,
+            )
             data_ingestion_artifact = self.start_data_ingestion()
             data_validation_artifact = self.start_data_validation(
                 data_ingestion_artifact=data_ingestion_artifact
@@ -110,7 +133,23 @@ class TrainingPipeline:
             model_trainer_artifact = self.start_model_trainer(
                 data_transformation_artifact=data_transformation_artifact
             )
+            self.profiler.write_report(
+                self.training_pipeline_config.run_report_file_path,
+                self.training_pipeline_config.run_profile_folded_file_path,
+            )
+            prune_artifact_runs(
+                self.training_pipeline_config.artifact_name,
+                keep_last=self.training_pipeline_config.artifact_retention_keep_last,
+                model_dir=self.training_pipeline_config.model_dir,
+                keep=[self.training_pipeline_config.artifact_dir],
+            )
             logging.info("=== Training Pipeline Completed Successfully ===")
             return model_trainer_artifact
         except Exception as e:
+            if self.profiler is not None:
+                # The report of a failed run shows where it got to
+                self.profiler.write_report(
+                    self.training_pipeline_config.run_report_file_path,
+                    self.training_pipeline_config.run_profile_folded_file_path,
+                )
             raise NetworkSecurityException(e, sys)
@@ -0,0 +1,319 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_BUCKETS = (1, 4, 16, 64, 256, 1024, 4096, 16384)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Sharded:
+    """
+    Base for metrics whose updates go to a per-thread shard, so the request
+    path never takes a lock; collect() sums the shards of every thread.
+    """
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # Only taken once per thread
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _label_values(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _snapshot(self):
+        with self._shards_lock:
+            return list(self._shards)
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        shard = self._shard()
+        key = self._label_values(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def collect(self):
+        totals = {}
+        for shard in self._snapshot():
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0) + value
+        for key, value in totals.items():
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Gauge(Counter):
+    """
+    Up/down gauge; inc and dec may happen on different threads.
+    """
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shard()
+        key = self._label_values(labels)
+        state = shard.get(key)
+        if state is None:
+            # bucket counts (last one is +Inf), sum
+            state = shard[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time, **labels)
+
+    def collect(self):
+        totals = {}
+        for shard in self._snapshot():
+            for key, (counts, total) in list(shard.items()):
+                merged = totals.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                for i, count in enumerate(list(counts)):
+                    merged[0][i] += count
+                merged[1] += total
+        for key, (counts, total) in totals.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket", {**labels, "le": le}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class FunctionMetric:
+    """
+    Metric read from a callback at scrape time, e.g. the model cache counters.
+    The callback returns a number, or a list of (labels, value) pairs.
+    """
+    def __init__(self, name: str, documentation: str, function, kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        self.kind = kind
+
+    def collect(self):
+        value = self.function()
+        if value is None:
+            return
+        if isinstance(value, list):
+            for labels, sample in value:
+                yield self.name, labels, sample
+        else:
+            yield self.name, {}, value
+
+
+class MetricsRegistry:
+    """
+    Renders registered metrics in the Prometheus text format. Every sample is
+    labelled with the process id, so pre-fork workers can be told apart.
+    """
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        pid = str(os.getpid())
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.collect():
+                lines.append(f"{name}{_format_labels({**labels, 'pid': pid})} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = MetricsRegistry()
+
+PREDICT_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "networksecurity_predict_stage_seconds",
+    "Time spent in each stage of /predict.",
+    labelnames=("stage",),
+))
+PREDICT_REQUESTS = REGISTRY.register(Counter(
+    "networksecurity_predict_requests_total",
+    "Prediction requests by outcome.",
+    labelnames=("status",),
+))
+PREDICT_ROWS = REGISTRY.register(Counter(
+    "networksecurity_predict_rows_total",
+    "Rows scored by /predict.",
+))
+PREDICT_REQUEST_BYTES = REGISTRY.register(Histogram(
+    "networksecurity_predict_request_bytes",
+    "Size of uploaded prediction files.",
+    buckets=SIZE_BUCKETS,
+))
+PREDICT_IN_FLIGHT = REGISTRY.register(Gauge(
+    "networksecurity_predict_in_flight",
+    "Prediction requests being processed.",
+))
+
+STREAM_ROWS = REGISTRY.register(Counter(
+    "networksecurity_stream_rows_total",
+    "Rows seen by the stream scoring worker, by outcome (received, scored, invalid).",
+    labelnames=("status",),
+))
+STREAM_BATCH_ROWS = REGISTRY.register(Histogram(
+    "networksecurity_stream_batch_rows",
+    "Rows per batch scored by the stream worker.",
+    buckets=BATCH_BUCKETS,
+))
+STREAM_LAG_SECONDS = REGISTRY.register(Histogram(
+    "networksecurity_stream_lag_seconds",
+    "Time from reading a row to writing its prediction, per batch (oldest row).",
+))
+STREAM_BACKPRESSURE_SECONDS = REGISTRY.register(Counter(
+    "networksecurity_stream_backpressure_seconds_total",
+    "Time the stream readers waited on a full queue, i.e. the producer was held back.",
+))
+
+PREDICTION_LOG_ROWS = REGISTRY.register(Counter(
+    "networksecurity_prediction_log_rows_total",
+    "Prediction rows sent to the MongoDB prediction log, by outcome (queued, written, dropped, failed).",
+    labelnames=("status",),
+))
+PREDICTION_LOG_FLUSH_SECONDS = REGISTRY.register(Histogram(
+    "networksecurity_prediction_log_flush_seconds",
+    "Duration of prediction log insert_many calls.",
+))
+
+SHADOW_BATCHES = REGISTRY.register(Counter(
+    "networksecurity_shadow_batches_total",
+    "Sampled /predict batches for the candidate model, by outcome (scored, skipped, failed).",
+    labelnames=("status",),
+))
+SHADOW_ROWS = REGISTRY.register(Counter(
+    "networksecurity_shadow_rows_total",
+    "Shadow scored rows by whether live and candidate predictions agree.",
+    labelnames=("outcome",),
+))
+SHADOW_SCORE_SECONDS = REGISTRY.register(Histogram(
+    "networksecurity_shadow_score_seconds",
+    "Time to score a shadowed batch, per model (live, candidate).",
+    labelnames=("model",),
+))
+
+
+def register_model_loader(loader) -> None:
+    """
+    Exposes the hit/miss counters and version of a CachedModelLoader.
+    """
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_model_cache_hits_total", "Served model cache hits.",
+        lambda: loader.hits, kind="counter",
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_model_cache_misses_total", "Served model (re)loads.",
+        lambda: loader.misses, kind="counter",
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_model_cache_hit_ratio", "Share of model lookups served from memory.",
+        lambda: loader.hits / (loader.hits + loader.misses) if loader.hits + loader.misses else None,
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_model_info", "Version of the served model.",
+        lambda: [({"version": loader.version}, 1)] if loader.version is not None else None,
+    ))
+
+
+def register_stream_worker(worker) -> None:
+    """
+    Exposes the queue depth and batching state of a StreamScoringWorker.
+    """
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_stream_queue_rows", "Rows waiting to be batched.",
+        lambda: worker.queue_depth,
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_stream_inflight_batches", "Batches being scored or written.",
+        lambda: worker.inflight_batches,
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_stream_batch_target_rows", "Current adaptive batch size.",
+        lambda: worker.batch_target,
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_stream_source_lag_bytes", "Unread bytes of a tailed file.",
+        lambda: worker.source.lag_bytes,
+    ))
+
+
+def register_prediction_log(get_log) -> None:
+    """
+    Exposes the queue depth of the PredictionLog returned by get_log(), if any.
+    """
+    def queued_rows():
+        prediction_log = get_log()
+        return prediction_log.queued_rows if prediction_log is not None else None
+
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_prediction_log_queue_rows", "Prediction rows waiting to be written.",
+        queued_rows,
+    ))
+
+
+def register_shadow_scorer(scorer) -> None:
+    """
+    Exposes the model sizes and pending batches of a ShadowScorer.
+    """
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_shadow_model_bytes", "Approximate memory held by the live and candidate models.",
+        lambda: [({"model": name}, nbytes) for name, nbytes in scorer.model_bytes().items()] or None,
+    ))
+    REGISTRY.register(FunctionMetric(
+        "networksecurity_shadow_pending_batches", "Shadow batches waiting for or being scored.",
+        lambda: scorer.pending,
+    ))
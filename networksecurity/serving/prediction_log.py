@@ -0,0 +1,190 @@
+"""
+Background persistence of served predictions to MongoDB.
+
+The request path only appends the scored frame to an in-memory queue. A task
+on the event loop turns queued frames into documents (in a thread) and
+writes them with unordered insert_many once batch_size rows are queued or
+the oldest has waited flush_interval seconds, so requests never wait for a
+database round trip. When the queue is full, overflow_policy decides:
+"drop_newest" discards the new rows, "drop_oldest" the oldest queued ones,
+and "block" makes record() wait for room (which does add to latency).
+"""
+import asyncio
+import sys
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+from pymongo.errors import BulkWriteError
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.serving import metrics
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+
+class PredictionLog:
+    def __init__(self, collection, max_queue_rows: int = 100_000, batch_size: int = 1000,
+                 flush_interval: float = 1.0, overflow_policy: str = "drop_newest",
+                 max_retries: int = 3, retry_backoff_seconds: float = 0.5,
+                 prediction_column: str = "predicted_column"):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {overflow_policy!r}")
+        self.collection = collection
+        self.max_queue_rows = max_queue_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.prediction_column = prediction_column
+
+        # (frame, meta, enqueued_at) entries; queued_rows is their total length
+        self._queue = deque()
+        self.queued_rows = 0
+        self._wakeup = None
+        self._room = None
+        self._task = None
+        self._closing = False
+
+    def start(self) -> None:
+        """
+        Starts the writer on the running event loop.
+        """
+        self._wakeup = asyncio.Event()
+        self._room = asyncio.Condition()
+        self._task = asyncio.create_task(self._run())
+
+    async def record(self, frame, model_version: str = None, latency_seconds: float = None,
+                     request_id: str = None) -> bool:
+        """
+        Queues the rows of a scored frame (features plus prediction_column).
+        Returns False when the rows were dropped because the queue is full.
+        """
+        rows = len(frame)
+        if not rows or self._task is None or self._closing:
+            return False
+        if self.queued_rows + rows > self.max_queue_rows:
+            if self.overflow_policy == "drop_newest":
+                metrics.PREDICTION_LOG_ROWS.inc(rows, status="dropped")
+                return False
+            if self.overflow_policy == "drop_oldest":
+                while self._queue and self.queued_rows + rows > self.max_queue_rows:
+                    dropped = self._queue.popleft()
+                    self.queued_rows -= len(dropped[0])
+                    metrics.PREDICTION_LOG_ROWS.inc(len(dropped[0]), status="dropped")
+            else:
+                async with self._room:
+                    await self._room.wait_for(
+                        lambda: self.queued_rows + rows <= self.max_queue_rows or not self._queue
+                    )
+
+        meta = {
+            "request_id": request_id or uuid.uuid4().hex,
+            "model_version": model_version,
+            "latency_ms": latency_seconds * 1000 if latency_seconds is not None else None,
+            "batch_rows": rows,
+            "created_at": datetime.now(timezone.utc),
+        }
+        self._queue.append((frame, meta, time.monotonic()))
+        self.queued_rows += rows
+        metrics.PREDICTION_LOG_ROWS.inc(rows, status="queued")
+        if self.queued_rows >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _take_batch(self) -> list:
+        entries = []
+        rows = 0
+        while self._queue and rows < self.batch_size:
+            entry = self._queue.popleft()
+            entries.append(entry)
+            rows += len(entry[0])
+        self.queued_rows -= rows
+        return entries
+
+    def _documents(self, entries: list) -> list:
+        documents = []
+        for frame, meta, _ in entries:
+            predictions = frame[self.prediction_column].tolist() if self.prediction_column in frame else None
+            features = frame.drop(columns=[self.prediction_column], errors="ignore").to_dict("records")
+            for row, row_features in enumerate(features):
+                documents.append({
+                    **meta,
+                    "row": row,
+                    "features": row_features,
+                    "prediction": predictions[row] if predictions is not None else None,
+                })
+        return documents
+
+    async def _write(self, documents: list) -> None:
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                await self.collection.insert_many(documents, ordered=False)
+                metrics.PREDICTION_LOG_FLUSH_SECONDS.observe(time.perf_counter() - started)
+                metrics.PREDICTION_LOG_ROWS.inc(len(documents), status="written")
+                return
+            except BulkWriteError as e:
+                # Unordered: everything but the failed documents was written
+                inserted = e.details.get("nInserted", 0)
+                metrics.PREDICTION_LOG_ROWS.inc(inserted, status="written")
+                metrics.PREDICTION_LOG_ROWS.inc(len(documents) - inserted, status="failed")
+                logging.error(f"Prediction log insert partly failed: {len(documents) - inserted} documents")
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    metrics.PREDICTION_LOG_ROWS.inc(len(documents), status="failed")
+                    logging.error(f"Prediction log insert of {len(documents)} documents failed: {e}")
+                    return
+                await asyncio.sleep(self.retry_backoff_seconds * 2 ** attempt)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if self.queued_rows < self.batch_size and not self._closing:
+                age = time.monotonic() - self._queue[0][2]
+                if age < self.flush_interval:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.flush_interval - age)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+            entries = self._take_batch()
+            async with self._room:
+                self._room.notify_all()
+            try:
+                documents = await asyncio.to_thread(self._documents, entries)
+            except Exception as e:
+                rows = sum(len(entry[0]) for entry in entries)
+                metrics.PREDICTION_LOG_ROWS.inc(rows, status="failed")
+                logging.error(f"Prediction log could not convert {rows} rows: {e}")
+                continue
+            await self._write(documents)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Flushes what is queued, waiting at most timeout seconds.
+        """
+        if self._task is None:
+            return
+        try:
+            self._closing = True
+            self._wakeup.set()
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logging.warning(f"Prediction log closed with {self.queued_rows} rows not written")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+        finally:
+            self._task = None
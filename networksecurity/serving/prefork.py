@@ -0,0 +1,255 @@
+import asyncio
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging, stop_logging
+
+
+class _Worker:
+    def __init__(self, pid: int, heartbeat_fd: int):
+        self.pid = pid
+        self.heartbeat_fd = heartbeat_fd
+        self.started_at = time.monotonic()
+        self.last_heartbeat = None
+
+
+class PreforkServer:
+    """
+    Multi-process server for the FastAPI app.
+
+    The parent binds the listening socket and runs preload (e.g. loading the
+    model) before forking, so workers inherit the loaded objects copy-on-write
+    and share the socket. Each worker's event loop writes a heartbeat to a
+    pipe; workers that exit or stop sending heartbeats are replaced. When
+    model_version() changes after a preload, or on SIGHUP, workers are
+    replaced one at a time, each only after its successor is serving.
+    """
+    def __init__(self, app, host: str = "0.0.0.0", port: int = 8000, workers: int = None,
+                 preload=None, model_version=None, heartbeat_interval: float = 2.0,
+                 heartbeat_timeout: float = 30.0, reload_check_interval: float = 10.0,
+                 log_level: str = "info"):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.preload = preload
+        self.model_version = model_version
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reload_check_interval = reload_check_interval
+        self.log_level = log_level
+
+        self._socket = None
+        self._workers = {}
+        self._running = False
+        self._restart_requested = False
+        self._current_version = None
+
+    # ---------------------------------------------------------------- parent
+    def _run_preload(self) -> None:
+        if self.preload is None:
+            return
+        try:
+            self.preload()
+        except Exception as e:
+            logging.warning(f"Preload in the parent failed, workers will load lazily: {e}")
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self) -> _Worker:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            for worker in self._workers.values():
+                os.close(worker.heartbeat_fd)
+            self._serve_worker(write_fd)
+            stop_logging()
+            os._exit(0)
+
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        worker = _Worker(pid, read_fd)
+        self._workers[pid] = worker
+        logging.info(f"Started worker {pid}")
+        return worker
+
+    def _read_heartbeats(self, timeout: float) -> None:
+        fds = {worker.heartbeat_fd: worker for worker in self._workers.values()}
+        if not fds:
+            time.sleep(timeout)
+            return
+        try:
+            readable, _, _ = select.select(list(fds), [], [], timeout)
+        except InterruptedError:
+            return
+        for fd in readable:
+            try:
+                if os.read(fd, 4096):
+                    fds[fd].last_heartbeat = time.monotonic()
+            except BlockingIOError:
+                pass
+
+    def _reap(self) -> list:
+        exited = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            worker = self._workers.pop(pid, None)
+            if worker is not None:
+                os.close(worker.heartbeat_fd)
+                exited.append((pid, status))
+        return exited
+
+    def _check_health(self) -> None:
+        now = time.monotonic()
+        for worker in list(self._workers.values()):
+            last_seen = worker.last_heartbeat or worker.started_at
+            if now - last_seen > self.heartbeat_timeout:
+                logging.error(f"Worker {worker.pid} missed heartbeats for {now - last_seen:.0f}s, killing it")
+                self._signal(worker.pid, signal.SIGKILL)
+
+    def _signal(self, pid: int, sig) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def _wait_ready(self, worker: _Worker) -> bool:
+        deadline = time.monotonic() + self.heartbeat_timeout
+        while self._running and time.monotonic() < deadline:
+            self._read_heartbeats(self.heartbeat_interval)
+            self._reap()
+            if worker.pid not in self._workers:
+                return False
+            if worker.last_heartbeat is not None:
+                return True
+        return False
+
+    def _rolling_restart(self) -> None:
+        logging.info("Rolling restart of workers")
+        for pid in list(self._workers):
+            if not self._running:
+                return
+            new_worker = self._spawn()
+            if not self._wait_ready(new_worker):
+                logging.error(f"Replacement worker {new_worker.pid} did not become healthy, keeping {pid}")
+                continue
+            self._signal(pid, signal.SIGTERM)
+            logging.info(f"Worker {new_worker.pid} replaced {pid}")
+
+    def _maybe_reload(self) -> None:
+        if self.model_version is None:
+            return
+        self._run_preload()
+        version = self.model_version()
+        if version != self._current_version:
+            logging.info(f"Model version changed from {self._current_version} to {version}")
+            self._current_version = version
+            self._restart_requested = True
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._running = False
+
+    def _handle_hup(self, signum, frame) -> None:
+        self._restart_requested = True
+
+    def run(self) -> None:
+        try:
+            self._socket = self._bind()
+            self._run_preload()
+            if self.model_version is not None:
+                self._current_version = self.model_version()
+
+            signal.signal(signal.SIGTERM, self._handle_stop)
+            signal.signal(signal.SIGINT, self._handle_stop)
+            signal.signal(signal.SIGHUP, self._handle_hup)
+
+            self._running = True
+            for _ in range(self.workers):
+                self._spawn()
+            logging.info(f"Serving on {self.host}:{self.port} with {self.workers} workers (parent {os.getpid()})")
+
+            last_reload_check = time.monotonic()
+            while self._running:
+                self._read_heartbeats(self.heartbeat_interval)
+                for pid, status in self._reap():
+                    logging.warning(f"Worker {pid} exited with status {status}")
+                if not self._running:
+                    break
+                self._check_health()
+                while len(self._workers) < self.workers:
+                    self._spawn()
+
+                if time.monotonic() - last_reload_check >= self.reload_check_interval:
+                    last_reload_check = time.monotonic()
+                    self._maybe_reload()
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._rolling_restart()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        logging.info("Stopping workers")
+        for pid in list(self._workers):
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + 30
+        while self._workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self._workers):
+            self._signal(pid, signal.SIGKILL)
+        self._reap()
+        if self._socket is not None:
+            self._socket.close()
+
+    # ---------------------------------------------------------------- worker
+    def _serve_worker(self, heartbeat_fd: int) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        os.set_blocking(heartbeat_fd, False)
+        config = uvicorn.Config(self.app, log_level=self.log_level, lifespan="on")
+        server = uvicorn.Server(config)
+
+        async def heartbeat():
+            # Written from the event loop, so a blocked loop stops the heartbeats
+            while True:
+                try:
+                    os.write(heartbeat_fd, b".")
+                except BlockingIOError:
+                    pass
+                await asyncio.sleep(self.heartbeat_interval)
+
+        async def serve():
+            task = asyncio.create_task(heartbeat())
+            try:
+                await server.serve(sockets=[self._socket])
+            finally:
+                task.cancel()
+
+        try:
+            asyncio.run(serve())
+        except Exception as e:
+            logging.error("Worker %s crashed: %s", os.getpid(), e)
+            stop_logging()
+            os._exit(1)
@@ -0,0 +1,141 @@
+"""
+Per-request storage of scored frames, read back one page at a time.
+
+Each result is saved under a random id in the chunked container format of
+utils.save_numpy_array_data: chunks of chunk_rows rows, each a compressed
+pickled DataFrame. A page touches at most two chunks, so serving it costs
+the same whatever the size of the upload.
+"""
+import math
+import os
+import pickle
+import re
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import ChunkedReader, ChunkedWriter
+
+RESULT_FILE_EXTENSION = ".chunks"
+_RESULT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class ResultPage:
+    result_id: str
+    rows: pd.DataFrame
+    page: int
+    page_size: int
+    n_rows: int
+
+    @property
+    def n_pages(self) -> int:
+        return max(1, math.ceil(self.n_rows / self.page_size))
+
+
+def _check_page(page: int, page_size: int) -> None:
+    if page < 1 or page_size < 1:
+        raise ValueError(f"page and page_size start at 1, got page={page}, page_size={page_size}")
+
+
+class ResultStore:
+    def __init__(self, root_dir: str, chunk_rows: int = 5000, ttl_seconds: float = None,
+                 codec: str = None, prune_interval_seconds: float = 60.0):
+        self.root_dir = root_dir
+        self.chunk_rows = chunk_rows
+        self.ttl_seconds = ttl_seconds
+        self.codec = codec
+        self.prune_interval_seconds = prune_interval_seconds
+        self._last_prune = 0.0
+
+    def path(self, result_id: str) -> str:
+        if not _RESULT_ID_PATTERN.match(result_id or ""):
+            raise ValueError(f"Invalid result id: {result_id!r}")
+        return os.path.join(self.root_dir, result_id + RESULT_FILE_EXTENSION)
+
+    def _expired(self, mtime: float, now: float = None) -> bool:
+        return self.ttl_seconds is not None and (now or time.time()) - mtime > self.ttl_seconds
+
+    def exists(self, result_id: str) -> bool:
+        """
+        Whether the result is stored and not past ttl_seconds; expired files
+        count as gone even before the next prune removes them.
+        """
+        try:
+            return not self._expired(os.stat(self.path(result_id)).st_mtime)
+        except (ValueError, FileNotFoundError):
+            return False
+
+    def save(self, df: pd.DataFrame) -> str:
+        """
+        Stores df under a new id and returns the id.
+        """
+        try:
+            result_id = uuid.uuid4().hex
+            metadata = {"kind": "dataframe", "n_rows": len(df), "chunk_rows": self.chunk_rows,
+                        "columns": [str(column) for column in df.columns]}
+            with ChunkedWriter(self.path(result_id), codec=self.codec, metadata=metadata) as writer:
+                for start in range(0, len(df), self.chunk_rows):
+                    writer.write_chunk(pickle.dumps(df.iloc[start:start + self.chunk_rows],
+                                                    protocol=pickle.HIGHEST_PROTOCOL))
+            self._maybe_prune()
+            return result_id
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def page_of(df: pd.DataFrame, result_id: str, page: int, page_size: int) -> ResultPage:
+        """
+        The page of a frame still in memory, e.g. right after save.
+        """
+        _check_page(page, page_size)
+        start = (page - 1) * page_size
+        return ResultPage(result_id, df.iloc[start:start + page_size], page, page_size, len(df))
+
+    def read_page(self, result_id: str, page: int, page_size: int) -> ResultPage:
+        """
+        Reads rows [(page - 1) * page_size, page * page_size) from the store.
+        """
+        try:
+            _check_page(page, page_size)
+            if not self.exists(result_id):
+                raise FileNotFoundError(f"Prediction result {result_id!r} not found or expired")
+            with ChunkedReader(self.path(result_id)) as reader:
+                n_rows = reader.metadata["n_rows"]
+                chunk_rows = reader.metadata["chunk_rows"]
+                start = (page - 1) * page_size
+                end = min(start + page_size, n_rows)
+                if start >= end:
+                    columns = reader.metadata["columns"]
+                    return ResultPage(result_id, pd.DataFrame(columns=columns), page, page_size, n_rows)
+
+                first_chunk, last_chunk = start // chunk_rows, (end - 1) // chunk_rows
+                frames = [pickle.loads(reader.read_chunk(index)) for index in range(first_chunk, last_chunk + 1)]
+                rows = pd.concat(frames) if len(frames) > 1 else frames[0]
+                offset = start - first_chunk * chunk_rows
+                return ResultPage(result_id, rows.iloc[offset:offset + end - start], page, page_size, n_rows)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _maybe_prune(self) -> None:
+        now = time.time()
+        if self.ttl_seconds is None or now - self._last_prune < self.prune_interval_seconds:
+            return
+        self._last_prune = now
+        removed = 0
+        for entry in os.scandir(self.root_dir):
+            if not entry.name.endswith(RESULT_FILE_EXTENSION):
+                continue
+            try:
+                if self._expired(entry.stat().st_mtime, now):
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        if removed:
+            logging.info(f"Removed {removed} prediction results older than {self.ttl_seconds}s")
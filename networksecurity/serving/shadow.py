@@ -0,0 +1,170 @@
+"""
+Shadow scoring of a candidate model on live traffic.
+
+A sampled fraction of /predict batches is also scored by a candidate
+NetworkModel (e.g. a model_trainer/trained_model directory that has not been
+promoted to final_model) on a single background thread, after the response
+has been computed, so the candidate never adds to request latency. Batches
+beyond max_pending in flight are skipped rather than queued.
+
+Per model the scorer records batch latency, rows per second and the size
+of the loaded model in memory; per row, whether the two predictions agree.
+Candidate latency is measured on the background thread while requests are
+served, so it is a slight overestimate of what the model would cost alone.
+"""
+import asyncio
+import pickle
+import random
+import threading
+import time
+from collections import Counter as CountMap
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from networksecurity.logging.logger import logging
+from networksecurity.serving import metrics
+
+
+def model_nbytes(obj) -> int:
+    """
+    Approximate memory held by obj: its pickle with the large buffers
+    (numpy arrays, including memory-mapped ones) counted but not copied.
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return len(data) + sum(buffer.raw().nbytes for buffer in buffers)
+
+
+class ShadowScorer:
+    def __init__(self, candidate_loader, sample_rate: float = 0.1, max_pending: int = 4,
+                 window_batches: int = 1000, seed: int = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in [0, 1], got {sample_rate}")
+        self.candidate_loader = candidate_loader
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.pending = 0
+
+        self._random = random.Random(seed)
+        # One thread: shadow work never takes more than one core from serving
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._tasks = set()
+        self._lock = threading.Lock()
+        # (rows, live seconds, candidate seconds) of recent batches
+        self._window = deque(maxlen=window_batches)
+        self._pairs = CountMap()
+        self._rows = 0
+        self._agreed = 0
+        self._failed = 0
+        self._model_bytes = {}
+        self._versions = {}
+
+    def submit(self, frame, live_model, live_version, live_predictions, live_seconds: float) -> bool:
+        """
+        Schedules frame (the request's features) for candidate scoring with
+        probability sample_rate. Must be called from the event loop.
+        """
+        if self._random.random() >= self.sample_rate:
+            return False
+        if self.pending >= self.max_pending:
+            metrics.SHADOW_BATCHES.inc(status="skipped")
+            return False
+        self.pending += 1
+        task = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._score, frame, live_model, live_version,
+            np.asarray(live_predictions), live_seconds,
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return True
+
+    def _done(self, task) -> None:
+        self._tasks.discard(task)
+        self.pending -= 1
+
+    def _measure(self, name: str, model, version) -> None:
+        # Model sizes are only measured when a version is first seen
+        if self._versions.get(name) != version:
+            nbytes = model_nbytes(model)
+            with self._lock:
+                self._versions[name] = version
+                self._model_bytes[name] = nbytes
+
+    def _score(self, frame, live_model, live_version, live_predictions, live_seconds) -> None:
+        try:
+            candidate = self.candidate_loader.get()
+            started = time.perf_counter()
+            candidate_predictions = np.asarray(candidate.predict(frame))
+            candidate_seconds = time.perf_counter() - started
+
+            self._measure("live", live_model, live_version)
+            self._measure("candidate", candidate, self.candidate_loader.version)
+        except Exception as e:
+            with self._lock:
+                self._failed += 1
+            metrics.SHADOW_BATCHES.inc(status="failed")
+            logging.error(f"Shadow scoring failed: {e}")
+            return
+
+        rows = len(live_predictions)
+        agreed = int(np.count_nonzero(live_predictions == candidate_predictions))
+        pairs, counts = np.unique(np.stack([live_predictions, candidate_predictions]), axis=1, return_counts=True)
+        with self._lock:
+            self._window.append((rows, live_seconds, candidate_seconds))
+            self._rows += rows
+            self._agreed += agreed
+            for (live, shadow), count in zip(pairs.T.tolist(), counts.tolist()):
+                self._pairs[(live, shadow)] += count
+
+        metrics.SHADOW_BATCHES.inc(status="scored")
+        metrics.SHADOW_ROWS.inc(agreed, outcome="agree")
+        metrics.SHADOW_ROWS.inc(rows - agreed, outcome="disagree")
+        metrics.SHADOW_SCORE_SECONDS.observe(live_seconds, model="live")
+        metrics.SHADOW_SCORE_SECONDS.observe(candidate_seconds, model="candidate")
+
+    def model_bytes(self) -> dict:
+        with self._lock:
+            return dict(self._model_bytes)
+
+    def summary(self) -> dict:
+        """
+        Agreement, latency and model size of live and candidate so far;
+        latencies are over the last window_batches batches.
+        """
+        with self._lock:
+            window = np.array(self._window, dtype=float).reshape(-1, 3)
+            summary = {
+                "sample_rate": self.sample_rate,
+                "batches": len(window),
+                "rows": self._rows,
+                "failed_batches": self._failed,
+                "pending_batches": self.pending,
+                "agreement_rate": self._agreed / self._rows if self._rows else None,
+                # "live->candidate" prediction pairs, e.g. "1.0->0.0"
+                "prediction_pairs": {f"{live}->{shadow}": count for (live, shadow), count in self._pairs.items()},
+                "models": {},
+            }
+            for column, name in ((1, "live"), (2, "candidate")):
+                seconds = window[:, column]
+                summary["models"][name] = {
+                    "version": self._versions.get(name),
+                    "model_bytes": self._model_bytes.get(name),
+                    "batch_seconds": {
+                        f"p{q}": float(np.percentile(seconds, q)) if len(seconds) else None
+                        for q in (50, 95, 99)
+                    },
+                    "rows_per_second": float(window[:, 0].sum() / seconds.sum()) if seconds.sum() else None,
+                }
+        return summary
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Waits for scheduled batches, at most timeout seconds, and stops the thread.
+        """
+        if self._tasks:
+            _, not_done = await asyncio.wait(set(self._tasks), timeout=timeout)
+            if not_done:
+                logging.warning(f"Shadow scorer closed with {len(not_done)} batches unscored")
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,489 @@
+"""
+Long-running worker that scores a stream of JSON lines with the served model.
+
+    producer | python -m networksecurity.serving.stream_worker --stdin
+    python -m networksecurity.serving.stream_worker --unix-socket /tmp/score.sock --output scored.jsonl
+    python -m networksecurity.serving.stream_worker --tail features.jsonl --metrics-port 9100
+
+Each input line is an object of feature values; extra keys (e.g. an id) are
+passed through and the prediction is added. Rows flow through a bounded queue
+into adaptively sized batches that are scored in an executor and written to
+the sink in input order. When scoring falls behind, the queue fills, readers
+stop reading and the producer blocks on its pipe or socket, so memory stays
+bounded at any input rate.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import stat
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.serving import metrics
+from networksecurity.utils.ml_utils.model.estimator import CachedModelLoader
+from networksecurity.constant.training_pipeline import TARGET_COLUMN, BATCH_PREDICTION_PREDICTION_COLUMN
+
+# Longest accepted input line; longer ones are dropped as invalid
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class _Source(ABC):
+    lag_bytes = 0
+
+    @abstractmethod
+    async def run(self, put) -> None:
+        """
+        Reads lines until the input ends, awaiting put(line) for each.
+        """
+
+    async def _read_lines(self, reader: asyncio.StreamReader, put) -> None:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Longer than MAX_LINE_BYTES; the reader skipped it
+                metrics.STREAM_ROWS.inc(status="invalid")
+                continue
+            if not line:
+                return
+            if line.strip():
+                await put(line)
+
+
+class StdinSource(_Source):
+    async def run(self, put) -> None:
+        if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+            # Redirected from a file, which connect_read_pipe does not accept
+            return await FileSource(f"/dev/fd/{sys.stdin.fileno()}", follow=False).run(put)
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        await self._read_lines(reader, put)
+
+
+class UnixSocketSource(_Source):
+    """
+    Accepts any number of producer connections; runs until stopped.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    async def run(self, put) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        async def handle(reader, writer):
+            try:
+                await self._read_lines(reader, put)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(handle, path=self.path, limit=MAX_LINE_BYTES)
+        logging.info(f"Stream worker listening on {self.path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class FileSource(_Source):
+    """
+    Reads a file line by line. With follow, keeps polling for appended lines
+    like tail -F and reopens the file when it is rotated or truncated.
+    """
+    def __init__(self, path: str, follow: bool = True, from_start: bool = False, poll_interval: float = 0.2):
+        self.path = path
+        self.follow = follow
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+
+    async def run(self, put) -> None:
+        file_obj = None
+        try:
+            file_obj = await self._open(seek_end=self.follow and not self.from_start)
+            partial = b""
+            oversized = False
+            lines_since_yield = 0
+            while True:
+                line = file_obj.readline(MAX_LINE_BYTES)
+                if line.endswith(b"\n") or (line and not self.follow):
+                    line, partial = partial + line, b""
+                    if oversized or len(line) > MAX_LINE_BYTES:
+                        oversized = False
+                        metrics.STREAM_ROWS.inc(status="invalid")
+                    elif line.strip():
+                        await put(line)
+                    lines_since_yield += 1
+                    if lines_since_yield >= 1000:
+                        # Reading a cached file never blocks, so let the loop run
+                        lines_since_yield = 0
+                        await asyncio.sleep(0)
+                    continue
+                if line:
+                    # Incomplete line, wait for the rest of it
+                    partial += line
+                    if len(partial) > MAX_LINE_BYTES:
+                        # Drop it up to its newline instead of buffering it
+                        partial, oversized = b"", True
+                    continue
+                if not self.follow:
+                    return
+                position = file_obj.tell()
+                try:
+                    current = os.stat(self.path)
+                except FileNotFoundError:
+                    current = None
+                if current is not None and (current.st_ino != os.fstat(file_obj.fileno()).st_ino
+                                            or current.st_size < position):
+                    logging.info(f"{self.path} was rotated or truncated, reopening")
+                    file_obj.close()
+                    file_obj = await self._open(seek_end=False)
+                    partial, oversized = b"", False
+                    continue
+                self.lag_bytes = max(0, current.st_size - position) if current is not None else 0
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if file_obj is not None:
+                file_obj.close()
+
+    async def _open(self, seek_end: bool):
+        while True:
+            try:
+                file_obj = open(self.path, "rb")
+                break
+            except FileNotFoundError:
+                if not self.follow:
+                    raise
+                await asyncio.sleep(self.poll_interval)
+        if seek_end:
+            file_obj.seek(0, os.SEEK_END)
+        return file_obj
+
+
+class FileSink:
+    """
+    Appends scored JSON lines to a file, or to stdout for path "-".
+    """
+    def __init__(self, path: str = "-"):
+        self.path = path
+        self._file_obj = sys.stdout.buffer if path == "-" else open(path, "ab")
+
+    def write(self, data: bytes) -> None:
+        self._file_obj.write(data)
+        self._file_obj.flush()
+
+    def close(self) -> None:
+        if self._file_obj is not sys.stdout.buffer:
+            self._file_obj.close()
+
+
+class StreamScoringWorker:
+    """
+    source -> bounded row queue -> batcher -> executor -> sink, in order.
+
+    The batcher takes what is queued, up to batch_target rows, waiting at
+    most max_wait seconds for a batch to fill. batch_target follows the
+    measured time per row so a batch takes about target_batch_seconds:
+    large batches for throughput when there is a backlog, small ones for
+    latency when the stream is light.
+    """
+    def __init__(self, source: _Source, sink: FileSink, model_loader: CachedModelLoader = None,
+                 queue_size: int = 50_000, min_batch: int = 1, max_batch: int = 8192,
+                 max_wait: float = 0.005, target_batch_seconds: float = 0.05,
+                 max_inflight_batches: int = 4, scoring_threads: int = 1,
+                 prediction_column: str = BATCH_PREDICTION_PREDICTION_COLUMN,
+                 stats_interval: float = 10.0):
+        self.source = source
+        self.sink = sink
+        self.model_loader = model_loader or CachedModelLoader()
+        self.queue_size = queue_size
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.target_batch_seconds = target_batch_seconds
+        self.max_inflight_batches = max_inflight_batches
+        self.prediction_column = prediction_column
+        self.stats_interval = stats_interval
+        self.batch_target = min(max(min_batch, 256), max_batch)
+
+        self._executor = ThreadPoolExecutor(max_workers=scoring_threads, thread_name_prefix="stream-score")
+        # One writer thread keeps sink writes in order and off the event loop
+        self._sink_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-sink")
+        self._seconds_per_row = None
+        self._queue = None
+        self._inflight = None
+        self._source_task = None
+        self._rows_in = 0
+        self._rows_out = 0
+        self._max_lag = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def inflight_batches(self) -> int:
+        return self._inflight.qsize() if self._inflight is not None else 0
+
+    async def _put(self, line: bytes) -> None:
+        item = (line, time.monotonic())
+        self._rows_in += 1
+        metrics.STREAM_ROWS.inc(status="received")
+        if self._queue.full():
+            blocked_since = time.perf_counter()
+            await self._queue.put(item)
+            metrics.STREAM_BACKPRESSURE_SECONDS.inc(time.perf_counter() - blocked_since)
+        else:
+            self._queue.put_nowait(item)
+
+    def _score(self, lines: list) -> tuple:
+        """
+        Runs in the executor: parse, predict and encode one batch.
+        """
+        started = time.perf_counter()
+        records = []
+        invalid = 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                records.append(record)
+            else:
+                invalid += 1
+        if not records:
+            return b"", 0, invalid, time.perf_counter() - started
+
+        network_model = self.model_loader.get()
+        try:
+            predictions = self._predict(network_model, records)
+        except Exception as e:
+            # Score rows one at a time so only the bad ones are rejected
+            logging.warning(f"Stream batch of {len(records)} rows failed ({e}), scoring rows one at a time")
+            scored_records, predictions = [], []
+            for record in records:
+                try:
+                    predictions.extend(self._predict(network_model, [record]))
+                    scored_records.append(record)
+                except Exception:
+                    invalid += 1
+            records = scored_records
+        for record, prediction in zip(records, predictions):
+            record[self.prediction_column] = prediction
+        payload = "".join(json.dumps(record) + "\n" for record in records).encode()
+        return payload, len(records), invalid, time.perf_counter() - started
+
+    @staticmethod
+    def _predict(network_model, records: list) -> list:
+        df = pd.DataFrame.from_records(records)
+        feature_names = network_model.required_columns()
+        if feature_names is None:
+            feature_names = getattr(network_model.preprocessor, "feature_names_in_", None)
+        if feature_names is not None:
+            # Missing features become NaN for the imputer; extra keys are ignored
+            features = df.reindex(columns=feature_names)
+        else:
+            features = df.drop(columns=[TARGET_COLUMN], errors="ignore")
+        features = features.replace({"na": np.nan})
+        return network_model.predict(features).tolist()
+
+    def _adapt(self, rows: int, seconds: float) -> None:
+        if rows <= 0:
+            return
+        per_row = seconds / rows
+        self._seconds_per_row = per_row if self._seconds_per_row is None else (
+            0.8 * self._seconds_per_row + 0.2 * per_row
+        )
+        target = int(self.target_batch_seconds / max(self._seconds_per_row, 1e-9))
+        self.batch_target = max(self.min_batch, min(self.max_batch, target))
+
+    async def _batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        eof = False
+        while not eof:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.batch_target:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    eof = True
+                    break
+                batch.append(item)
+
+            lines = [line for line, _ in batch]
+            future = loop.run_in_executor(self._executor, self._score, lines)
+            # Blocks once max_inflight_batches are outstanding, which fills the queue
+            await self._inflight.put((future, batch[0][1], len(lines)))
+        await self._inflight.put(None)
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._inflight.get()
+            if item is None:
+                return
+            future, oldest_received, n_lines = item
+            try:
+                payload, scored, invalid, seconds = await future
+            except Exception as e:
+                metrics.STREAM_ROWS.inc(n_lines, status="invalid")
+                logging.error(f"Stream batch of {n_lines} rows failed: {e}")
+                continue
+            if payload:
+                await loop.run_in_executor(self._sink_executor, self.sink.write, payload)
+            lag = time.monotonic() - oldest_received
+            self._adapt(scored + invalid, seconds)
+            self._rows_out += scored
+            self._max_lag = max(self._max_lag, lag)
+            metrics.STREAM_ROWS.inc(scored, status="scored")
+            if invalid:
+                metrics.STREAM_ROWS.inc(invalid, status="invalid")
+            metrics.STREAM_BATCH_ROWS.observe(n_lines)
+            metrics.STREAM_LAG_SECONDS.observe(lag)
+
+    async def _report(self) -> None:
+        last_in, last_out, last_time = 0, 0, time.monotonic()
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            now = time.monotonic()
+            elapsed = now - last_time
+            logging.info(
+                f"Stream worker: {(self._rows_in - last_in) / elapsed:.0f} rows/s in, "
+                f"{(self._rows_out - last_out) / elapsed:.0f} rows/s out, queue {self.queue_depth}, "
+                f"batch target {self.batch_target}, max lag {self._max_lag * 1000:.0f} ms"
+            )
+            last_in, last_out, last_time = self._rows_in, self._rows_out, now
+            self._max_lag = 0.0
+
+    def stop(self) -> None:
+        """
+        Stops reading; rows already queued are still scored and written.
+        """
+        if self._source_task is not None:
+            self._source_task.cancel()
+
+    async def run(self) -> None:
+        try:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._inflight = asyncio.Queue(maxsize=self.max_inflight_batches)
+            # Load before reading so the first batch does not pay for it
+            self.model_loader.get()
+
+            # Loop signal handlers need a Unix event loop in the main thread
+            if sys.platform != "win32" and threading.current_thread() is threading.main_thread():
+                loop = asyncio.get_running_loop()
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    loop.add_signal_handler(sig, self.stop)
+
+            self._source_task = asyncio.create_task(self.source.run(self._put))
+            batcher = asyncio.create_task(self._batcher())
+            writer = asyncio.create_task(self._writer())
+            reporter = asyncio.create_task(self._report())
+            try:
+                await self._source_task
+            except asyncio.CancelledError:
+                if not self._source_task.cancelled():
+                    raise
+            finally:
+                await self._queue.put(None)
+                await batcher
+                await writer
+                reporter.cancel()
+                self._executor.shutdown()
+                self._sink_executor.shutdown()
+                self.sink.close()
+            logging.info(f"Stream worker finished, {self._rows_out} rows scored")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+async def serve_metrics(port: int, host: str = "0.0.0.0"):
+    """
+    Minimal HTTP endpoint answering every request with the metrics.
+    """
+    async def handle(reader, writer):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = metrics.REGISTRY.render().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: " + metrics.CONTENT_TYPE.encode()
+                + b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _main(args) -> None:
+    if args.unix_socket:
+        source = UnixSocketSource(args.unix_socket)
+    elif args.tail:
+        source = FileSource(args.tail, follow=not args.no_follow, from_start=args.from_start)
+    else:
+        source = StdinSource()
+
+    worker = StreamScoringWorker(
+        source,
+        FileSink(args.output),
+        queue_size=args.queue_size,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000,
+        target_batch_seconds=args.target_batch_ms / 1000,
+        scoring_threads=args.scoring_threads,
+        stats_interval=args.stats_interval,
+    )
+    metrics.register_stream_worker(worker)
+    server = await serve_metrics(args.metrics_port) if args.metrics_port else None
+    try:
+        await worker.run()
+    finally:
+        if server is not None:
+            server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a stream of JSON lines with the served model")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--stdin", action="store_true")
+    source.add_argument("--unix-socket", help="path of a Unix socket producers connect to")
+    source.add_argument("--tail", help="file to follow")
+    parser.add_argument("--no-follow", action="store_true", help="with --tail, stop at the end of the file")
+    parser.add_argument("--from-start", action="store_true", help="with --tail, read existing lines first")
+    parser.add_argument("--output", default="-", help="JSON lines sink, - for stdout")
+    parser.add_argument("--queue-size", type=int, default=50_000)
+    parser.add_argument("--max-batch", type=int, default=8192)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--target-batch-ms", type=float, default=50.0)
+    parser.add_argument("--scoring-threads", type=int, default=1)
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    parser.add_argument("--metrics-port", type=int)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,235 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _count_rows(file_path: str):
+    if file_path.endswith(".csv"):
+        with open(file_path, "rb") as file_obj:
+            return max(0, sum(block.count(b"\n") for block in iter(lambda: file_obj.read(1 << 20), b"")) - 1)
+    if file_path.endswith(".npy"):
+        return len(np.load(file_path, mmap_mode="r"))
+    if file_path.endswith(".npyc"):
+        from networksecurity.utils.main_utils.utils import ChunkedReader
+        with ChunkedReader(file_path) as reader:
+            shape = reader.metadata.get("shape")
+            return shape[0] if shape else None
+    return None
+
+
+@dataclass
+class StageProfile:
+    name: str
+    started_at: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    thread_cpu_seconds: float = 0.0
+    tracemalloc_peak_bytes: int = None
+    max_rss_bytes: int = None
+    rows: int = None
+    bytes: int = None
+    status: str = "ok"
+    parent: str = None
+    info: dict = field(default_factory=dict)
+
+    def add_rows(self, rows: int) -> None:
+        self.rows = (self.rows or 0) + int(rows)
+
+    def add_bytes(self, n_bytes: int) -> None:
+        self.bytes = (self.bytes or 0) + int(n_bytes)
+
+    def add_files(self, *file_paths) -> None:
+        """
+        Counts the rows and bytes of the files a stage produced.
+        """
+        for file_path in file_paths:
+            if not file_path or not os.path.exists(file_path):
+                continue
+            self.add_bytes(os.path.getsize(file_path))
+            rows = _count_rows(file_path)
+            if rows is not None:
+                self.add_rows(rows)
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of every thread in the process at a fixed
+    interval and counts them as folded stacks ("outer;inner count" lines),
+    the input format of flamegraph.pl and speedscope.
+    """
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_folded(self, file_path: str) -> None:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, "w") as file_obj:
+            for stack, count in self.stacks.most_common():
+                file_obj.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """
+    Records wall time, CPU time, memory and rows/bytes processed for each
+    stage of a run and writes them as a JSON report.
+
+    cpu_seconds is process-wide and the tracemalloc peak is only reset when no
+    other stage is running, so for stages that overlap (the concurrent model
+    searches) both include the other stages' work. Work done in worker
+    processes is not counted. sample_interval enables the SamplingProfiler.
+    """
+    def __init__(self, trace_memory: bool = True, sample_interval: float = None):
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now().isoformat()
+        self.stages = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._local = threading.local()
+        self._start_time = time.perf_counter()
+        self._owns_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        self.sampler = SamplingProfiler(sample_interval) if sample_interval else None
+        if self.sampler is not None:
+            self.sampler.start()
+
+    def current_stage(self):
+        """
+        Name of the innermost stage running in the calling thread.
+        """
+        stack = getattr(self._local, "stack", None)
+        return stack[-1].name if stack else None
+
+    @contextmanager
+    def stage(self, name: str, parent: str = None, **info):
+        """
+        Profiles the enclosed block. Yields the StageProfile so the block can
+        add the rows and bytes it processed.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        profile = StageProfile(name=name, started_at=datetime.now().isoformat(),
+                               parent=parent or (stack[-1].name if stack else None), info=info)
+        with self._lock:
+            if self.trace_memory and self._active == 0:
+                tracemalloc.reset_peak()
+            self._active += 1
+        stack.append(profile)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        thread_cpu_start = time.thread_time()
+        try:
+            yield profile
+        except BaseException:
+            profile.status = "failed"
+            raise
+        finally:
+            profile.wall_seconds = time.perf_counter() - wall_start
+            profile.cpu_seconds = time.process_time() - cpu_start
+            profile.thread_cpu_seconds = time.thread_time() - thread_cpu_start
+            if self.trace_memory:
+                profile.tracemalloc_peak_bytes = tracemalloc.get_traced_memory()[1]
+            profile.max_rss_bytes = _max_rss_bytes()
+            stack.pop()
+            with self._lock:
+                self._active -= 1
+                self.stages.append(profile)
+            logging.info(
+                f"Stage {name}: {profile.wall_seconds:.2f}s wall, {profile.cpu_seconds:.2f}s cpu, "
+                f"rows={profile.rows} bytes={profile.bytes}"
+            )
+
+    def report(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": time.perf_counter() - self._start_time,
+            "max_rss_bytes": _max_rss_bytes(),
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def write_report(self, file_path: str, folded_file_path: str = None) -> dict:
+        """
+        Stops the profiler and writes the JSON report and, when sampling was
+        enabled, the folded stacks.
+        """
+        try:
+            if self.sampler is not None:
+                self.sampler.stop()
+                if folded_file_path:
+                    self.sampler.write_folded(folded_file_path)
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+
+            report = self.report()
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with open(file_path, "w") as file_obj:
+                json.dump(report, file_obj, indent=2, default=str)
+            logging.info(f"Run report written to {file_path}")
+            return report
+        except Exception as e:
+            raise NetworkSecurityException(e, sys) from e
+
+
+@contextmanager
+def profile_stage(profiler, name: str, parent: str = None, **info):
+    """
+    profiler.stage(name) when a profiler is given, otherwise a no-op yielding
+    a throwaway StageProfile.
+    """
+    if profiler is None:
+        yield StageProfile(name=name, started_at=datetime.now().isoformat(), info=info)
+    else:
+        with profiler.stage(name, parent=parent, **info) as profile:
+            yield profile
@@ -2,10 +2,19 @@ import yaml
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 import os, sys
+import json
+import shutil
+import time
+import io
+import struct
+import zlib
+from datetime import datetime
 import numpy as np
 import pickle
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
-from sklearn.model_selection import GridSearchCV
+from sklearn.tree._tree import Tree as _SklearnTree
+from networksecurity.utils.ml_utils.metric.confusion_metric import confusion_matrix, threshold_sweep
+from networksecurity.utils.ml_utils.model.search import GridSearch
+from networksecurity.utils.main_utils.profiler import profile_stage
 
 
 def read_yaml_file(file_path: str) -> dict:
@@ -36,42 +45,305 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         raise NetworkSecurityException(e, sys) from e
 
 
-def save_numpy_array_data(file_path: str, array: np.array):
+CONTAINER_MAGIC = b"NSCHNK01"
+CONTAINER_INDEX_MAGIC = b"NSCHNKIX"
+CONTAINER_CHUNK_BYTES = 4 * 1024 * 1024
+_CONTAINER_DEFAULT_LEVELS = {"zlib": 1, "zstd": 3}
+
+
+def _container_codec(name: str):
+    """
+    Returns the (compress(data, level), decompress(data)) pair for a codec name.
+    """
+    if name == "zstd":
+        import zstandard
+        return (
+            lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data),
+        )
+    if name == "zlib":
+        return zlib.compress, zlib.decompress
+    raise ValueError(f"Unknown container codec: {name}")
+
+
+def default_container_codec() -> str:
+    """
+    zstd when the zstandard package is installed, zlib otherwise.
+    """
+    try:
+        import zstandard  # noqa: F401
+        return "zstd"
+    except ImportError:
+        return "zlib"
+
+
+def is_chunked_container(file_path: str) -> bool:
+    with open(file_path, "rb") as file_obj:
+        return file_obj.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+
+class ChunkedWriter:
+    """
+    Streaming writer for the chunked container format.
+
+    The file holds a small JSON header, independently compressed chunks and
+    a trailing JSON index with each chunk's offset, sizes and crc32 plus the
+    caller's metadata. Data passed to write() is cut into chunk_bytes chunks;
+    write_chunk() stores its argument as exactly one chunk. The file is only
+    moved into place by close(), so a failed write never leaves a partial file.
+    """
+    def __init__(self, file_path: str, codec: str = None, level: int = None,
+                 chunk_bytes: int = CONTAINER_CHUNK_BYTES, metadata: dict = None):
+        self.file_path = file_path
+        self.codec = codec or default_container_codec()
+        self.level = _CONTAINER_DEFAULT_LEVELS[self.codec] if level is None else level
+        self.chunk_bytes = chunk_bytes
+        self.metadata = dict(metadata or {})
+        self._compress, _ = _container_codec(self.codec)
+        self._chunks = []
+        self._buffer = bytearray()
+        self._raw_bytes = 0
+
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self._tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        header = json.dumps({"codec": self.codec, "level": self.level}).encode()
+        self._file.write(CONTAINER_MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write(self, data) -> int:
+        # pickle protocol 5 hands over large buffers as PickleBuffer objects
+        view = memoryview(data).cast("B")
+        self._buffer += view
+        while len(self._buffer) >= self.chunk_bytes:
+            self.write_chunk(bytes(self._buffer[:self.chunk_bytes]))
+            del self._buffer[:self.chunk_bytes]
+        return view.nbytes
+
+    def write_chunk(self, data) -> None:
+        data = bytes(data)
+        compressed = self._compress(data, self.level)
+        self._chunks.append([self._file.tell(), len(compressed), len(data), zlib.crc32(data)])
+        self._file.write(compressed)
+        self._raw_bytes += len(data)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if self._buffer:
+            self.write_chunk(self._buffer)
+            self._buffer = bytearray()
+        index = json.dumps({"chunks": self._chunks, "raw_bytes": self._raw_bytes,
+                            "metadata": self.metadata}).encode()
+        self._file.write(index + struct.pack("<Q", len(index)) + CONTAINER_INDEX_MAGIC)
+        self._file.close()
+        os.replace(self._tmp_path, self.file_path)
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _ChunkStream(io.RawIOBase):
+    def __init__(self, reader):
+        self._chunks = iter(reader)
+        self._current = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not len(self._current):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._current = memoryview(chunk)
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+
+class ChunkedReader:
+    """
+    Reader for files written by ChunkedWriter. Any chunk can be read on its
+    own with read_chunk; iterating yields the chunks in order and stream()
+    gives a file-like object over the whole payload. Every chunk is checked
+    against its crc32.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            if self._file.read(len(CONTAINER_MAGIC)) != CONTAINER_MAGIC:
+                raise ValueError(f"{file_path} is not a chunked container")
+            (header_len,) = struct.unpack("<I", self._file.read(4))
+            header = json.loads(self._file.read(header_len))
+            self.codec = header["codec"]
+            self.level = header["level"]
+            _, self._decompress = _container_codec(self.codec)
+
+            self._file.seek(-(8 + len(CONTAINER_INDEX_MAGIC)), os.SEEK_END)
+            (index_len,) = struct.unpack("<Q", self._file.read(8))
+            if self._file.read(len(CONTAINER_INDEX_MAGIC)) != CONTAINER_INDEX_MAGIC:
+                raise ValueError(f"{file_path} is truncated, its chunk index is missing")
+            self._file.seek(-(index_len + 8 + len(CONTAINER_INDEX_MAGIC)), os.SEEK_END)
+            index = json.loads(self._file.read(index_len))
+        except Exception:
+            self._file.close()
+            raise
+        self._chunks = index["chunks"]
+        self.raw_bytes = index["raw_bytes"]
+        self.metadata = index["metadata"]
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._chunks)
+
+    def read_chunk(self, index: int) -> bytes:
+        offset, compressed_len, raw_len, crc = self._chunks[index]
+        self._file.seek(offset)
+        data = self._decompress(self._file.read(compressed_len))
+        if len(data) != raw_len or zlib.crc32(data) != crc:
+            raise IOError(f"Checksum mismatch in chunk {index} of {self.file_path}")
+        return data
+
+    def __iter__(self):
+        for index in range(self.n_chunks):
+            yield self.read_chunk(index)
+
+    def stream(self) -> io.BufferedReader:
+        return io.BufferedReader(_ChunkStream(self))
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def save_numpy_array_data(file_path: str, array: np.array, compress: bool = None,
+                          codec: str = None, level: int = None):
     """
     Saves numpy array data to a file.
+
+    compress defaults to True for .npyc paths. Compressed arrays are stored in
+    the chunked container with whole rows per chunk, so they can be read back
+    chunk by chunk with iter_numpy_array_chunks.
     """
     try:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        with open(file_path, "wb") as file_obj:
-            np.save(file_obj, array)
+        if compress is None:
+            compress = file_path.endswith(".npyc")
+        if not compress:
+            with open(file_path, "wb") as file_obj:
+                np.save(file_obj, array)
+            return
+
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            with ChunkedWriter(file_path, codec, level, metadata={"kind": "pickle"}) as writer:
+                pickle.dump(array, writer, protocol=pickle.HIGHEST_PROTOCOL)
+            return
+
+        row_bytes = max(1, array[:1].nbytes if array.ndim else array.nbytes)
+        rows_per_chunk = max(1, CONTAINER_CHUNK_BYTES // row_bytes)
+        metadata = {"kind": "ndarray", "dtype": array.dtype.str, "shape": list(array.shape),
+                    "rows_per_chunk": rows_per_chunk}
+        with ChunkedWriter(file_path, codec, level, metadata=metadata) as writer:
+            if array.ndim == 0:
+                writer.write_chunk(array.tobytes())
+            for start in range(0, len(array) if array.ndim else 0, rows_per_chunk):
+                writer.write_chunk(np.ascontiguousarray(array[start:start + rows_per_chunk]).tobytes())
 
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
 
 
+def _chunk_to_array(data: bytes, metadata: dict) -> np.array:
+    return np.frombuffer(data, dtype=np.dtype(metadata["dtype"])).reshape(-1, *metadata["shape"][1:])
+
+
+def iter_numpy_array_chunks(file_path: str):
+    """
+    Yields consecutive row blocks of an array saved in the chunked container.
+    """
+    try:
+        with ChunkedReader(file_path) as reader:
+            if reader.metadata.get("kind") != "ndarray" or not reader.metadata["shape"]:
+                raise ValueError(f"{file_path} does not hold a chunked numeric array")
+            for data in reader:
+                yield _chunk_to_array(data, reader.metadata)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def load_numpy_array_chunk(file_path: str, index: int) -> np.array:
+    """
+    Reads one row block of an array saved in the chunked container.
+    """
+    try:
+        with ChunkedReader(file_path) as reader:
+            return _chunk_to_array(reader.read_chunk(index), reader.metadata)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
 def load_numpy_array_data(file_path: str) -> np.array:
     """
     Loads numpy array data from a file, allowing pickle for object arrays.
+    Chunked containers are detected from their magic bytes.
     """
     try:
-        with open(file_path, "rb") as file_obj:
-            return np.load(file_obj, allow_pickle=True)
+        if not is_chunked_container(file_path):
+            with open(file_path, "rb") as file_obj:
+                return np.load(file_obj, allow_pickle=True)
+
+        with ChunkedReader(file_path) as reader:
+            metadata = reader.metadata
+            if metadata.get("kind") == "pickle":
+                return pickle.load(reader.stream())
+            array = np.empty(metadata["shape"], dtype=np.dtype(metadata["dtype"]))
+            buffer = array.reshape(-1).view(np.uint8)
+            offset = 0
+            for data in reader:
+                buffer[offset:offset + len(data)] = np.frombuffer(data, dtype=np.uint8)
+                offset += len(data)
+            return array
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
 
 
-def save_object(file_path: str, obj: object) -> None:
+def save_object(file_path: str, obj: object, compress: bool = False,
+                codec: str = None, level: int = None) -> None:
     """
-    Saves a Python object to a file using pickle.
+    Saves a Python object to a file using pickle, optionally streamed
+    through the compressed chunked container.
     """
     try:
         logging.info("Entered the save_object method of MainUtils class")
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-        with open(file_path, "wb") as file_obj:
-            pickle.dump(obj, file_obj)
+        if compress:
+            with ChunkedWriter(file_path, codec, level, metadata={"kind": "pickle"}) as writer:
+                pickle.dump(obj, writer, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            with open(file_path, "wb") as file_obj:
+                pickle.dump(obj, file_obj)
 
         logging.info("Exited the save_object method of MainUtils class")
 
@@ -81,12 +353,16 @@ def save_object(file_path: str, obj: object) -> None:
 
 def load_object(file_path: str) -> object:
     """
-    Loads a pickled Python object from a file.
+    Loads a pickled Python object from a file, plain or chunked.
     """
     try:
         if not os.path.exists(file_path):
             raise Exception(f"The file: {file_path} does not exist")
 
+        if is_chunked_container(file_path):
+            with ChunkedReader(file_path) as reader:
+                return pickle.load(reader.stream())
+
         with open(file_path, "rb") as file_obj:
             return pickle.load(file_obj)
 
@@ -94,51 +370,349 @@ def load_object(file_path: str) -> object:
         raise NetworkSecurityException(e, sys) from e
 
 
-def evaluate_models(X_train, y_train, X_test, y_test, models, param):
+MODEL_ARTIFACT_METADATA_FILE = "metadata.json"
+MODEL_ARTIFACT_OBJECT_FILE = "object.pkl"
+MODEL_ARTIFACT_VERSIONS_SUFFIX = ".versions"
+
+
+class _ArrayExtractingPickler(pickle.Pickler):
     """
-    Evaluate multiple machine learning models using GridSearchCV 
-    and classification metrics (accuracy, F1-score, precision, recall).
+    Pickler that writes large numeric arrays as standalone .npy files and
+    keeps only a reference to them in the pickle stream.
 
-    Returns a report dictionary containing test scores for each model.
+    sklearn tree state (the nodes/values of every fitted tree) stays inline:
+    Tree.__setstate__ copies those arrays into the tree's own memory, so a
+    mapped file would not be shared anyway. In practice the shared arrays are
+    the KNN imputer's training matrix and mask, plus large linear weights.
+    """
+    def __init__(self, file_obj, array_dir: str, min_array_bytes: int):
+        super().__init__(file_obj, protocol=pickle.HIGHEST_PROTOCOL)
+        self.array_dir = array_dir
+        self.min_array_bytes = min_array_bytes
+        self.array_files = {}
+        self._keep_alive = []
+        self._inline_ids = set()
+
+    def reducer_override(self, obj):
+        if isinstance(obj, _SklearnTree):
+            reduced = obj.__reduce__()
+            state = reduced[2] if len(reduced) > 2 else None
+            if isinstance(state, dict):
+                for value in state.values():
+                    if isinstance(value, np.ndarray):
+                        self._inline_ids.add(id(value))
+                        # The state is built per call, keep it alive so ids are not reused
+                        self._keep_alive.append(value)
+            return reduced
+        return NotImplemented
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.hasobject or obj.nbytes < self.min_array_bytes:
+            return None
+        if id(obj) in self._inline_ids:
+            return None
+        if id(obj) not in self.array_files:
+            file_name = f"array_{len(self.array_files):04d}.npy"
+            # np.save pads the header so the data starts on a 64 byte boundary
+            np.save(os.path.join(self.array_dir, file_name), np.ascontiguousarray(obj), allow_pickle=False)
+            self.array_files[id(obj)] = file_name
+            self._keep_alive.append(obj)
+        return ("npy", self.array_files[id(obj)])
+
+
+class _ArrayMappingUnpickler(pickle.Unpickler):
+    def __init__(self, file_obj, array_dir: str, mmap_mode):
+        super().__init__(file_obj)
+        self.array_dir = array_dir
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid):
+        kind, file_name = pid
+        if kind != "npy":
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid}")
+        return np.load(os.path.join(self.array_dir, file_name), mmap_mode=self.mmap_mode, allow_pickle=False)
+
+
+def save_model_artifact(dir_path: str, obj: object, min_array_bytes: int = 64 * 1024,
+                        keep_versions: int = 2) -> dict:
+    """
+    Saves obj as a directory holding a small pickle, its large numeric arrays
+    as uncompressed .npy files and a metadata.json.
+
+    Each save writes a new version directory under <dir_path>.versions and
+    then atomically repoints the dir_path symlink at it, so dir_path always
+    exists and readers see either the old or the new artifact, never a
+    partial one. The keep_versions newest versions are kept for readers that
+    still hold the previous one open.
+
+    Returns the metadata.
     """
     try:
-        report = {}
+        logging.info(f"Saving model artifact to {dir_path}")
+        dir_path = os.path.normpath(dir_path)
+        versions_dir = f"{dir_path}{MODEL_ARTIFACT_VERSIONS_SUFFIX}"
+        version = f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{os.getpid()}"
+        version_path = os.path.join(versions_dir, version)
+        os.makedirs(version_path)
+
+        try:
+            with open(os.path.join(version_path, MODEL_ARTIFACT_OBJECT_FILE), "wb") as file_obj:
+                pickler = _ArrayExtractingPickler(file_obj, version_path, min_array_bytes)
+                pickler.dump(obj)
+
+            metadata = {
+                "format_version": 1,
+                "object_class": f"{type(obj).__module__}.{type(obj).__qualname__}",
+                "created_at": datetime.now().isoformat(),
+                "array_files": sorted(pickler.array_files.values()),
+                "array_bytes": sum(
+                    os.path.getsize(os.path.join(version_path, name)) for name in pickler.array_files.values()
+                ),
+            }
+            with open(os.path.join(version_path, MODEL_ARTIFACT_METADATA_FILE), "w") as file_obj:
+                json.dump(metadata, file_obj, indent=2)
+        except BaseException:
+            # Never linked, so no reader can have seen it
+            shutil.rmtree(version_path, ignore_errors=True)
+            raise
+
+        # A plain directory from before versioning cannot be replaced atomically
+        if os.path.isdir(dir_path) and not os.path.islink(dir_path):
+            shutil.rmtree(dir_path)
+        link_path = f"{dir_path}.link-{os.getpid()}"
+        if os.path.lexists(link_path):
+            os.remove(link_path)
+        os.symlink(os.path.relpath(version_path, os.path.dirname(dir_path) or "."), link_path)
+        os.replace(link_path, dir_path)
+
+        for old_version in sorted(os.listdir(versions_dir))[:-keep_versions]:
+            if old_version == version:
+                # A concurrent save can have written a newer version than ours
+                continue
+            shutil.rmtree(os.path.join(versions_dir, old_version), ignore_errors=True)
+
+        logging.info(
+            f"Model artifact saved with {len(metadata['array_files'])} arrays "
+            f"({metadata['array_bytes']} bytes) at {dir_path}"
+        )
+        return metadata
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
 
-        for model_name, model in models.items():
-            logging.info(f"Training model: {model_name}")
-            gs = GridSearchCV(model, param[model_name], cv=3)
-            gs.fit(X_train, y_train)
 
-            model.set_params(**gs.best_params_)
-            model.fit(X_train, y_train)
+def load_model_artifact(dir_path: str, mmap_mode: str = "r") -> object:
+    """
+    Loads an object saved by save_model_artifact. With mmap_mode="r" the
+    arrays are mapped read-only, so every process loading the same artifact
+    shares one page-cache copy; pass None to read them into private memory.
+    """
+    try:
+        # Resolve the symlink once, so a concurrent save cannot mix two versions
+        dir_path = os.path.realpath(dir_path)
+        object_path = os.path.join(dir_path, MODEL_ARTIFACT_OBJECT_FILE)
+        if not os.path.exists(object_path):
+            raise Exception(f"The model artifact: {dir_path} does not exist")
 
-            y_train_pred = model.predict(X_train)
-            y_test_pred = model.predict(X_test)
+        with open(object_path, "rb") as file_obj:
+            return _ArrayMappingUnpickler(file_obj, dir_path, mmap_mode).load()
+
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
 
-            # Compute metrics
-            train_accuracy = accuracy_score(y_train, y_train_pred)
-            test_accuracy = accuracy_score(y_test, y_test_pred)
 
-            train_f1 = f1_score(y_train, y_train_pred, average='weighted')
-            test_f1 = f1_score(y_test, y_test_pred, average='weighted')
+def read_model_artifact_metadata(dir_path: str) -> dict:
+    """
+    Reads the metadata.json of a model artifact directory.
+    """
+    try:
+        with open(os.path.join(dir_path, MODEL_ARTIFACT_METADATA_FILE)) as file_obj:
+            return json.load(file_obj)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
 
-            train_precision = precision_score(y_train, y_train_pred, average='weighted')
-            test_precision = precision_score(y_test, y_test_pred, average='weighted')
 
-            train_recall = recall_score(y_train, y_train_pred, average='weighted')
-            test_recall = recall_score(y_test, y_test_pred, average='weighted')
+FINAL_MODEL_RUN_FILE = "run.json"
+ARTIFACT_RUN_TIMESTAMP_FORMAT = "%m_%d_%Y_%H_%M_%S"
 
-            # Store all metrics
-            report[model_name] = {
-                "train_accuracy": train_accuracy,
-                "test_accuracy": test_accuracy,
-                "train_f1": train_f1,
-                "test_f1": test_f1,
-                "train_precision": train_precision,
-                "test_precision": test_precision,
-                "train_recall": train_recall,
-                "test_recall": test_recall
-            }
+
+def write_final_model_reference(model_dir: str, artifact_dir: str) -> None:
+    """
+    Records which run directory the files in model_dir were produced by, so
+    retention never prunes the run behind the served model.
+    """
+    try:
+        os.makedirs(model_dir, exist_ok=True)
+        with open(os.path.join(model_dir, FINAL_MODEL_RUN_FILE), "w") as file_obj:
+            json.dump({"artifact_dir": os.path.normpath(artifact_dir),
+                       "updated_at": datetime.now().isoformat()}, file_obj, indent=2)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def prune_artifact_runs(artifact_root: str, keep_last: int, model_dir: str = None, keep=()) -> list:
+    """
+    Deletes timestamped run directories under artifact_root except the
+    keep_last newest ones, those listed in keep and the run referenced by
+    model_dir. Directories whose name is not a run timestamp are left alone.
+
+    Returns the removed directories.
+    """
+    try:
+        if not os.path.isdir(artifact_root):
+            return []
+
+        protected = {os.path.normpath(path) for path in keep}
+        reference_path = os.path.join(model_dir, FINAL_MODEL_RUN_FILE) if model_dir else None
+        if reference_path and os.path.exists(reference_path):
+            with open(reference_path) as file_obj:
+                protected.add(os.path.normpath(json.load(file_obj)["artifact_dir"]))
+
+        runs = []
+        for name in os.listdir(artifact_root):
+            path = os.path.normpath(os.path.join(artifact_root, name))
+            try:
+                runs.append((datetime.strptime(name, ARTIFACT_RUN_TIMESTAMP_FORMAT), path))
+            except ValueError:
+                continue
+        runs.sort(reverse=True)
+
+        removed = []
+        for _, path in runs[keep_last:]:
+            if path in protected or not os.path.isdir(path):
+                continue
+            shutil.rmtree(path)
+            removed.append(path)
+        logging.info(f"Pruned {len(removed)} artifact runs under {artifact_root}, kept {len(runs) - len(removed)}")
+        return removed
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def collapse_duplicate_rows(X, y):
+    """
+    Collapses identical (features, label) rows into unique rows.
+
+    Returns the unique features, their labels and the count of each row, to be
+    used as sample_weight.
+    """
+    try:
+        rows = np.column_stack([X, y])
+        unique_rows, counts = np.unique(rows, axis=0, return_counts=True)
+        logging.info(
+            f"Collapsed {len(rows)} rows into {len(unique_rows)} unique rows "
+            f"(compression ratio {len(rows) / len(unique_rows):.2f}x)"
+        )
+        return unique_rows[:, :-1], unique_rows[:, -1], counts.astype(float)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def _search_model(model_name, model, param_grid, X_train, y_train, X_test, y_test, search_strategy,
+                  sample_weight=None, profiler=None, parent_stage=None):
+    """
+    Runs the hyperparameter search for a single model and scores the refit best
+    estimator on the train and test splits, predicting each split once. For
+    probabilistic binary models the test F1 at the best threshold is added.
+    """
+    logging.info(f"Training model: {model_name}")
+    with profile_stage(profiler, f"evaluate_models.{model_name}", parent=parent_stage,
+                       search_strategy=type(search_strategy).__name__) as stage:
+        start_time = time.perf_counter()
+
+        result = search_strategy.search(model, param_grid, X_train, y_train, sample_weight=sample_weight)
+        search_time = time.perf_counter() - start_time
+
+        # The search already refit the best candidate on the full train split
+        best_model = result.best_estimator
+
+        y_train_pred = best_model.predict(X_train)
+        y_test_pred = best_model.predict(X_test)
+
+        stage.add_rows(len(X_train) + len(X_test))
+        stage.add_bytes(np.asarray(X_train).nbytes + np.asarray(X_test).nbytes)
+        stage.info["n_fits"] = result.n_fits
+
+    # One confusion matrix per split; every metric below is derived from it
+    train_confusion = confusion_matrix(y_train, y_train_pred, sample_weight=sample_weight)
+    test_confusion = confusion_matrix(y_test, y_test_pred)
+    train_precision, train_recall, train_f1 = train_confusion.precision_recall_f1(average="weighted")
+    test_precision, test_recall, test_f1 = test_confusion.precision_recall_f1(average="weighted")
+
+    # Best decision threshold on the positive class score, from one sorted pass
+    best_threshold, best_threshold_f1 = None, None
+    classes = list(getattr(best_model, "classes_", []))
+    if hasattr(best_model, "predict_proba") and len(classes) == 2 and 1 in classes:
+        test_scores = best_model.predict_proba(X_test)[:, classes.index(1)]
+        best_threshold, best_threshold_f1 = threshold_sweep(y_test, test_scores).best_threshold("f1")
+
+    logging.info(
+        f"{model_name}: search finished in {search_time:.2f}s with {result.best_params}, "
+        f"reusing the best estimator saved {result.refit_time:.2f}s of refit"
+    )
+
+    metrics = {
+        "train_accuracy": train_confusion.accuracy(),
+        "test_accuracy": test_confusion.accuracy(),
+        "train_f1": train_f1,
+        "test_f1": test_f1,
+        "train_precision": train_precision,
+        "test_precision": test_precision,
+        "train_recall": train_recall,
+        "test_recall": test_recall,
+        "test_best_threshold": best_threshold,
+        "test_best_threshold_f1": best_threshold_f1,
+        "search_time": search_time,
+        "refit_time_saved": result.refit_time,
+        "n_fits": result.n_fits,
+        "fit_cost": result.n_fits if result.fit_cost is None else result.fit_cost,
+        "fits_skipped": result.fits_skipped,
+        "score_given_up": result.score_given_up,
+    }
+    return model_name, best_model, metrics
+
+
+def evaluate_models(X_train, y_train, X_test, y_test, models, param, n_jobs=-1, search_strategy=None,
+                    sample_weight=None, profiler=None):
+    """
+    Evaluate multiple machine learning models using a hyperparameter search
+    (exhaustive GridSearch unless another search_strategy is given)
+    and classification metrics (accuracy, F1-score, precision, recall).
+
+    The models are searched one after another and each search spreads its
+    (candidate, fold) fits over n_jobs worker processes, so GIL-bound fit
+    loops such as boosting still use every core without nesting thread
+    pools inside each other. The fitted best estimator replaces the
+    entry in models so callers can use models[name] directly.
+    sample_weight holds row counts when X_train was duplicate-collapsed.
+    With a RunProfiler each model's search is recorded as its own stage.
+
+    Returns a report dictionary containing test scores for each model.
+    """
+    try:
+        report = {}
+        if search_strategy is None:
+            search_strategy = GridSearch(cv=3, n_jobs=n_jobs)
+
+        parent_stage = profiler.current_stage() if profiler is not None else None
+        results = [
+            _search_model(
+                model_name, model, param[model_name],
+                X_train, y_train, X_test, y_test, search_strategy, sample_weight,
+                profiler, parent_stage
+            )
+            for model_name, model in models.items()
+        ]
+
+        for model_name, best_model, metrics in results:
+            models[model_name] = best_model
+            report[model_name] = metrics
+
+        total_saved = sum(metrics["refit_time_saved"] for metrics in report.values())
+        total_skipped = sum(metrics["fits_skipped"] for metrics in report.values())
+        logging.info(
+            f"Model search complete, {total_saved:.2f}s of redundant refits avoided, "
+            f"{total_skipped:.1f} full-resource candidate fits skipped by {type(search_strategy).__name__}"
+        )
 
         return report
 
@@ -0,0 +1,177 @@
+import atexit
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlparse
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import save_object, load_object
+
+
+class BufferedExperimentTracker:
+    """
+    Experiment tracking that never waits on the network.
+
+    log_run writes the run (params, metrics, model, input example) to a local buffer
+    directory and returns at once. A background thread syncs buffered runs to
+    the MLflow tracking server with retries and removes them once synced.
+    Runs that could not be synced stay in the buffer and are retried the next
+    time a tracker starts on the same directory.
+
+    tracking_uri defaults to MLFLOW_TRACKING_URI; when neither is set and a
+    DagsHub repo is given, dagshub.init configures the remote from the
+    background thread. A file:// tracking_uri gives a fully local setup.
+    """
+    def __init__(self, buffer_dir: str, tracking_uri: str = None, registry_uri: str = None,
+                 dagshub_repo_owner: str = None, dagshub_repo_name: str = None,
+                 max_retries: int = 5, retry_backoff_seconds: float = 2.0):
+        try:
+            self.buffer_dir = buffer_dir
+            self.pending_dir = os.path.join(buffer_dir, "pending")
+            self.tracking_uri = tracking_uri or os.getenv("MLFLOW_TRACKING_URI")
+            self.registry_uri = registry_uri
+            self.dagshub_repo_owner = dagshub_repo_owner
+            self.dagshub_repo_name = dagshub_repo_name
+            self.max_retries = max_retries
+            self.retry_backoff_seconds = retry_backoff_seconds
+
+            self._queue = queue.Queue()
+            self._remote_ready = False
+            os.makedirs(self.pending_dir, exist_ok=True)
+
+            # Re-queue runs left over from earlier processes
+            for run_id in sorted(os.listdir(self.pending_dir)):
+                if not run_id.endswith(".tmp"):
+                    self._queue.put(os.path.join(self.pending_dir, run_id))
+
+            self._thread = threading.Thread(target=self._worker, name="mlflow-uploader", daemon=True)
+            self._thread.start()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def log_run(self, metrics: dict, model, input_example=None, registered_model_name: str = None,
+                params: dict = None) -> str:
+        """
+        Buffers one run locally and queues it for upload. Returns the local run id.
+        """
+        try:
+            run_id = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}_{uuid.uuid4().hex[:8]}"
+            tmp_dir = os.path.join(self.pending_dir, f"{run_id}.tmp")
+            os.makedirs(tmp_dir, exist_ok=True)
+
+            with open(os.path.join(tmp_dir, "run.json"), "w") as file_obj:
+                json.dump(
+                    {"params": {k: str(v) for k, v in (params or {}).items()},
+                     "metrics": {k: float(v) for k, v in metrics.items()},
+                     "registered_model_name": registered_model_name},
+                    file_obj,
+                )
+            save_object(os.path.join(tmp_dir, "model.pkl"), model)
+            if input_example is not None:
+                np.save(os.path.join(tmp_dir, "input_example.npy"), np.asarray(input_example))
+
+            run_dir = os.path.join(self.pending_dir, run_id)
+            os.rename(tmp_dir, run_dir)
+            self._queue.put(run_dir)
+            logging.info(f"Buffered experiment run {run_id} for upload")
+            return run_id
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued run has been attempted. Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+        return True
+
+    def _init_remote(self):
+        import mlflow
+
+        if self._remote_ready:
+            return mlflow
+        if self.tracking_uri:
+            mlflow.set_tracking_uri(self.tracking_uri)
+        elif self.dagshub_repo_owner and self.dagshub_repo_name:
+            import dagshub
+            dagshub.init(repo_owner=self.dagshub_repo_owner, repo_name=self.dagshub_repo_name, mlflow=True)
+        if self.registry_uri:
+            mlflow.set_registry_uri(self.registry_uri)
+        self._remote_ready = True
+        return mlflow
+
+    def _sync(self, run_dir: str):
+        mlflow = self._init_remote()
+        import mlflow.sklearn
+
+        with open(os.path.join(run_dir, "run.json")) as file_obj:
+            run = json.load(file_obj)
+        model = load_object(os.path.join(run_dir, "model.pkl"))
+        input_example_path = os.path.join(run_dir, "input_example.npy")
+        input_example = np.load(input_example_path) if os.path.exists(input_example_path) else None
+
+        tracking_url_type_store = urlparse(mlflow.get_tracking_uri()).scheme
+        with mlflow.start_run():
+            if run.get("params"):
+                mlflow.log_params(run["params"])
+            mlflow.log_metrics(run["metrics"])
+            # The model registry is not available on a file store
+            registered_model_name = run["registered_model_name"] if tracking_url_type_store != "file" else None
+            mlflow.sklearn.log_model(
+                model,
+                name="model",
+                registered_model_name=registered_model_name,
+                input_example=input_example,
+            )
+
+    def _worker(self):
+        while True:
+            run_dir = self._queue.get()
+            try:
+                for attempt in range(1, self.max_retries + 1):
+                    try:
+                        self._sync(run_dir)
+                        shutil.rmtree(run_dir, ignore_errors=True)
+                        logging.info(f"Synced experiment run {os.path.basename(run_dir)}")
+                        break
+                    except Exception as e:
+                        logging.warning(
+                            f"Experiment upload attempt {attempt}/{self.max_retries} "
+                            f"for {os.path.basename(run_dir)} failed: {e}"
+                        )
+                        if attempt < self.max_retries:
+                            time.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+                else:
+                    logging.error(f"Leaving experiment run {run_dir} buffered for a later sync")
+            finally:
+                self._queue.task_done()
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_experiment_tracker(buffer_dir: str, exit_flush_seconds: float = 10.0, **kwargs) -> BufferedExperimentTracker:
+    """
+    Returns the process-wide tracker for buffer_dir, starting it on first use.
+    At interpreter exit pending uploads get exit_flush_seconds to finish.
+    """
+    with _trackers_lock:
+        if buffer_dir not in _trackers:
+            tracker = BufferedExperimentTracker(buffer_dir, **kwargs)
+            atexit.register(tracker.flush, exit_flush_seconds)
+            _trackers[buffer_dir] = tracker
+        return _trackers[buffer_dir]
@@ -0,0 +1,118 @@
+"""
+Lexical features of raw URLs, encoded like the UCI phishing dataset the
+model is trained on: 1 legitimate, 0 suspicious, -1 phishing.
+
+Only the features that can be computed from the URL string are filled in.
+The ones that need the page content, WHOIS, DNS or traffic rankings are NaN
+and left to the preprocessor's imputer. SSLfinal_State is -1 for plain http
+and NaN for https, whose certificate cannot be checked offline.
+"""
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+# Same order as data_schema/schema.yaml, without the target
+FEATURE_COLUMNS = (
+    "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
+    "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "SSLfinal_State",
+    "Domain_registeration_length", "Favicon", "port", "HTTPS_token", "Request_URL",
+    "URL_of_Anchor", "Links_in_tags", "SFH", "Submitting_to_email", "Abnormal_URL",
+    "Redirect", "on_mouseover", "RightClick", "popUpWidnow", "Iframe", "age_of_domain",
+    "DNSRecord", "web_traffic", "Page_Rank", "Google_Index", "Links_pointing_to_page",
+    "Statistical_report",
+)
+
+URL_LENGTH_LEGITIMATE_MAX = 53
+URL_LENGTH_SUSPICIOUS_MAX = 75
+# 1-based position of the "//" in "https://"; a later one is a redirect
+DOUBLE_SLASH_MAX_POSITION = 7
+STANDARD_PORTS = ("80", "443")
+
+SHORTENING_SERVICES = frozenset((
+    "bit.ly", "goo.gl", "shorte.st", "go2l.ink", "x.co", "ow.ly", "t.co", "tinyurl.com", "tr.im",
+    "is.gd", "cli.gs", "yfrog.com", "migre.me", "ff.im", "tiny.cc", "url4.eu", "twit.ac", "su.pr",
+    "twurl.nl", "snipurl.com", "short.to", "budurl.com", "ping.fm", "post.ly", "just.as", "bkite.com",
+    "snipr.com", "fic.kr", "loopt.us", "doiop.com", "short.ie", "kl.am", "wp.me", "rubyurl.com",
+    "om.ly", "to.ly", "bit.do", "lnkd.in", "db.tt", "qr.ae", "adf.ly", "bitly.com", "cur.lv",
+    "ity.im", "q.gs", "po.st", "bc.vc", "twitthis.com", "u.to", "j.mp", "buzurl.com", "cutt.us",
+    "u.bb", "yourls.org", "prettylinkpro.com", "scrnch.me", "filoops.info", "vzturl.com", "qr.net",
+    "1url.com", "tweez.me", "v.gd", "link.zip.net", "rb.gy", "cutt.ly", "shorturl.at", "rebrand.ly",
+))
+
+# scheme, userinfo (skipped, as browsers do), host and port in one pass
+_URL_PATTERN = re.compile(
+    r"^\s*(?:(?P<scheme>[A-Za-z][A-Za-z0-9+.\-]*):)?//"
+    r"(?:[^@/?#\s]*@)?"
+    r"(?P<host>\[[^\]]*\]|[^:/?#\s]*)"
+    r"(?::(?P<port>\d*))?"
+)
+_IP_HOST_PATTERN = re.compile(
+    r"^(?:\d{1,3}(?:\.\d{1,3}){3}"          # dotted decimal
+    r"|(?:0x[0-9a-f]{1,2}\.){3}0x[0-9a-f]{1,2}"  # dotted hex
+    r"|0x[0-9a-f]{8}|\d{8,10}"              # single number
+    r"|\[[0-9a-f:.]+\])$",                  # IPv6
+    re.IGNORECASE,
+)
+# A two letter country code TLD, removed before counting subdomain dots
+_CCTLD_PATTERN = re.compile(r"\.[a-z]{2}$")
+
+
+def _encode(phishing: pd.Series) -> np.ndarray:
+    return np.where(phishing.to_numpy(dtype=bool), -1.0, 1.0)
+
+
+def extract_url_features(urls) -> pd.DataFrame:
+    """
+    Returns one row of FEATURE_COLUMNS per URL, NaN where the feature cannot
+    be derived from the URL alone. URLs without a scheme are parsed as if
+    they started with "//".
+    """
+    try:
+        urls = pd.Series(urls, dtype=object).fillna("").astype(str)
+        index = urls.index
+        n_urls = len(urls)
+        features = {column: np.full(n_urls, np.nan) for column in FEATURE_COLUMNS}
+        if not n_urls:
+            return pd.DataFrame(features, index=index)
+
+        stripped = urls.str.strip()
+        has_scheme = stripped.str.contains("://", regex=False)
+        parsed = stripped.where(has_scheme, "//" + stripped).str.extract(_URL_PATTERN)
+        scheme = parsed["scheme"].fillna("").str.lower()
+        host = parsed["host"].fillna("").str.lower().str.rstrip(".")
+        port = parsed["port"].fillna("")
+        domain = host.str.replace(r"^www\.", "", regex=True)
+
+        features["having_IP_Address"] = _encode(host.str.match(_IP_HOST_PATTERN))
+
+        length = stripped.str.len().to_numpy()
+        features["URL_Length"] = np.select(
+            [length <= URL_LENGTH_LEGITIMATE_MAX, length <= URL_LENGTH_SUSPICIOUS_MAX], [1.0, 0.0], -1.0
+        )
+
+        features["Shortining_Service"] = _encode(domain.isin(SHORTENING_SERVICES))
+        features["having_At_Symbol"] = _encode(stripped.str.contains("@", regex=False))
+        features["double_slash_redirecting"] = _encode(
+            stripped.str.rfind("//") + 1 > DOUBLE_SLASH_MAX_POSITION
+        )
+        features["Prefix_Suffix"] = _encode(domain.str.contains("-", regex=False))
+
+        dots = domain.str.replace(_CCTLD_PATTERN, "", regex=True).str.count(r"\.").to_numpy()
+        features["having_Sub_Domain"] = np.select([dots <= 1, dots == 2], [1.0, 0.0], -1.0)
+
+        # Only plain http is known; https needs the certificate's issuer and age
+        features["SSLfinal_State"] = np.where((scheme == "http").to_numpy(), -1.0, np.nan)
+
+        features["port"] = _encode((port != "") & ~port.isin(STANDARD_PORTS))
+        features["HTTPS_token"] = _encode(host.str.contains("https", regex=False))
+
+        frame = pd.DataFrame(features, index=index)
+        # Nothing is known about an empty URL
+        frame.loc[(stripped == "").to_numpy()] = np.nan
+        return frame
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
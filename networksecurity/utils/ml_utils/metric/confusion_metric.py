@@ -0,0 +1,186 @@
+"""
+Classification metrics derived from one confusion matrix.
+
+confusion_matrix counts (weighted) true/predicted label pairs with a single
+bincount, and accuracy, precision, recall and F1 are all read off that
+matrix, instead of every sklearn metric call validating and scanning the
+labels again. threshold_sweep does the same for every decision threshold of
+a score: one sort, then cumulative sums give the confusion counts at each
+distinct score.
+"""
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+
+def _safe_divide(numerator, denominator):
+    # zero_division=0, like the sklearn calls this replaces
+    numerator, denominator = np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+@dataclass
+class ConfusionMatrix:
+    labels: np.ndarray
+    # matrix[i, j]: weight of rows with true label labels[i] predicted as labels[j]
+    matrix: np.ndarray
+
+    @property
+    def total(self) -> float:
+        return float(self.matrix.sum())
+
+    def accuracy(self) -> float:
+        return float(_safe_divide(np.trace(self.matrix), self.total))
+
+    def per_class(self):
+        """
+        Precision, recall, F1 and support of every label, as arrays.
+        """
+        true_positive = np.diag(self.matrix)
+        predicted = self.matrix.sum(axis=0)
+        support = self.matrix.sum(axis=1)
+        precision = _safe_divide(true_positive, predicted)
+        recall = _safe_divide(true_positive, support)
+        f1 = _safe_divide(2 * true_positive, predicted + support)
+        return precision, recall, f1, support
+
+    def precision_recall_f1(self, pos_label=1, average: str = "binary"):
+        """
+        Returns (precision, recall, f1): of pos_label for "binary", else the
+        "macro" or support-"weighted" average over labels.
+        """
+        precision, recall, f1, support = self.per_class()
+        if average == "binary":
+            index = np.flatnonzero(self.labels == pos_label)
+            if not len(index):
+                return 0.0, 0.0, 0.0
+            return float(precision[index[0]]), float(recall[index[0]]), float(f1[index[0]])
+        if average == "macro":
+            weights = np.ones_like(support)
+        elif average == "weighted":
+            weights = support
+        else:
+            raise ValueError(f"average must be 'binary', 'macro' or 'weighted', got {average!r}")
+        if not weights.sum():
+            return 0.0, 0.0, 0.0
+        return tuple(float(np.average(metric, weights=weights)) for metric in (precision, recall, f1))
+
+
+def _label_codes(labels: np.ndarray, values: np.ndarray):
+    """
+    Index of every value in labels (any order), and a mask of the values found.
+    """
+    sorter = np.argsort(labels, kind="stable")
+    sorted_labels = labels[sorter]
+    positions = np.clip(np.searchsorted(sorted_labels, values), 0, len(labels) - 1)
+    return sorter[positions], sorted_labels[positions] == values
+
+
+def confusion_matrix(y_true, y_pred, sample_weight=None, labels=None) -> ConfusionMatrix:
+    """
+    Rows and columns follow labels (sorted union of the observed labels by
+    default). Like sklearn, rows whose true or predicted label is not in
+    labels are left out.
+    """
+    try:
+        y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError(f"y_true has {len(y_true)} rows but y_pred has {len(y_pred)}")
+        if labels is None:
+            # Hash based, so this stays linear in the rows
+            labels = np.union1d(pd.unique(y_true), pd.unique(y_pred))
+        labels = np.asarray(labels)
+        n_labels = len(labels)
+        if not n_labels:
+            raise ValueError("labels must not be empty")
+        if len(pd.unique(labels)) != n_labels:
+            raise ValueError(f"labels contains duplicates: {labels.tolist()}")
+
+        true_codes, true_known = _label_codes(labels, y_true)
+        pred_codes, pred_known = _label_codes(labels, y_pred)
+        known = true_known & pred_known
+        codes = true_codes[known] * n_labels + pred_codes[known]
+        weights = None if sample_weight is None else np.asarray(sample_weight, dtype=float).ravel()[known]
+        counts = np.bincount(codes, weights=weights, minlength=n_labels * n_labels)
+        return ConfusionMatrix(labels=labels, matrix=counts[:n_labels * n_labels].reshape(n_labels, n_labels))
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+@dataclass
+class ThresholdSweep:
+    # Decreasing; row i predicts positive when score >= thresholds[i]
+    thresholds: np.ndarray
+    true_positives: np.ndarray
+    false_positives: np.ndarray
+    positives: float
+    negatives: float
+
+    @property
+    def false_negatives(self) -> np.ndarray:
+        return self.positives - self.true_positives
+
+    @property
+    def true_negatives(self) -> np.ndarray:
+        return self.negatives - self.false_positives
+
+    @property
+    def precision(self) -> np.ndarray:
+        return _safe_divide(self.true_positives, self.true_positives + self.false_positives)
+
+    @property
+    def recall(self) -> np.ndarray:
+        return _safe_divide(self.true_positives, self.positives)
+
+    @property
+    def f1(self) -> np.ndarray:
+        return _safe_divide(2 * self.true_positives, self.true_positives + self.false_positives + self.positives)
+
+    @property
+    def false_positive_rate(self) -> np.ndarray:
+        return _safe_divide(self.false_positives, self.negatives)
+
+    def best_threshold(self, metric: str = "f1"):
+        """
+        Returns (threshold, value) maximising precision, recall or f1.
+        """
+        values = getattr(self, metric)
+        index = int(np.argmax(values))
+        return float(self.thresholds[index]), float(values[index])
+
+
+def threshold_sweep(y_true, scores, pos_label=1, sample_weight=None) -> ThresholdSweep:
+    """
+    Confusion counts at every distinct score used as a threshold, from one
+    sort of the scores (e.g. predict_proba[:, 1]).
+    """
+    try:
+        y_true, scores = np.asarray(y_true).ravel(), np.asarray(scores, dtype=float).ravel()
+        if len(y_true) != len(scores):
+            raise ValueError(f"y_true has {len(y_true)} rows but scores has {len(scores)}")
+        weights = np.ones(len(scores)) if sample_weight is None else np.asarray(sample_weight, dtype=float).ravel()
+
+        order = np.argsort(-scores, kind="stable")
+        scores, weights = scores[order], weights[order]
+        positive_weights = np.where(y_true[order] == pos_label, weights, 0.0)
+
+        # Last row of each run of equal scores: everything up to it is predicted positive
+        last = np.flatnonzero(np.diff(scores)) if len(scores) else np.array([], dtype=int)
+        last = np.append(last, len(scores) - 1) if len(scores) else last
+        true_positives = np.cumsum(positive_weights)[last]
+        predicted_positive = np.cumsum(weights)[last]
+        positives = float(positive_weights.sum())
+        return ThresholdSweep(
+            thresholds=scores[last],
+            true_positives=true_positives,
+            false_positives=predicted_positive - true_positives,
+            positives=positives,
+            negatives=float(weights.sum()) - positives,
+        )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
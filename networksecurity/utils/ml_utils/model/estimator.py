@@ -1,23 +1,147 @@
 from networksecurity.constant.training_pipeline import SAVED_MODEL_DIR,MODEL_FILE_NAME
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_DIR,
+    MODEL_ARTIFACT_DIR_NAME,
+    FINAL_MODEL_PREPROCESSOR_FILE_NAME,
+)
 
 import os
 import sys
+import threading
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import load_object,load_model_artifact,read_model_artifact_metadata
+from networksecurity.utils.ml_utils.features.url_features import extract_url_features
 
 class NetworkModel:
-    def __init__(self,preprocessor,model):
+    def __init__(self,preprocessor,model,feature_columns=None):
         try:
             self.preprocessor = preprocessor
             self.model = model
+            # Columns the model needs, None for all; set by feature pruning
+            self.feature_columns = list(feature_columns) if feature_columns is not None else None
         except Exception as e:
             raise NetworkSecurityException(e,sys)
-    
+
+    def required_columns(self):
+        """
+        Input columns transform reads, or None for all of them. Models
+        pickled before feature pruning existed have no feature_columns.
+        """
+        return getattr(self, "feature_columns", None)
+
+    def transform(self,x):
+        try:
+            columns = self.required_columns()
+            if columns is not None and hasattr(x, "columns"):
+                x = x[columns]
+            return self.preprocessor.transform(x)
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def predict_transformed(self,x_transform):
+        """
+        Predicts on rows already passed through transform.
+        """
+        try:
+            return self.model.predict(x_transform)
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
     def predict(self,x):
         try:
-            x_transform = self.preprocessor.transform(x)
-            y_hat = self.model.predict(x_transform)
+            x_transform = self.transform(x)
+            y_hat = self.predict_transformed(x_transform)
             return y_hat
         except Exception as e:
-            raise NetworkSecurityException(e,sys)
\ No newline at end of file
+            raise NetworkSecurityException(e,sys)
+
+    def predict_urls(self,urls):
+        """
+        Predicts on raw URLs from the features extract_url_features derives;
+        the rest are filled in by the preprocessor's imputer.
+        """
+        try:
+            x = extract_url_features(urls)
+            feature_names = self.required_columns()
+            if feature_names is None:
+                feature_names = getattr(self.preprocessor, "feature_names_in_", None)
+            if feature_names is not None:
+                x = x.reindex(columns=feature_names)
+            return self.predict(x)
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+def load_network_model(model_dir: str = FINAL_MODEL_DIR) -> NetworkModel:
+    """
+    Loads the NetworkModel in model_dir, preferring the memory-mapped
+    artifact and falling back to the preprocessor/model pickles. A model.pkl
+    that already holds a NetworkModel is used as is: it carries its own
+    preprocessor and feature_columns, which a pruned model depends on.
+    """
+    try:
+        artifact_dir = os.path.join(model_dir, MODEL_ARTIFACT_DIR_NAME)
+        if os.path.isdir(artifact_dir):
+            logging.info(f"Loading memory-mapped model artifact from {artifact_dir}")
+            return load_model_artifact(artifact_dir)
+
+        model = load_object(os.path.join(model_dir, MODEL_FILE_NAME))
+        if isinstance(model, NetworkModel):
+            return model
+        preprocessor = load_object(os.path.join(model_dir, FINAL_MODEL_PREPROCESSOR_FILE_NAME))
+        return NetworkModel(preprocessor=preprocessor, model=model)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+class CachedModelLoader:
+    """
+    Keeps the served NetworkModel in memory and reloads it only when the files
+    in model_dir change, so requests do not unpickle the model every time.
+    """
+    def __init__(self, model_dir: str = FINAL_MODEL_DIR):
+        self.model_dir = model_dir
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._model = None
+        self._key = None
+        self._lock = threading.Lock()
+
+    def _files_key(self):
+        artifact_dir = os.path.join(self.model_dir, MODEL_ARTIFACT_DIR_NAME)
+        if os.path.isdir(artifact_dir):
+            # The artifact dir is a symlink to the current version
+            paths = [os.path.realpath(artifact_dir), os.path.join(artifact_dir, "metadata.json")]
+        else:
+            paths = [
+                os.path.join(self.model_dir, FINAL_MODEL_PREPROCESSOR_FILE_NAME),
+                os.path.join(self.model_dir, MODEL_FILE_NAME),
+            ]
+        return tuple((path, os.stat(path).st_mtime_ns) for path in paths if os.path.exists(path))
+
+    def get(self) -> NetworkModel:
+        try:
+            key = self._files_key()
+            if key == self._key and self._model is not None:
+                self.hits += 1
+                return self._model
+
+            with self._lock:
+                if key != self._key or self._model is None:
+                    self.misses += 1
+                    self._model = load_network_model(self.model_dir)
+                    self._key = key
+                    artifact_dir = os.path.join(self.model_dir, MODEL_ARTIFACT_DIR_NAME)
+                    if os.path.isdir(artifact_dir):
+                        self.version = read_model_artifact_metadata(artifact_dir)["created_at"]
+                    else:
+                        self.version = str(max((mtime for _, mtime in key), default=0))
+                    logging.info(f"Loaded served model version {self.version}")
+                else:
+                    self.hits += 1
+                return self._model
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -0,0 +1,97 @@
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.inspection import permutation_importance
+
+from networksecurity.entity.artifact_entity import FeaturePruningArtifact
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
+from networksecurity.utils.ml_utils.model.search import fit_weighted
+
+IMPORTANCE_METHODS = ("auto", "native", "permutation")
+
+
+def rank_features(model, X, y, method: str = "auto", n_repeats: int = 5, random_state: int = 42) -> np.ndarray:
+    """
+    Returns feature indices, most important first. "native" uses the model's
+    feature_importances_ or |coef_|, "permutation" the drop in F1 when a
+    column of X is shuffled; "auto" uses native when the model has it.
+    """
+    if method not in IMPORTANCE_METHODS:
+        raise ValueError(f"method must be one of {IMPORTANCE_METHODS}, got {method!r}")
+    importances = None
+    if method in ("auto", "native"):
+        if hasattr(model, "feature_importances_"):
+            importances = np.asarray(model.feature_importances_)
+        elif hasattr(model, "coef_"):
+            importances = np.abs(np.asarray(model.coef_)).reshape(-1, X.shape[1]).sum(axis=0)
+        elif method == "native":
+            raise ValueError(f"{type(model).__name__} has no native feature importances")
+    if importances is None:
+        importances = permutation_importance(
+            model, X, y, scoring="f1", n_repeats=n_repeats, random_state=random_state, n_jobs=-1
+        ).importances_mean
+    # Stable, so ties keep the schema order
+    return np.argsort(-importances, kind="stable")
+
+
+def prune_features(model, X_fit, y_fit, X_test, y_test, sample_weight=None, f1_tolerance: float = 0.005,
+                   method: str = "auto", min_features: int = 1):
+    """
+    Finds the smallest number of top-ranked features whose refit model keeps
+    test F1 within f1_tolerance of the fitted model on all features. Subset
+    sizes are binary searched, so it takes about log2(n_features) refits.
+
+    Returns the model fitted on the chosen columns (model itself when no
+    column can be dropped) and a FeaturePruningArtifact.
+    """
+    try:
+        n_features = X_fit.shape[1]
+        baseline_f1 = get_classification_score(y_test, model.predict(X_test)).f1_score
+        ranking = rank_features(model, X_test, y_test, method=method)
+
+        fitted = {n_features: (model, baseline_f1)}
+        low, high = max(1, min(min_features, n_features)), n_features
+        while low < high:
+            k = (low + high) // 2
+            columns = np.sort(ranking[:k])
+            subset_model = fit_weighted(clone(model), X_fit[:, columns], y_fit, sample_weight)
+            f1 = get_classification_score(y_test, subset_model.predict(X_test[:, columns])).f1_score
+            fitted[k] = (subset_model, f1)
+            logging.info(f"Feature pruning: {k}/{n_features} features, test_f1={f1:.4f} (baseline {baseline_f1:.4f})")
+            if f1 >= baseline_f1 - f1_tolerance:
+                high = k
+            else:
+                low = k + 1
+
+        selected_model, selected_f1 = fitted[high]
+        feature_indices = np.sort(ranking[:high]).tolist()
+        logging.info(f"Feature pruning kept {high} of {n_features} features (test_f1 {baseline_f1:.4f} -> {selected_f1:.4f})")
+        return selected_model, FeaturePruningArtifact(
+            n_features_before=n_features,
+            feature_indices=feature_indices,
+            baseline_f1=baseline_f1,
+            selected_f1=selected_f1,
+            refits=len(fitted) - 1,
+        )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def fit_subset_preprocessor(preprocessor, X_raw: pd.DataFrame, feature_indices):
+    """
+    Fits a clone of the preprocessor on only the given columns of the raw
+    training features, so serving parses and imputes just those. Returns it
+    with the selected column names.
+
+    The imputer then sees different neighbours than the full one, so the
+    model must be refit on this preprocessor's output, not reused.
+    """
+    try:
+        feature_names = [str(name) for name in np.asarray(preprocessor.feature_names_in_)[feature_indices]]
+        return clone(preprocessor).fit(X_raw[feature_names]), feature_names
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
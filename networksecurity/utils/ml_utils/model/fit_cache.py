@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+
+class FitCache:
+    """
+    On-disk memo of candidate fits. Each entry is a pickle stored under the
+    hash of (training data fingerprint, estimator class, full params, cv
+    split, kind). Reading an entry refreshes its mtime and the least recently
+    used entries are evicted once the cache grows past max_bytes.
+
+    The searches store each candidate's per-fold CV scores, which is all a
+    rerun needs to skip its CV fits, plus the fitted estimator of the refit
+    winner. Per-fold estimators are not kept: nothing reads them back and
+    large ensembles would fill the cache.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        try:
+            self.cache_dir = cache_dir
+            self.max_bytes = max_bytes
+            self.hits = 0
+            self.misses = 0
+            self._lock = threading.Lock()
+            self._index = None
+            os.makedirs(cache_dir, exist_ok=True)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def fingerprint(X, y, sample_weight=None) -> str:
+        """
+        Returns a hash identifying the exact training arrays.
+        """
+        digest = hashlib.sha256()
+        for array in (X, y, sample_weight):
+            if array is None:
+                digest.update(b"none")
+                continue
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(fingerprint: str, estimator, params: dict, cv: int, cv_seed, kind: str = "cv") -> str:
+        full_params = {**estimator.get_params(deep=False), **params}
+        payload = json.dumps(
+            {
+                "data": fingerprint,
+                "estimator": f"{type(estimator).__module__}.{type(estimator).__qualname__}",
+                "params": full_params,
+                "cv": cv,
+                "cv_seed": cv_seed,
+                "kind": kind,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            self._index = {}
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".pkl"):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        self._index[path] = [stat.st_size, stat.st_mtime]
+        return self._index
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file_obj:
+                value = pickle.load(file_obj)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logging.warning(f"Dropping unreadable fit cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        with self._lock:
+            index = self._load_index()
+            if path in index:
+                index[path][1] = os.path.getmtime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value) -> None:
+        try:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file_obj:
+                pickle.dump(value, file_obj)
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                index = self._load_index()
+                stat = os.stat(path)
+                index[path] = [stat.st_size, stat.st_mtime]
+                self._evict(index)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        if self._index is not None:
+            self._index.pop(path, None)
+
+    def _evict(self, index: dict) -> None:
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            evicted += 1
+        logging.info(f"Fit cache evicted {evicted} least recently used entries, {total} bytes kept")
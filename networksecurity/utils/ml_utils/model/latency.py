@@ -0,0 +1,47 @@
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from networksecurity.entity.artifact_entity import ModelLatencyArtifact
+from networksecurity.exception.exception import NetworkSecurityException
+
+
+def measure_inference_cost(model, X_sample, n_single_rows: int = 100,
+                           batch_size: int = 1000, n_batch_repeats: int = 3) -> ModelLatencyArtifact:
+    """
+    Measures single-row and batch predict latency of a fitted model on a
+    held-out sample, along with its pickled size.
+    """
+    try:
+        X_sample = np.asarray(X_sample)
+
+        single_row_times = []
+        for i in range(n_single_rows):
+            row = X_sample[i % len(X_sample)].reshape(1, -1)
+            start_time = time.perf_counter()
+            model.predict(row)
+            single_row_times.append(time.perf_counter() - start_time)
+        single_row_ms = np.asarray(single_row_times) * 1000
+
+        # Repeat the sample when it is smaller than the batch
+        repeats = int(np.ceil(batch_size / len(X_sample)))
+        X_batch = np.tile(X_sample, (repeats, 1))[:batch_size]
+        batch_times = []
+        for _ in range(n_batch_repeats):
+            start_time = time.perf_counter()
+            model.predict(X_batch)
+            batch_times.append(time.perf_counter() - start_time)
+        batch_time = min(batch_times)
+
+        return ModelLatencyArtifact(
+            single_row_p50_ms=float(np.percentile(single_row_ms, 50)),
+            single_row_p99_ms=float(np.percentile(single_row_ms, 99)),
+            batch_size=len(X_batch),
+            batch_latency_ms=batch_time * 1000,
+            batch_rows_per_second=len(X_batch) / max(batch_time, 1e-9),
+            serialized_size_bytes=len(pickle.dumps(model)),
+        )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
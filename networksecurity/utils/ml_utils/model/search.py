@@ -0,0 +1,409 @@
+import math
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.utils.validation import has_fit_parameter
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+
+@dataclass
+class SearchResult:
+    best_estimator: object
+    best_params: dict
+    best_score: float
+    n_fits: int
+    n_exhaustive_fits: int
+    refit_time: float
+    # Exhaustive best score minus the exhaustive score of this search's pick, when audited
+    score_given_up: float = None
+    # Fits weighted by the share of rows/estimators each used; None when all used the full resource
+    fit_cost: float = None
+
+    @property
+    def fits_skipped(self) -> float:
+        """
+        Exhaustive fits saved, in full-resource fit equivalents. Successive
+        halving runs more (smaller) fits than the exhaustive grid, so its raw
+        fit count is not comparable.
+        """
+        return self.n_exhaustive_fits - (self.n_fits if self.fit_cost is None else self.fit_cost)
+
+
+def _take(sample_weight, rows):
+    return None if sample_weight is None else sample_weight[rows]
+
+
+def fit_weighted(model, X, y, sample_weight=None):
+    """
+    Fits model with sample_weight when it accepts one, otherwise expands the
+    weighted (collapsed) rows back into repeated rows.
+    """
+    if sample_weight is None:
+        return model.fit(X, y)
+    if has_fit_parameter(model, "sample_weight"):
+        return model.fit(X, y, sample_weight=sample_weight)
+    repeats = np.asarray(sample_weight).astype(int)
+    return model.fit(np.repeat(X, repeats, axis=0), np.repeat(y, repeats))
+
+
+def _fit_and_score(estimator, params, X, y, train, test, sample_weight=None):
+    model = clone(estimator).set_params(**params)
+    fit_weighted(model, X[train], y[train], _take(sample_weight, train))
+    return accuracy_score(y[test], model.predict(X[test]), sample_weight=_take(sample_weight, test))
+
+
+class GridSearch:
+    """
+    Exhaustive search over every grid point, scored like GridSearchCV with
+    stratified folds. When a FitCache is given, per-fold scores and refit
+    winners are memoised so later runs only fit new grid points.
+
+    Every search accepts an optional sample_weight of row counts, used to fit
+    and score on duplicate-collapsed data as if the rows were repeated.
+    """
+    def __init__(self, cv: int = 3, n_jobs: int = -1, cv_seed: int = None, cache=None):
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.cv_seed = cv_seed
+        self.cache = cache
+
+    def _folds(self, X, y) -> list:
+        return list(
+            StratifiedKFold(
+                n_splits=self.cv, shuffle=self.cv_seed is not None, random_state=self.cv_seed
+            ).split(X, y)
+        )
+
+    def _cache_key(self, fingerprint: str, estimator, params: dict, kind: str = "cv") -> str:
+        return self.cache.make_key(fingerprint, estimator, params, self.cv, self.cv_seed, kind)
+
+    def _score_candidates(self, estimator, candidates: list, X, y, sample_weight=None):
+        """
+        Returns the (n_candidates, cv) fold scores and the number of fits run.
+        """
+        fold_scores = [None] * len(candidates)
+        keys = [None] * len(candidates)
+        if self.cache is not None:
+            fingerprint = self.cache.fingerprint(X, y, sample_weight)
+            for i, params in enumerate(candidates):
+                keys[i] = self._cache_key(fingerprint, estimator, params)
+                entry = self.cache.get(keys[i])
+                if entry is not None:
+                    fold_scores[i] = entry["fold_scores"]
+
+        missing = [i for i, scores in enumerate(fold_scores) if scores is None]
+        folds = self._folds(X, y)
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_and_score)(estimator, candidates[i], X, y, train, test, sample_weight)
+            for i in missing
+            for train, test in folds
+        )
+        for j, i in enumerate(missing):
+            fold_scores[i] = results[j * self.cv:(j + 1) * self.cv]
+            if self.cache is not None:
+                self.cache.put(keys[i], {"fold_scores": fold_scores[i]})
+
+        if self.cache is not None and len(missing) < len(candidates):
+            logging.info(
+                f"{type(estimator).__name__}: {len(candidates) - len(missing)} of "
+                f"{len(candidates)} candidates served from the fit cache"
+            )
+        return np.asarray(fold_scores, dtype=float), len(results)
+
+    def _refit(self, estimator, params: dict, X, y, sample_weight=None):
+        """
+        Fits the winning candidate on the full data, returning it with the fit time.
+        """
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(self.cache.fingerprint(X, y, sample_weight), estimator, params, kind="refit")
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, 0.0
+
+        refit_start = time.perf_counter()
+        best_estimator = fit_weighted(clone(estimator).set_params(**params), X, y, sample_weight)
+        refit_time = time.perf_counter() - refit_start
+
+        if key is not None:
+            self.cache.put(key, best_estimator)
+        return best_estimator, refit_time
+
+    def search(self, estimator, param_grid: dict, X, y, sample_weight=None) -> SearchResult:
+        try:
+            candidates = list(ParameterGrid(param_grid))
+            fold_scores, n_fits = self._score_candidates(estimator, candidates, X, y, sample_weight)
+            mean_scores = fold_scores.mean(axis=1)
+            best_index = int(np.argmax(mean_scores))
+            best_estimator, refit_time = self._refit(estimator, candidates[best_index], X, y, sample_weight)
+            return SearchResult(
+                best_estimator=best_estimator,
+                best_params=candidates[best_index],
+                best_score=float(mean_scores[best_index]),
+                n_fits=n_fits,
+                n_exhaustive_fits=len(candidates) * self.cv,
+                refit_time=refit_time,
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+class SuccessiveHalvingSearch(GridSearch):
+    """
+    Scores every grid point on a small share of the resource, keeps the best
+    1/factor of them and repeats with factor times more resource until the
+    survivors run on the full resource.
+
+    Ensembles with an n_estimators parameter are halved over their estimator
+    count, every other model over training rows. When n_estimators is itself
+    a grid axis, scaling it would compare candidates at unrelated sizes, so
+    such grids are halved over rows too. time_budget (seconds) is shared by
+    every search run through this object: once it is spent no new rung is
+    started and the best candidate of the last finished rung wins; the first
+    rung always runs, so a search never falls back to untuned defaults.
+
+    Row subsets keep the original row order, so the last rung on all rows
+    uses the same CV splits as GridSearch. With audit=True the exhaustive grid
+    is scored on those splits and score_given_up is the gap between its best
+    candidate and the one halving picked (never negative).
+    """
+    def __init__(self, cv: int = 3, n_jobs: int = -1, cv_seed: int = None, cache=None,
+                 factor: int = 3, min_resources: int = 60, time_budget: float = None,
+                 audit: bool = False, random_state: int = 42):
+        super().__init__(cv=cv, n_jobs=n_jobs, cv_seed=cv_seed, cache=cache)
+        self.factor = factor
+        self.min_resources = min_resources
+        self.time_budget = time_budget
+        self.audit = audit
+        self.random_state = random_state
+        self._deadline = None
+
+    def _budget_left(self) -> bool:
+        if self.time_budget is None:
+            return True
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.time_budget
+        return time.monotonic() < self._deadline
+
+    def _rung_params(self, estimator, candidate: dict, fraction: float) -> dict:
+        params = dict(candidate)
+        if "n_estimators" in estimator.get_params():
+            full = params.get("n_estimators", estimator.get_params()["n_estimators"])
+            params["n_estimators"] = max(1, int(round(full * fraction)))
+        return params
+
+    def search(self, estimator, param_grid: dict, X, y, sample_weight=None) -> SearchResult:
+        try:
+            candidates = list(ParameterGrid(param_grid))
+            n_exhaustive_fits = len(candidates) * self.cv
+            by_estimators = "n_estimators" in estimator.get_params() and "n_estimators" not in param_grid
+
+            n_rungs = 1
+            while self.factor ** n_rungs <= len(candidates):
+                n_rungs += 1
+            if not by_estimators:
+                # Never go below min_resources rows on the first rung
+                while n_rungs > 1 and len(y) / self.factor ** (n_rungs - 1) < self.min_resources:
+                    n_rungs -= 1
+
+            order = np.random.RandomState(self.random_state).permutation(len(y))
+            n_fits, fit_cost = 0, 0.0
+            for rung in range(n_rungs):
+                # Checked on every rung so the shared deadline starts with the first search
+                if not self._budget_left() and rung > 0:
+                    logging.info(f"Search budget spent, stopping before rung {rung + 1}/{n_rungs}")
+                    break
+
+                fraction = self.factor ** (rung - n_rungs + 1)
+                if by_estimators:
+                    X_rung, y_rung, w_rung = X, y, sample_weight
+                    rung_params = [self._rung_params(estimator, c, fraction) for c in candidates]
+                    resource_share = fraction
+                else:
+                    # Sorted: a random subset in the original order, all rows on the last rung
+                    rows = np.sort(order[:min(len(y), max(int(len(y) * fraction), self.min_resources))])
+                    X_rung, y_rung, w_rung = X[rows], y[rows], _take(sample_weight, rows)
+                    rung_params = candidates
+                    resource_share = len(rows) / len(y)
+
+                fold_scores, rung_fits = self._score_candidates(estimator, rung_params, X_rung, y_rung, w_rung)
+                n_fits += rung_fits
+                fit_cost += rung_fits * resource_share
+                scores = fold_scores.mean(axis=1)
+
+                if rung < n_rungs - 1:
+                    n_keep = max(1, math.ceil(len(candidates) / self.factor))
+                    keep = np.argsort(-scores, kind="stable")[:n_keep]
+                    candidates = [candidates[i] for i in keep]
+                    scores = scores[keep]
+
+            best_index = int(np.argmax(scores))
+            best_params, best_score = candidates[best_index], float(scores[best_index])
+
+            best_estimator, refit_time = self._refit(estimator, best_params, X, y, sample_weight)
+
+            result = SearchResult(
+                best_estimator=best_estimator,
+                best_params=best_params,
+                best_score=best_score,
+                n_fits=n_fits,
+                n_exhaustive_fits=n_exhaustive_fits,
+                refit_time=refit_time,
+                fit_cost=fit_cost,
+            )
+            logging.info(
+                f"Successive halving on {type(estimator).__name__}: {n_fits} fits costing "
+                f"{fit_cost:.1f} full fits, skipped {result.fits_skipped:.1f} of {n_exhaustive_fits}"
+            )
+
+            if self.audit:
+                # Same folds as the last rung, so with a cache its fits are reused
+                all_candidates = list(ParameterGrid(param_grid))
+                exhaustive_scores = self._score_candidates(estimator, all_candidates, X, y, sample_weight)[0].mean(axis=1)
+                exhaustive_best = int(np.argmax(exhaustive_scores))
+                result.score_given_up = float(
+                    exhaustive_scores[exhaustive_best] - exhaustive_scores[all_candidates.index(best_params)]
+                )
+                logging.info(
+                    f"Exhaustive grid best {all_candidates[exhaustive_best]} scored "
+                    f"{exhaustive_scores[exhaustive_best]:.4f}, halving gave up {result.score_given_up:.4f}"
+                )
+            return result
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+def _fit_and_score_prefixes(estimator, params, sizes, X, y, train, test, sample_weight=None):
+    """
+    Fits one ensemble at the largest size and scores every smaller size from a
+    prefix of its members.
+    """
+    model = clone(estimator).set_params(**params, n_estimators=max(sizes))
+    fit_weighted(model, X[train], y[train], _take(sample_weight, train))
+    X_test, y_test, w_test = X[test], y[test], _take(sample_weight, test)
+
+    prefix_scores = {}
+    y_pred = None
+    if hasattr(model, "staged_predict"):
+        # GradientBoosting/AdaBoost: stage n is exactly the model fitted with n_estimators=n
+        for n, y_pred in enumerate(model.staged_predict(X_test), start=1):
+            if n in sizes:
+                prefix_scores[n] = accuracy_score(y_test, y_pred, sample_weight=w_test)
+    else:
+        # RandomForest: averaging the first n trees' probabilities is the n-tree forest
+        proba_sum = 0
+        for n, tree in enumerate(model.estimators_, start=1):
+            proba_sum = proba_sum + tree.predict_proba(X_test)
+            if n in sizes:
+                y_pred = model.classes_[np.argmax(proba_sum, axis=1)]
+                prefix_scores[n] = accuracy_score(y_test, y_pred, sample_weight=w_test)
+
+    # AdaBoost stops early on a perfect fit, larger sizes then give the same model
+    return [prefix_scores.get(n, accuracy_score(y_test, y_pred, sample_weight=w_test)) for n in sizes]
+
+
+class WarmStartSearch(GridSearch):
+    """
+    Grid search that fits each ensemble configuration once at its largest
+    n_estimators and scores the smaller sizes from prefixes of the fitted
+    ensemble: staged predictions for boosting, tree subsets for random forests.
+    With a fixed random_state the prefixes equal the smaller fits, so the same
+    best model as the exhaustive sweep is picked. Models that do not sweep
+    n_estimators fall back to the exhaustive grid.
+    """
+    def _supports_prefixes(self, estimator, param_grid: dict) -> bool:
+        return (
+            len(param_grid.get("n_estimators", [])) > 1
+            and (hasattr(estimator, "staged_predict") or isinstance(estimator, RandomForestClassifier))
+        )
+
+    def search(self, estimator, param_grid: dict, X, y, sample_weight=None) -> SearchResult:
+        try:
+            if not self._supports_prefixes(estimator, param_grid):
+                return super().search(estimator, param_grid, X, y, sample_weight)
+
+            sizes = sorted(set(param_grid["n_estimators"]))
+            base_grid = {key: value for key, value in param_grid.items() if key != "n_estimators"}
+            configs = list(ParameterGrid(base_grid))
+
+            # scores[config, fold, size]; a config is refit only if any of its sizes is uncached
+            scores = np.full((len(configs), self.cv, len(sizes)), np.nan)
+            keys = {}
+            if self.cache is not None:
+                fingerprint = self.cache.fingerprint(X, y, sample_weight)
+                for c, config in enumerate(configs):
+                    for s, n in enumerate(sizes):
+                        keys[c, s] = self._cache_key(fingerprint, estimator, {**config, "n_estimators": n})
+                        entry = self.cache.get(keys[c, s])
+                        if entry is not None:
+                            scores[c, :, s] = entry["fold_scores"]
+            missing = [c for c in range(len(configs)) if np.isnan(scores[c]).any()]
+
+            folds = self._folds(X, y)
+            fold_scores = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_and_score_prefixes)(estimator, configs[c], sizes, X, y, train, test, sample_weight)
+                for c in missing
+                for train, test in folds
+            )
+            for j, c in enumerate(missing):
+                scores[c] = fold_scores[j * self.cv:(j + 1) * self.cv]
+                if self.cache is not None:
+                    for s in range(len(sizes)):
+                        self.cache.put(keys[c, s], {"fold_scores": scores[c, :, s].tolist()})
+            scores = scores.mean(axis=1)
+
+            # Walk the candidates in ParameterGrid order so ties break like GridSearchCV
+            candidates = list(ParameterGrid(param_grid))
+            candidate_scores = []
+            for candidate in candidates:
+                config = {key: value for key, value in candidate.items() if key != "n_estimators"}
+                candidate_scores.append(
+                    scores[configs.index(config), sizes.index(candidate["n_estimators"])]
+                )
+            best_index = int(np.argmax(candidate_scores))
+            best_params = candidates[best_index]
+            best_estimator, refit_time = self._refit(estimator, best_params, X, y, sample_weight)
+
+            result = SearchResult(
+                best_estimator=best_estimator,
+                best_params=best_params,
+                best_score=float(candidate_scores[best_index]),
+                n_fits=len(fold_scores),
+                n_exhaustive_fits=len(candidates) * self.cv,
+                refit_time=refit_time,
+            )
+            logging.info(
+                f"Warm-start sweep on {type(estimator).__name__}: {result.n_fits} fits "
+                f"at n_estimators={max(sizes)}, skipped {result.fits_skipped} of {result.n_exhaustive_fits}"
+            )
+            return result
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+SEARCH_STRATEGIES = {
+    "grid": GridSearch,
+    "halving": SuccessiveHalvingSearch,
+    "warm_start": WarmStartSearch,
+}
+
+
+def get_search_strategy(name: str, **kwargs):
+    """
+    Builds the search strategy registered under name.
+    """
+    try:
+        if name not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy '{name}'. Available: {list(SEARCH_STRATEGIES)}")
+        return SEARCH_STRATEGIES[name](**kwargs)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
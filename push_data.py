@@ -1,15 +1,10 @@
 import os
 import sys
 import json
-from dotenv import load_dotenv
-load_dotenv()
-MONGO_DB_URL = os.getenv("MONGO_DB_URL")
-if not MONGO_DB_URL:
-    raise ValueError("MONGO_DB_URL not set in .env!")
 
 import pandas as pd
 import numpy as np
-import pymongo
+from networksecurity.cloud.mongo_client import get_mongo_client
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging  # Assuming your custom logger
 
@@ -37,7 +32,7 @@ class NetworkDataExtract:
             self.database = database
             self.collection = collection
             self.records = records
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL)
+            self.mongo_client = get_mongo_client()
             self.db = self.mongo_client[self.database]  # Renamed for clarity
             self.coll = self.db[self.collection]
             
@@ -47,16 +42,13 @@ class NetworkDataExtract:
                 logging.warning(f"Collection already has {existing_count} docs—skipping insert to avoid duplicates.")
                 return existing_count
             
-            result = self.coll.insert_many(self.records)
+            # Unordered so the server can apply the batches in parallel
+            result = self.coll.insert_many(self.records, ordered=False)
             inserted_count = len(result.inserted_ids)
             logging.info(f"Successfully inserted {inserted_count} records!")
             return inserted_count
         except Exception as e:
             raise NetworkSecurityException(e, sys)
-        finally:
-            if hasattr(self, 'mongo_client'):
-                self.mongo_client.close()
-                logging.info("MongoDB connection closed.")
        
 if __name__ == '__main__':
     FILE_PATH = "Network_Data\\phishingData.csv"
@@ -34,6 +34,6 @@ setup(
     version="0.0.1",
     author="Mahesh kumar",
     author_email="maheshgovind446@gmail.com",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=get_requirements()
 )
\ No newline at end of file
@@ -1,12 +1,7 @@
-from pymongo.mongo_client import MongoClient
-from dotenv import load_dotenv
-import os
+from networksecurity.cloud.mongo_client import get_mongo_client, get_mongo_url
 import logging
 
-load_dotenv()  # Loads .env
-uri = os.getenv("MONGO_DB_URL")
-if not uri:
-    raise ValueError("MONGO_DB_URL not found in .env file!")
+uri = get_mongo_url()  # Loads .env
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,11 +9,8 @@ logger = logging.getLogger(__name__)
 print(f"Testing URI: {uri[:60]}...")  # Preview (redacted)
 
 try:
-    client = MongoClient(
-        uri,
-        connectTimeoutMS=10000,      # 10s connect
-        serverSelectionTimeoutMS=10000  # Quick selection
-    )
+    # Timeouts, pool size and TLS come from the MONGO_* constants
+    client = get_mongo_client(uri)
     # Ping test
     result = client.admin.command('ping')
     logger.info("✅ Connected! Ping successful.")
@@ -48,7 +40,6 @@ try:
         inserted = coll.insert_many(sample_data)
         logger.info(f"Inserted {len(inserted.inserted_ids)} sample records!")
 
-    client.close()
     print("🎉 Success! Data ready in MAHESH.NetworkData. Now run: python main.py")
 except Exception as e:
     logger.error(f"❌ Failed: {e}")
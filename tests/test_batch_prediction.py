@@ -0,0 +1,117 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.entity.config_entity import BatchPredictionConfig
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.pipeline.batch_prediction import BatchPrediction, split_csv
+from networksecurity.utils.main_utils.utils import save_object
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+
+
+def _save_model(model_dir, mtime_ns):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.choice([-1, 0, 1], size=(100, 3)), columns=["a", "b", "c"])
+    y = (X["a"] > 0).astype(int)
+    preprocessor = Pipeline([("imputer", KNNImputer())]).fit(X)
+    model = NetworkModel(preprocessor, DecisionTreeClassifier(random_state=0).fit(preprocessor.transform(X), y))
+    model_path = os.path.join(model_dir, "model.pkl")
+    save_object(model_path, model)
+    # The loader versions a pickled model by its mtime
+    os.utime(model_path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def job(tmp_path):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.choice([-1, 0, 1], size=(40, 4)), columns=["a", "b", "c", "Result"])
+    input_path = str(tmp_path / "input.csv")
+    df.to_csv(input_path, index=False)
+
+    model_dir = str(tmp_path / "final_model")
+    _save_model(model_dir, 10**18)
+
+    config = BatchPredictionConfig(input_path=input_path, output_dir=str(tmp_path / "job"))
+    config.model_dir = model_dir
+    config.workers = 1
+    # About ten rows per partition
+    config.chunk_bytes = 100
+    return config
+
+
+def _run(config):
+    return BatchPrediction(config).initiate_batch_prediction()
+
+
+def _manifest_lines(config):
+    with open(config.manifest_file_path) as file_obj:
+        return file_obj.read().splitlines()
+
+
+def test_every_row_is_scored_once(job):
+    artifact = _run(job)
+    n_partitions = len(split_csv(job.input_path, job.chunk_bytes))
+
+    assert n_partitions > 1
+    assert (artifact.partitions_scored, artifact.partitions_skipped) == (n_partitions, 0)
+    assert artifact.rows_scored == 40
+    scored = pd.concat([pd.read_csv(path) for path in artifact.partition_file_paths], ignore_index=True)
+    pd.testing.assert_frame_equal(scored.drop(columns=[job.prediction_column]), pd.read_csv(job.input_path))
+    # Job line and one line per partition
+    assert len(_manifest_lines(job)) == n_partitions + 1
+
+
+def test_rerun_skips_finished_partitions(job):
+    first = _run(job)
+    os.remove(first.partition_file_paths[1])
+
+    second = _run(job)
+    assert (second.partitions_scored, second.partitions_skipped) == (1, first.partitions_scored - 1)
+    assert second.partition_file_paths == first.partition_file_paths
+    assert os.path.exists(first.partition_file_paths[1])
+
+
+def test_torn_manifest_line_redoes_that_partition(job):
+    first = _run(job)
+    lines = _manifest_lines(job)
+    torn_partition = json.loads(lines[-1])["partition"]
+    # A crash while appending leaves half of the last line
+    with open(job.manifest_file_path, "w") as file_obj:
+        file_obj.write("\n".join(lines[:-1]) + "\n" + lines[-1][: len(lines[-1]) // 2])
+
+    second = _run(job)
+    assert (second.partitions_scored, second.partitions_skipped) == (1, first.partitions_scored - 1)
+    assert second.rows_scored == pd.read_csv(first.partition_file_paths[torn_partition]).shape[0]
+
+
+def test_manifest_with_only_a_partial_job_line_starts_over(job):
+    os.makedirs(job.output_dir)
+    with open(job.manifest_file_path, "w") as file_obj:
+        file_obj.write('{"job": {"model_ver')
+
+    artifact = _run(job)
+    assert (artifact.partitions_skipped, artifact.rows_scored) == (0, 40)
+    assert "job" in json.loads(_manifest_lines(job)[0])
+
+
+def test_model_change_invalidates_the_job(job):
+    _run(job)
+    _save_model(job.model_dir, 2 * 10**18)
+
+    with pytest.raises(NetworkSecurityException, match="different job"):
+        _run(job)
+
+
+def test_input_change_invalidates_the_job(job):
+    _run(job)
+    with open(job.input_path, "a") as file_obj:
+        file_obj.write("1,1,1,1\n")
+
+    with pytest.raises(NetworkSecurityException, match="different job"):
+        _run(job)
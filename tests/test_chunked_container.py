@@ -0,0 +1,150 @@
+import os
+import pickle
+import zlib
+
+import numpy as np
+import pytest
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import (
+    ChunkedReader,
+    ChunkedWriter,
+    is_chunked_container,
+    iter_numpy_array_chunks,
+    load_numpy_array_chunk,
+    load_numpy_array_data,
+    load_object,
+    save_numpy_array_data,
+    save_object,
+)
+
+
+@pytest.fixture(params=["zlib", "zstd"])
+def codec(request):
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+def test_write_is_cut_into_chunks_and_read_back(tmp_path, codec):
+    path = str(tmp_path / "data.bin")
+    payload = os.urandom(10_000)
+    with ChunkedWriter(path, codec=codec, chunk_bytes=4096, metadata={"kind": "raw"}) as writer:
+        writer.write(payload[:3000])
+        writer.write(payload[3000:])
+
+    assert is_chunked_container(path)
+    with ChunkedReader(path) as reader:
+        assert reader.codec == codec
+        assert reader.metadata == {"kind": "raw"}
+        assert reader.raw_bytes == len(payload)
+        assert reader.n_chunks == 3
+        assert reader.read_chunk(1) == payload[4096:8192]
+        assert b"".join(reader) == payload
+        assert reader.stream().read() == payload
+
+
+def test_write_chunk_keeps_chunk_boundaries(tmp_path, codec):
+    path = str(tmp_path / "data.bin")
+    chunks = [b"a" * 10, b"b" * 5000, b"c"]
+    with ChunkedWriter(path, codec=codec, chunk_bytes=16) as writer:
+        for chunk in chunks:
+            writer.write_chunk(chunk)
+
+    with ChunkedReader(path) as reader:
+        assert list(reader) == chunks
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    path = str(tmp_path / "data.bin")
+    with pytest.raises(RuntimeError):
+        with ChunkedWriter(path) as writer:
+            writer.write(b"partial")
+            raise RuntimeError("interrupted")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_corrupt_chunk_is_detected(tmp_path):
+    path = str(tmp_path / "data.bin")
+    with ChunkedWriter(path, codec="zlib", level=0) as writer:
+        writer.write_chunk(b"x" * 1000)
+
+    with open(path, "r+b") as file_obj:
+        file_obj.seek(200)
+        file_obj.write(b"y")
+    # zlib's own check or the chunk crc32, depending on where the damage lands
+    with ChunkedReader(path) as reader, pytest.raises((IOError, zlib.error)):
+        reader.read_chunk(0)
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = str(tmp_path / "data.bin")
+    with ChunkedWriter(path) as writer:
+        writer.write(b"x" * 1000)
+    with open(path, "r+b") as file_obj:
+        file_obj.truncate(os.path.getsize(path) - 4)
+
+    with pytest.raises(ValueError):
+        ChunkedReader(path)
+
+
+def test_numeric_array_round_trip(tmp_path, codec):
+    path = str(tmp_path / "train.npyc")
+    array = np.random.default_rng(0).normal(size=(50_000, 31))
+    save_numpy_array_data(path, array, codec=codec)
+
+    assert is_chunked_container(path)
+    np.testing.assert_array_equal(load_numpy_array_data(path), array)
+    blocks = list(iter_numpy_array_chunks(path))
+    assert len(blocks) > 1
+    np.testing.assert_array_equal(np.concatenate(blocks), array)
+    np.testing.assert_array_equal(load_numpy_array_chunk(path, 1), blocks[1])
+
+
+def test_object_array_round_trip(tmp_path):
+    path = str(tmp_path / "labels.npyc")
+    array = np.array(["a", None, 3], dtype=object)
+    save_numpy_array_data(path, array)
+
+    np.testing.assert_array_equal(load_numpy_array_data(path), array)
+    with pytest.raises(NetworkSecurityException):
+        list(iter_numpy_array_chunks(path))
+
+
+def test_plain_npy_still_loads(tmp_path):
+    path = str(tmp_path / "train.npy")
+    array = np.arange(12).reshape(3, 4)
+    save_numpy_array_data(path, array)
+
+    assert not is_chunked_container(path)
+    np.testing.assert_array_equal(load_numpy_array_data(path), array)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_object_round_trip(tmp_path, compress):
+    path = str(tmp_path / "model" / "model.pkl")
+    obj = {"weights": np.arange(100_000, dtype=float), "name": "model"}
+    save_object(path, obj, compress=compress)
+
+    assert is_chunked_container(path) == compress
+    loaded = load_object(path)
+    assert loaded["name"] == "model"
+    np.testing.assert_array_equal(loaded["weights"], obj["weights"])
+    if not compress:
+        with open(path, "rb") as file_obj:
+            assert pickle.load(file_obj)["name"] == "model"
+
+
+def test_transformation_artifacts_stay_plain_npy_by_default(monkeypatch):
+    from networksecurity.constant import training_pipeline
+    from networksecurity.entity.config_entity import DataTransformationConfig, TrainingPipelineConfig
+
+    config = DataTransformationConfig(TrainingPipelineConfig())
+    assert not config.compress_artifacts
+    assert config.transformed_train_file_path.endswith("train.npy")
+    assert config.transformed_test_file_path.endswith("test.npy")
+
+    monkeypatch.setattr(training_pipeline, "DATA_TRANSFORMATION_COMPRESS_ARTIFACTS", True)
+    config = DataTransformationConfig(TrainingPipelineConfig())
+    assert config.transformed_train_file_path.endswith("train.npyc")
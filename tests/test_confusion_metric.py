@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from sklearn import metrics
+
+from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
+from networksecurity.utils.ml_utils.metric.confusion_metric import confusion_matrix, threshold_sweep
+
+
+@pytest.fixture(scope="module")
+def multiclass():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 3, size=500)
+    y_pred = np.where(rng.random(500) < 0.7, y_true, rng.integers(0, 3, size=500))
+    return y_true, y_pred, rng.integers(1, 5, size=500).astype(float)
+
+
+@pytest.fixture(scope="module")
+def scored():
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 2, size=400)
+    # Rounded so many rows share a score, which exercises the tie handling
+    scores = np.round(np.clip(y_true * 0.3 + rng.random(400) * 0.7, 0, 1), 2)
+    return y_true, scores, rng.integers(1, 4, size=400).astype(float)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_matrix_matches_sklearn(multiclass, weighted):
+    y_true, y_pred, weights = multiclass
+    sample_weight = weights if weighted else None
+    result = confusion_matrix(y_true, y_pred, sample_weight=sample_weight)
+
+    np.testing.assert_array_equal(result.labels, [0, 1, 2])
+    np.testing.assert_allclose(result.matrix, metrics.confusion_matrix(y_true, y_pred, sample_weight=sample_weight))
+    assert result.accuracy() == pytest.approx(metrics.accuracy_score(y_true, y_pred, sample_weight=sample_weight))
+
+
+@pytest.mark.parametrize("labels", [[2, 1], [2, 0, 1], [1, 5, 0]])
+def test_labels_keep_caller_order_and_drop_unknown_values(multiclass, labels):
+    y_true, y_pred, weights = multiclass
+    result = confusion_matrix(y_true, y_pred, sample_weight=weights, labels=labels)
+
+    np.testing.assert_array_equal(result.labels, labels)
+    np.testing.assert_allclose(
+        result.matrix, metrics.confusion_matrix(y_true, y_pred, sample_weight=weights, labels=labels)
+    )
+
+
+def test_string_labels(multiclass):
+    y_true, y_pred, _ = multiclass
+    names = np.array(["benign", "phishing", "suspicious"])
+    result = confusion_matrix(names[y_true], names[y_pred], labels=["suspicious", "benign"])
+    np.testing.assert_array_equal(
+        result.matrix,
+        metrics.confusion_matrix(names[y_true], names[y_pred], labels=["suspicious", "benign"]),
+    )
+
+
+def test_duplicate_labels_are_rejected():
+    with pytest.raises(Exception):
+        confusion_matrix([0, 1], [0, 1], labels=[1, 1])
+
+
+@pytest.mark.parametrize("average", ["macro", "weighted"])
+@pytest.mark.parametrize("weighted", [False, True])
+def test_averaged_scores_match_sklearn(multiclass, average, weighted):
+    y_true, y_pred, weights = multiclass
+    sample_weight = weights if weighted else None
+    expected = metrics.precision_recall_fscore_support(
+        y_true, y_pred, average=average, sample_weight=sample_weight, zero_division=0
+    )[:3]
+    result = confusion_matrix(y_true, y_pred, sample_weight=sample_weight).precision_recall_f1(average=average)
+    np.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_binary_scores_match_sklearn(scored, weighted):
+    y_true, scores, weights = scored
+    y_pred = (scores >= 0.5).astype(int)
+    sample_weight = weights if weighted else None
+    expected = metrics.precision_recall_fscore_support(
+        y_true, y_pred, average="binary", sample_weight=sample_weight, zero_division=0
+    )[:3]
+    result = confusion_matrix(y_true, y_pred, sample_weight=sample_weight).precision_recall_f1(pos_label=1)
+    np.testing.assert_allclose(result, expected)
+
+    artifact = get_classification_score(y_true, y_pred)
+    assert artifact.f1_score == pytest.approx(metrics.f1_score(y_true, y_pred))
+    assert artifact.precision_score == pytest.approx(metrics.precision_score(y_true, y_pred))
+    assert artifact.recall_score == pytest.approx(metrics.recall_score(y_true, y_pred))
+
+
+def test_missing_positive_label_scores_zero():
+    assert confusion_matrix([0, 0], [0, 0]).precision_recall_f1(pos_label=1) == (0.0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_threshold_sweep_matches_precision_recall_curve(scored, weighted):
+    y_true, scores, weights = scored
+    sample_weight = weights if weighted else None
+    sweep = threshold_sweep(y_true, scores, sample_weight=sample_weight)
+    precision, recall, thresholds = metrics.precision_recall_curve(
+        y_true, scores, sample_weight=sample_weight, drop_intermediate=False
+    )
+
+    # sklearn lists thresholds ascending and appends the (precision=1, recall=0) end point
+    np.testing.assert_allclose(sweep.thresholds, thresholds[::-1])
+    np.testing.assert_allclose(sweep.precision, precision[:-1][::-1])
+    np.testing.assert_allclose(sweep.recall, recall[:-1][::-1])
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_threshold_sweep_matches_per_threshold_scores(scored, weighted):
+    y_true, scores, weights = scored
+    sample_weight = weights if weighted else None
+    sweep = threshold_sweep(y_true, scores, sample_weight=sample_weight)
+
+    fpr, _, roc_thresholds = metrics.roc_curve(y_true, scores, sample_weight=sample_weight, drop_intermediate=False)
+    np.testing.assert_allclose(sweep.false_positive_rate, fpr[1:])
+    np.testing.assert_allclose(sweep.thresholds, roc_thresholds[1:])
+
+    for threshold, f1 in zip(sweep.thresholds[::7], sweep.f1[::7]):
+        y_pred = (scores >= threshold).astype(int)
+        assert f1 == pytest.approx(metrics.f1_score(y_true, y_pred, sample_weight=sample_weight))
+
+    best_threshold, best_f1 = sweep.best_threshold("f1")
+    assert best_f1 == pytest.approx(sweep.f1.max())
+    assert best_f1 == pytest.approx(
+        metrics.f1_score(y_true, (scores >= best_threshold).astype(int), sample_weight=sample_weight)
+    )
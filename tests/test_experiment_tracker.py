@@ -0,0 +1,111 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+mlflow = pytest.importorskip("mlflow")
+from mlflow.tracking import MlflowClient  # noqa: E402
+
+from networksecurity.utils.ml_utils.experiment_tracker import BufferedExperimentTracker  # noqa: E402
+
+
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    uri = (tmp_path / "mlruns").as_uri()
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", uri)
+    # Newer MLflow releases refuse the file store unless it is opted into
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    yield uri
+    mlflow.set_tracking_uri(None)
+
+
+@pytest.fixture
+def model():
+    return LogisticRegression(C=0.5).fit([[0.0], [1.0]], [0, 1])
+
+
+def _runs(tracking_uri):
+    client = MlflowClient(tracking_uri)
+    experiment_ids = [experiment.experiment_id for experiment in client.search_experiments()]
+    return client.search_runs(experiment_ids)
+
+
+def _pending(tracker):
+    return os.listdir(tracker.pending_dir)
+
+
+class FlakyTracker(BufferedExperimentTracker):
+    """
+    Tracker whose first `failures` sync attempts per run fail, e.g. while the
+    tracking server is unreachable; later attempts sync for real.
+    """
+    def __init__(self, buffer_dir, failures=0, block=None, **kwargs):
+        self.failures = failures
+        self.block = block
+        self.attempts = {}
+        super().__init__(buffer_dir, retry_backoff_seconds=0, **kwargs)
+
+    def _sync(self, run_dir):
+        if self.block is not None:
+            self.block.wait()
+        run_id = os.path.basename(run_dir)
+        self.attempts[run_id] = self.attempts.get(run_id, 0) + 1
+        if self.attempts[run_id] <= self.failures:
+            raise ConnectionError("tracking server unavailable")
+        super()._sync(run_dir)
+
+
+def test_run_round_trips_through_a_file_store(tmp_path, tracking_uri, model):
+    tracker = BufferedExperimentTracker(str(tmp_path / "buffer"))
+    tracker.log_run(
+        {"f1_score": 0.9, "precision": 0.8}, model, input_example=np.array([[0.5]]),
+        registered_model_name="LogisticRegression", params=model.get_params(deep=False),
+    )
+
+    assert tracker.flush(timeout=60)
+    assert _pending(tracker) == []
+    [run] = _runs(tracking_uri)
+    assert run.data.metrics == {"f1_score": 0.9, "precision": 0.8}
+    assert run.data.params["C"] == "0.5"
+
+    logged = mlflow.sklearn.load_model(f"runs:/{run.info.run_id}/model")
+    np.testing.assert_array_equal(logged.predict([[0.0], [1.0]]), [0, 1])
+
+
+def test_failed_sync_is_retried(tmp_path, tracking_uri, model):
+    tracker = FlakyTracker(str(tmp_path / "buffer"), failures=2, max_retries=3)
+    run_id = tracker.log_run({"f1_score": 0.9}, model)
+
+    assert tracker.flush(timeout=60)
+    assert tracker.attempts == {run_id: 3}
+    assert [run.data.metrics for run in _runs(tracking_uri)] == [{"f1_score": 0.9}]
+    assert _pending(tracker) == []
+
+
+def test_run_stays_buffered_until_a_later_tracker_syncs_it(tmp_path, tracking_uri, model):
+    buffer_dir = str(tmp_path / "buffer")
+    tracker = FlakyTracker(buffer_dir, failures=5, max_retries=2)
+    run_id = tracker.log_run({"f1_score": 0.9}, model)
+
+    assert tracker.flush(timeout=60)
+    assert tracker.attempts == {run_id: 2}
+    assert _pending(tracker) == [run_id]
+    assert _runs(tracking_uri) == []
+
+    restarted = BufferedExperimentTracker(buffer_dir)
+    assert restarted.flush(timeout=60)
+    assert _pending(restarted) == []
+    assert [run.data.metrics for run in _runs(tracking_uri)] == [{"f1_score": 0.9}]
+
+
+def test_flush_times_out_while_sync_is_pending(tmp_path, tracking_uri, model):
+    block = threading.Event()
+    tracker = FlakyTracker(str(tmp_path / "buffer"), block=block)
+    tracker.log_run({"f1_score": 0.9}, model)
+
+    assert not tracker.flush(timeout=0.2)
+    block.set()
+    assert tracker.flush(timeout=60)
+    assert _pending(tracker) == []
@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.utils.ml_utils.model.fit_cache import FitCache
+from networksecurity.utils.ml_utils.model.search import GridSearch
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=300, n_features=6, random_state=0)
+
+
+def _entry_count(cache_dir):
+    return sum(name.endswith(".pkl") for _, _, files in os.walk(cache_dir) for name in files)
+
+
+def test_rerun_is_served_from_the_cache(tmp_path, data):
+    X, y = data
+    grid = {"max_depth": [2, 4, 8]}
+    first = GridSearch(cv=3, n_jobs=1, cache=FitCache(str(tmp_path))).search(DecisionTreeClassifier(random_state=0), grid, X, y)
+
+    cache = FitCache(str(tmp_path))
+    second = GridSearch(cv=3, n_jobs=1, cache=cache).search(DecisionTreeClassifier(random_state=0), grid, X, y)
+    assert first.n_fits == 9
+    assert second.n_fits == 0
+    assert second.refit_time == 0.0
+    assert second.best_params == first.best_params
+    assert second.best_score == first.best_score
+    # Three candidates' fold scores and the refit winner
+    assert (cache.hits, cache.misses) == (4, 0)
+
+
+def test_widened_grid_only_fits_new_points(tmp_path, data):
+    X, y = data
+    search = GridSearch(cv=3, n_jobs=1, cache=FitCache(str(tmp_path)))
+    search.search(DecisionTreeClassifier(random_state=0), {"max_depth": [2, 4]}, X, y)
+
+    result = search.search(DecisionTreeClassifier(random_state=0), {"max_depth": [2, 4, 8]}, X, y)
+    assert result.n_fits == 3
+
+
+@pytest.mark.parametrize("change", ["X", "y", "sample_weight", "params", "cv_seed"])
+def test_key_changes_with_data_params_and_split(data, change):
+    X, y = data
+    estimator = DecisionTreeClassifier(random_state=0)
+    base = FitCache.make_key(FitCache.fingerprint(X, y), estimator, {"max_depth": 2}, 3, None)
+
+    if change == "X":
+        X = X.copy()
+        X[0, 0] += 1e-9
+    elif change == "y":
+        y = y.copy()
+        y[0] = 1 - y[0]
+    fingerprint = FitCache.fingerprint(X, y, np.ones(len(y)) if change == "sample_weight" else None)
+    params = {"max_depth": 3} if change == "params" else {"max_depth": 2}
+    cv_seed = 0 if change == "cv_seed" else None
+
+    assert FitCache.make_key(fingerprint, estimator, params, 3, cv_seed) != base
+
+
+def test_changed_data_misses_the_cache(tmp_path, data):
+    X, y = data
+    grid = {"max_depth": [2, 4]}
+    GridSearch(cv=3, n_jobs=1, cache=FitCache(str(tmp_path))).search(DecisionTreeClassifier(random_state=0), grid, X, y)
+
+    result = GridSearch(cv=3, n_jobs=1, cache=FitCache(str(tmp_path))).search(
+        DecisionTreeClassifier(random_state=0), grid, X[:-1], y[:-1]
+    )
+    assert result.n_fits == 6
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path):
+    payload = b"x" * 1000
+    cache = FitCache(str(tmp_path))
+    for key in ("a" * 64, "b" * 64):
+        cache.put(key, payload)
+    # Written long ago, "a" before "b"
+    os.utime(cache._path("a" * 64), (1000, 1000))
+    os.utime(cache._path("b" * 64), (2000, 2000))
+
+    entry_bytes = os.path.getsize(cache._path("a" * 64))
+    cache = FitCache(str(tmp_path), max_bytes=2 * entry_bytes)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a" * 64) == payload
+    cache.put("c" * 64, payload)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) == payload
+    assert cache.get("c" * 64) == payload
+    assert _entry_count(str(tmp_path)) == 2
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    cache = FitCache(str(tmp_path))
+    cache.put("d" * 64, {"fold_scores": [1.0]})
+    with open(cache._path("d" * 64), "wb") as file_obj:
+        file_obj.write(b"not a pickle")
+
+    assert cache.get("d" * 64) is None
+    assert not os.path.exists(cache._path("d" * 64))
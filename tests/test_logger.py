@@ -0,0 +1,54 @@
+import logging
+import queue
+
+import pytest
+
+from networksecurity.logging.logger import DeferredQueueHandler
+
+
+@pytest.fixture
+def capture():
+    log_queue = queue.Queue()
+    logger = logging.Logger("test_deferred_queue_handler")
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    return logger, log_queue
+
+
+def test_mutated_argument_is_logged_with_its_value_at_call_time(capture):
+    logger, log_queue = capture
+    rows = [1, 2]
+    logger.info("rows %s", rows)
+    rows.append(3)
+
+    assert log_queue.get_nowait().getMessage() == "rows [1, 2]"
+
+
+def test_mapping_argument_is_merged_at_call_time(capture):
+    logger, log_queue = capture
+    state = {"stage": "transform"}
+    logger.info("stage %(stage)s", state)
+    state["stage"] = "train"
+
+    assert log_queue.get_nowait().getMessage() == "stage transform"
+
+
+@pytest.mark.parametrize("args", [("a", 1, 2.5, None, True, b"x"), (("nested", 1),)])
+def test_immutable_arguments_stay_deferred(capture, args):
+    logger, log_queue = capture
+    template = " ".join(["%s"] * len(args))
+    logger.info(template, *args)
+
+    record = log_queue.get_nowait()
+    assert (record.msg, record.args) == (template, args)
+    assert record.getMessage() == template % args
+
+
+def test_full_queue_drops_records():
+    handler = DeferredQueueHandler(queue.Queue(1))
+    logger = logging.Logger("test_deferred_queue_handler_full")
+    logger.addHandler(handler)
+    for index in range(3):
+        logger.info("record %d", index)
+
+    assert handler.dropped == 2
+    assert handler.queue.get_nowait().getMessage() == "record 0"
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+
+from networksecurity.constant.training_pipeline import MODEL_ARTIFACT_DIR_NAME
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import (
+    MODEL_ARTIFACT_VERSIONS_SUFFIX,
+    load_model_artifact,
+    read_model_artifact_metadata,
+    save_model_artifact,
+    save_object,
+)
+from networksecurity.utils.ml_utils.model.estimator import CachedModelLoader, NetworkModel, load_network_model
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.choice([-1.0, 0.0, 1.0], size=(3000, 30))
+    X[rng.random(X.shape) < 0.02] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + np.nan_to_num(X[:, 1]) > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def network_model(data):
+    X, y = data
+    preprocessor = Pipeline([("imputer", KNNImputer(n_neighbors=3))]).fit(X)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(preprocessor.transform(X), y)
+    return NetworkModel(preprocessor=preprocessor, model=model)
+
+
+def test_round_trip_maps_large_arrays(tmp_path, data, network_model):
+    X, _ = data
+    dir_path = str(tmp_path / MODEL_ARTIFACT_DIR_NAME)
+    metadata = save_model_artifact(dir_path, network_model)
+
+    # The imputer's training matrix and mask are mapped; tree state stays in the pickle
+    assert metadata["array_files"] == ["array_0000.npy", "array_0001.npy"]
+    assert metadata["object_class"].endswith("NetworkModel")
+    assert read_model_artifact_metadata(dir_path) == metadata
+
+    loaded = load_model_artifact(dir_path)
+    assert isinstance(loaded.preprocessor.named_steps["imputer"]._fit_X, np.memmap)
+    np.testing.assert_array_equal(loaded.predict(X[:200]), network_model.predict(X[:200]))
+
+    in_memory = load_model_artifact(dir_path, mmap_mode=None)
+    assert not isinstance(in_memory.preprocessor.named_steps["imputer"]._fit_X, np.memmap)
+
+
+def test_resave_flips_symlink_and_keeps_recent_versions(tmp_path, network_model):
+    dir_path = str(tmp_path / MODEL_ARTIFACT_DIR_NAME)
+    versions_dir = dir_path + MODEL_ARTIFACT_VERSIONS_SUFFIX
+
+    save_model_artifact(dir_path, network_model, keep_versions=2)
+    first = os.path.realpath(dir_path)
+    held = load_model_artifact(dir_path)
+
+    save_model_artifact(dir_path, network_model, keep_versions=2)
+    assert os.path.islink(dir_path)
+    assert os.path.realpath(dir_path) != first
+    # The previous version is kept for readers that still map it
+    assert os.path.isdir(first)
+    held.predict(np.zeros((1, 30)))
+
+    save_model_artifact(dir_path, network_model, keep_versions=2)
+    assert len(os.listdir(versions_dir)) == 2
+    assert not os.path.exists(first)
+    assert os.path.realpath(dir_path) == os.path.join(versions_dir, sorted(os.listdir(versions_dir))[-1])
+
+
+def test_failed_save_keeps_current_version(tmp_path, network_model):
+    dir_path = str(tmp_path / MODEL_ARTIFACT_DIR_NAME)
+    save_model_artifact(dir_path, network_model)
+    current = os.path.realpath(dir_path)
+
+    with pytest.raises(NetworkSecurityException):
+        save_model_artifact(dir_path, lambda x: x)
+    assert os.path.realpath(dir_path) == current
+    assert os.listdir(dir_path + MODEL_ARTIFACT_VERSIONS_SUFFIX) == [os.path.basename(current)]
+
+
+def test_plain_directory_is_replaced_by_versioned_link(tmp_path, network_model):
+    dir_path = tmp_path / MODEL_ARTIFACT_DIR_NAME
+    dir_path.mkdir()
+    (dir_path / "object.pkl").write_bytes(b"stale")
+
+    save_model_artifact(str(dir_path), network_model)
+    assert dir_path.is_symlink()
+    assert isinstance(load_model_artifact(str(dir_path)), NetworkModel)
+
+
+def test_cached_loader_reloads_after_resave(tmp_path, network_model):
+    save_model_artifact(str(tmp_path / MODEL_ARTIFACT_DIR_NAME), network_model)
+    loader = CachedModelLoader(str(tmp_path))
+
+    first = loader.get()
+    assert loader.get() is first
+    assert (loader.hits, loader.misses) == (1, 1)
+
+    save_model_artifact(str(tmp_path / MODEL_ARTIFACT_DIR_NAME), network_model)
+    assert loader.get() is not first
+    assert loader.misses == 2
+
+
+def test_pickle_fallback_keeps_a_pruned_network_model(tmp_path, network_model):
+    pruned = NetworkModel(network_model.preprocessor, network_model.model, feature_columns=["a", "b"])
+    save_object(str(tmp_path / "model.pkl"), pruned)
+    save_object(str(tmp_path / "preprocessor.pkl"), "stale full preprocessor")
+
+    loaded = load_network_model(str(tmp_path))
+    assert isinstance(loaded, NetworkModel)
+    assert loaded.required_columns() == ["a", "b"]
@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from networksecurity.serving.prediction_log import PredictionLog
+
+
+class FakeCollection:
+    """
+    Async stand-in for the Motor collection; insert_many waits on `gate`
+    when one is given, like a slow database.
+    """
+    def __init__(self, gate=None):
+        self.documents = []
+        self.gate = gate
+
+    async def insert_many(self, documents, ordered=True):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.documents.extend(documents)
+
+
+def _frame(request, rows):
+    return pd.DataFrame({"a": range(rows), "request": request, "predicted_column": 1})
+
+
+def _requests(collection):
+    return [document["request_id"] for document in collection.documents if document["row"] == 0]
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_close_flushes_what_is_queued():
+    async def scenario():
+        collection = FakeCollection()
+        log = PredictionLog(collection, batch_size=100, flush_interval=60)
+        log.start()
+        for request in ("r1", "r2", "r3"):
+            assert await log.record(_frame(request, 2), model_version="v1", latency_seconds=0.01, request_id=request)
+        # Neither batch_size nor flush_interval is reached before shutdown
+        await asyncio.sleep(0.01)
+        assert collection.documents == []
+
+        await log.close()
+        assert not await log.record(_frame("late", 2))
+        return collection, log
+
+    collection, log = _run(scenario())
+    assert log.queued_rows == 0
+    assert _requests(collection) == ["r1", "r2", "r3"]
+    document = collection.documents[1]
+    assert (document["row"], document["features"], document["prediction"]) == (1, {"a": 1, "request": "r1"}, 1)
+    assert (document["model_version"], document["latency_ms"], document["batch_rows"]) == ("v1", 10.0, 2)
+
+
+def test_drop_newest_keeps_the_queued_rows():
+    async def scenario():
+        collection = FakeCollection()
+        log = PredictionLog(collection, max_queue_rows=5, batch_size=100, flush_interval=60,
+                            overflow_policy="drop_newest")
+        log.start()
+        assert await log.record(_frame("r1", 3), request_id="r1")
+        assert not await log.record(_frame("r2", 3), request_id="r2")
+        assert await log.record(_frame("r3", 2), request_id="r3")
+        await log.close()
+        return collection
+
+    assert _requests(_run(scenario())) == ["r1", "r3"]
+
+
+def test_drop_oldest_makes_room_for_the_new_rows():
+    async def scenario():
+        collection = FakeCollection()
+        log = PredictionLog(collection, max_queue_rows=5, batch_size=100, flush_interval=60,
+                            overflow_policy="drop_oldest")
+        log.start()
+        for request in ("r1", "r2", "r3"):
+            assert await log.record(_frame(request, 2), request_id=request)
+        assert log.queued_rows == 4
+        assert await log.record(_frame("r4", 3), request_id="r4")
+        assert log.queued_rows == 5
+        await log.close()
+        return collection
+
+    assert _requests(_run(scenario())) == ["r3", "r4"]
+
+
+def test_block_waits_for_the_writer_to_make_room():
+    async def scenario():
+        collection = FakeCollection()
+        log = PredictionLog(collection, max_queue_rows=5, batch_size=100, flush_interval=0.05,
+                            overflow_policy="block")
+        log.start()
+        assert await log.record(_frame("r1", 3), request_id="r1")
+        blocked = asyncio.create_task(log.record(_frame("r2", 3), request_id="r2"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        # The flush_interval flush takes r1 off the queue
+        assert await asyncio.wait_for(blocked, 5)
+        await log.close()
+        return collection
+
+    assert _requests(_run(scenario())) == ["r1", "r2"]
+
+
+def test_frame_larger_than_the_queue_is_not_blocked_forever():
+    async def scenario():
+        collection = FakeCollection()
+        log = PredictionLog(collection, max_queue_rows=2, batch_size=100, flush_interval=60,
+                            overflow_policy="block")
+        log.start()
+        assert await asyncio.wait_for(log.record(_frame("r1", 4), request_id="r1"), 5)
+        await log.close()
+        return collection
+
+    assert _requests(_run(scenario())) == ["r1"]
+
+
+def test_record_blocked_at_shutdown_is_still_flushed():
+    async def scenario():
+        gate = asyncio.Event()
+        collection = FakeCollection(gate)
+        log = PredictionLog(collection, max_queue_rows=3, batch_size=3, flush_interval=60,
+                            overflow_policy="block")
+        log.start()
+        assert await log.record(_frame("r1", 3), request_id="r1")
+        # The writer is stuck in insert_many; r2 fits once r1 is taken off
+        assert await asyncio.wait_for(log.record(_frame("r2", 3), request_id="r2"), 5)
+        blocked = asyncio.create_task(log.record(_frame("r3", 3), request_id="r3"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        closing = asyncio.create_task(log.close())
+        await asyncio.sleep(0.01)
+        gate.set()
+        await closing
+        return collection, await blocked
+
+    collection, recorded = _run(scenario())
+    assert recorded
+    assert _requests(collection) == ["r1", "r2", "r3"]
+
+
+def test_close_gives_up_after_the_timeout():
+    async def scenario():
+        collection = FakeCollection(asyncio.Event())
+        log = PredictionLog(collection, batch_size=100, flush_interval=60)
+        log.start()
+        await log.record(_frame("r1", 2), request_id="r1")
+        started = time.monotonic()
+        await log.close(timeout=0.05)
+        return collection, time.monotonic() - started
+
+    collection, seconds = _run(scenario())
+    assert seconds < 5
+    assert collection.documents == []
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        PredictionLog(FakeCollection(), overflow_policy="spill")
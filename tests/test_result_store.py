@@ -0,0 +1,118 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.serving.result_store import ResultStore
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"a": range(23), "predicted_column": [i % 2 for i in range(23)]})
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path), chunk_rows=5)
+
+
+def _age(store, result_id, seconds):
+    mtime = time.time() - seconds
+    os.utime(store.path(result_id), (mtime, mtime))
+
+
+@pytest.mark.parametrize("page, page_size, expected", [
+    (1, 10, range(0, 10)),
+    # Starts and ends on chunk boundaries
+    (2, 5, range(5, 10)),
+    # Spans three chunks
+    (1, 12, range(0, 12)),
+    (2, 7, range(7, 14)),
+    # Last, partial page
+    (3, 10, range(20, 23)),
+    (1, 23, range(0, 23)),
+    (1, 100, range(0, 23)),
+])
+def test_page_matches_the_in_memory_page(store, frame, page, page_size, expected):
+    result_id = store.save(frame)
+    result_page = store.read_page(result_id, page, page_size)
+
+    assert list(result_page.rows["a"]) == list(expected)
+    assert result_page.n_rows == 23
+    pd.testing.assert_frame_equal(result_page.rows, ResultStore.page_of(frame, result_id, page, page_size).rows)
+
+
+@pytest.mark.parametrize("page_size, n_pages", [(1, 23), (5, 5), (10, 3), (23, 1), (100, 1)])
+def test_page_count(store, frame, page_size, n_pages):
+    result_id = store.save(frame)
+    assert store.read_page(result_id, 1, page_size).n_pages == n_pages
+
+
+def test_page_past_the_end_is_empty_with_the_columns(store, frame):
+    result_id = store.save(frame)
+    result_page = store.read_page(result_id, 4, 10)
+
+    assert result_page.rows.empty
+    assert list(result_page.rows.columns) == ["a", "predicted_column"]
+    assert (result_page.n_rows, result_page.n_pages) == (23, 3)
+
+
+def test_empty_result(store):
+    result_id = store.save(pd.DataFrame({"a": []}))
+    result_page = store.read_page(result_id, 1, 10)
+    assert result_page.rows.empty and result_page.n_pages == 1
+
+
+@pytest.mark.parametrize("page, page_size", [(0, 10), (-1, 10), (1, 0)])
+def test_page_before_the_start_is_rejected(store, frame, page, page_size):
+    result_id = store.save(frame)
+    with pytest.raises(NetworkSecurityException):
+        store.read_page(result_id, page, page_size)
+    with pytest.raises(ValueError):
+        ResultStore.page_of(frame, result_id, page, page_size)
+
+
+@pytest.mark.parametrize("result_id", ["0" * 32, "../etc/passwd", "", None])
+def test_unknown_or_malformed_id_does_not_exist(store, result_id):
+    assert not store.exists(result_id)
+
+
+def test_expired_result_is_gone_before_it_is_pruned(tmp_path, frame):
+    store = ResultStore(str(tmp_path), chunk_rows=5, ttl_seconds=60, prune_interval_seconds=3600)
+    result_id = store.save(frame)
+    assert store.exists(result_id)
+
+    _age(store, result_id, 120)
+    assert not store.exists(result_id)
+    with pytest.raises(NetworkSecurityException):
+        store.read_page(result_id, 1, 10)
+
+
+def test_save_prunes_expired_results(tmp_path, frame):
+    store = ResultStore(str(tmp_path), chunk_rows=5, ttl_seconds=60, prune_interval_seconds=0)
+    old, recent = store.save(frame), store.save(frame)
+    _age(store, old, 120)
+    _age(store, recent, 30)
+
+    new = store.save(frame)
+    assert not os.path.exists(store.path(old))
+    assert os.path.exists(store.path(recent)) and os.path.exists(store.path(new))
+
+
+def test_prune_runs_at_most_once_per_interval(tmp_path, frame):
+    store = ResultStore(str(tmp_path), chunk_rows=5, ttl_seconds=60, prune_interval_seconds=3600)
+    old = store.save(frame)
+    _age(store, old, 120)
+
+    # The first save already pruned, the next one is within the interval
+    store.save(frame)
+    assert os.path.exists(store.path(old))
+
+
+def test_results_are_kept_without_a_ttl(store, frame):
+    result_id = store.save(frame)
+    _age(store, result_id, 10 * 365 * 24 * 3600)
+    store.save(frame)
+    assert store.exists(result_id)
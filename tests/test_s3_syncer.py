@@ -0,0 +1,156 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from networksecurity.cloud.s3_syncer import MANIFEST_FILE_NAME, LocalObjectStore, ObjectStore, S3Sync
+
+
+def _write(path, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file_obj:
+        file_obj.write(data)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "artifacts"
+    _write(str(folder / "model.pkl"), b"model" * 100)
+    _write(str(folder / "data" / "train.npy"), b"train" * 100)
+    return str(folder)
+
+
+def test_object_store_is_abstract():
+    with pytest.raises(TypeError):
+        ObjectStore()
+
+
+def test_sync_to_store_uploads_then_skips_unchanged(tmp_path, folder):
+    store = LocalObjectStore(str(tmp_path / "bucket"))
+    syncer = S3Sync(store=store)
+
+    result = syncer.sync_folder_to_s3(folder, "s3://bucket/run")
+    assert result.success
+    assert sorted(result.transferred) == ["data/train.npy", "model.pkl"]
+    assert result.bytes_transferred == 1000
+    assert store.read_bytes("run/model.pkl") == b"model" * 100
+    assert store.read_bytes(f"run/{MANIFEST_FILE_NAME}") is not None
+
+    _write(os.path.join(folder, "model.pkl"), b"changed")
+    result = syncer.sync_folder_to_s3(folder, "s3://bucket/run")
+    assert result.transferred == ["model.pkl"]
+    assert result.skipped == ["data/train.npy"]
+    assert store.read_bytes("run/model.pkl") == b"changed"
+
+
+def test_sync_round_trip_through_store(tmp_path, folder):
+    syncer = S3Sync(store=LocalObjectStore(str(tmp_path / "bucket")))
+    syncer.sync_folder_to_s3(folder, "s3://bucket/run")
+
+    target = str(tmp_path / "restored")
+    result = syncer.sync_folder_from_s3(target, "s3://bucket/run")
+    assert result.success
+    assert sorted(result.transferred) == ["data/train.npy", "model.pkl"]
+    with open(os.path.join(target, "data", "train.npy"), "rb") as file_obj:
+        assert file_obj.read() == b"train" * 100
+
+    result = syncer.sync_folder_from_s3(target, "s3://bucket/run")
+    assert result.transferred == []
+    assert sorted(result.skipped) == ["data/train.npy", "model.pkl"]
+
+
+def test_file_url_resolves_to_local_store(tmp_path, folder):
+    bucket = tmp_path / "bucket"
+    result = S3Sync().sync_folder_to_s3(folder, f"file://{bucket}")
+    assert result.success
+    assert (bucket / "model.pkl").read_bytes() == b"model" * 100
+
+
+def test_failed_upload_is_retried_then_reported(tmp_path, folder):
+    class FlakyStore(LocalObjectStore):
+        def __init__(self, root_dir, failures):
+            super().__init__(root_dir)
+            self.failures = failures
+            self.attempts = {}
+
+        def upload_file(self, local_path, key):
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            if self.attempts[key] <= self.failures.get(key, 0):
+                raise IOError(f"upload of {key} failed")
+            super().upload_file(local_path, key)
+
+    store = FlakyStore(str(tmp_path / "bucket"), {"model.pkl": 1, "data/train.npy": 5})
+    syncer = S3Sync(store=store, max_retries=3, retry_backoff_seconds=0)
+    result = syncer.sync_folder_to_s3(folder, "s3://bucket")
+
+    assert result.transferred == ["model.pkl"]
+    assert store.attempts == {"model.pkl": 2, "data/train.npy": 3}
+    assert not result.success and list(result.failed) == ["data/train.npy"]
+
+    # Only the uploaded file is in the remote manifest, so the next sync retries the other
+    store.failures = {}
+    result = syncer.sync_folder_to_s3(folder, "s3://bucket")
+    assert result.transferred == ["data/train.npy"]
+    assert result.skipped == ["model.pkl"]
+
+
+def test_leftover_temp_files_are_not_synced(tmp_path, folder):
+    _write(os.path.join(folder, "model.pkl.part"), b"half a download")
+    _write(os.path.join(folder, "data", "part-00001.csv.123.tmp"), b"half a partition")
+    store = LocalObjectStore(str(tmp_path / "bucket"))
+
+    result = S3Sync(store=store).sync_folder_to_s3(folder, "s3://bucket")
+    assert sorted(result.transferred) == ["data/train.npy", "model.pkl"]
+    assert store.read_bytes("model.pkl.part") is None
+
+
+def test_conditional_write_rejects_a_stale_version(tmp_path):
+    store = LocalObjectStore(str(tmp_path / "bucket"))
+    assert store.write_if_version("manifest", b"first", None)
+    assert not store.write_if_version("manifest", b"again", None)
+
+    data, version = store.read_versioned("manifest")
+    assert store.write_if_version("manifest", b"second", version)
+    assert not store.write_if_version("manifest", b"stale", version)
+    assert store.read_bytes("manifest") == b"second"
+
+
+def test_manifest_update_keeps_a_concurrent_sync(tmp_path, folder):
+    other_folder = tmp_path / "other"
+    _write(str(other_folder / "report.yaml"), b"report")
+
+    class RacingStore(LocalObjectStore):
+        """Another sync finishes between this sync's manifest read and write."""
+        raced = False
+
+        def write_if_version(self, key, data, version):
+            if not self.raced:
+                self.raced = True
+                S3Sync(store=LocalObjectStore(self.root_dir)).sync_folder_to_s3(str(other_folder), "s3://bucket")
+            return super().write_if_version(key, data, version)
+
+    store = RacingStore(str(tmp_path / "bucket"))
+    S3Sync(store=store, retry_backoff_seconds=0).sync_folder_to_s3(folder, "s3://bucket")
+
+    restored = S3Sync(store=store).sync_folder_from_s3(str(tmp_path / "restored"), "s3://bucket")
+    assert sorted(restored.transferred) == ["data/train.npy", "model.pkl", "report.yaml"]
+
+
+def test_concurrent_syncs_to_one_prefix_keep_every_entry(tmp_path):
+    folders = []
+    for index in range(4):
+        folder = tmp_path / f"worker{index}"
+        _write(str(folder / f"file{index}.bin"), bytes([index]) * 100)
+        folders.append(str(folder))
+    store = LocalObjectStore(str(tmp_path / "bucket"))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda folder: S3Sync(store=store, retry_backoff_seconds=0.01).sync_folder_to_s3(folder, "s3://bucket"),
+            folders,
+        ))
+
+    assert all(result.success for result in results)
+    manifest = json.loads(store.read_bytes(MANIFEST_FILE_NAME))
+    assert sorted(manifest) == [f"file{index}.bin" for index in range(4)]
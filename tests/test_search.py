@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.utils.ml_utils.model.search import GridSearch, SuccessiveHalvingSearch, WarmStartSearch
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, y = make_classification(n_samples=600, n_features=8, n_informative=4, random_state=0)
+    return X, y
+
+
+HALVING_CASES = [
+    (RandomForestClassifier(random_state=0), {"n_estimators": [4, 8, 16], "max_depth": [2, 4, 8]}),
+    (GradientBoostingClassifier(random_state=0),
+     {"learning_rate": [0.1, 0.05], "subsample": [0.7, 0.9], "n_estimators": [8, 16, 32]}),
+    (AdaBoostClassifier(random_state=0), {"learning_rate": [0.1, 0.01], "n_estimators": [8, 16, 32]}),
+    (DecisionTreeClassifier(random_state=0), {"criterion": ["gini", "entropy", "log_loss"], "max_depth": [2, 4, 8]}),
+]
+
+
+@pytest.mark.parametrize("estimator, param_grid", HALVING_CASES)
+def test_halving_costs_less_than_the_grid_and_audits_on_the_same_folds(data, estimator, param_grid):
+    X, y = data
+    halving = SuccessiveHalvingSearch(cv=3, n_jobs=1, cv_seed=0, min_resources=30, audit=True)
+    result = halving.search(estimator, param_grid, X, y)
+
+    # Halving runs more, smaller fits; weighted by rows they cost less than the grid
+    assert result.n_fits > result.n_exhaustive_fits
+    assert result.fit_cost < result.n_exhaustive_fits
+    assert result.fits_skipped > 0
+
+    grid = GridSearch(cv=3, n_jobs=1, cv_seed=0).search(estimator, param_grid, X, y)
+    # The last rung runs on all rows in their original order, i.e. on the grid's folds
+    assert result.score_given_up >= 0
+    assert result.score_given_up == pytest.approx(grid.best_score - result.best_score)
+
+
+def test_grid_search_reports_no_skipped_fits(data):
+    X, y = data
+    result = GridSearch(cv=3, n_jobs=1).search(DecisionTreeClassifier(random_state=0), {"max_depth": [2, 4]}, X, y)
+    assert result.n_fits == result.n_exhaustive_fits == 6
+    assert result.fits_skipped == 0
+
+
+def test_spent_budget_keeps_the_first_rung_winner(data):
+    X, y = data
+    halving = SuccessiveHalvingSearch(cv=3, n_jobs=1, min_resources=30, time_budget=0)
+    result = halving.search(DecisionTreeClassifier(random_state=0), {"max_depth": [1, 2, 4, 8, None]}, X, y)
+
+    assert result.best_params["max_depth"] in [1, 2, 4, 8, None]
+    assert result.n_fits == 5 * 3
+    assert np.isfinite(result.best_score)
+
+
+WARM_START_CASES = [
+    (RandomForestClassifier(random_state=0), {"max_depth": [2, 4], "n_estimators": [2, 4, 8, 16]}),
+    (GradientBoostingClassifier(random_state=0),
+     {"learning_rate": [0.1, 0.01], "subsample": [0.7, 1.0], "n_estimators": [4, 8, 16, 32]}),
+    (AdaBoostClassifier(random_state=0), {"learning_rate": [1.0, 0.1], "n_estimators": [4, 8, 16, 32]}),
+]
+
+
+@pytest.mark.parametrize("estimator, param_grid", WARM_START_CASES)
+def test_warm_start_picks_the_grid_search_winner(data, estimator, param_grid):
+    X, y = data
+    grid = GridSearch(cv=3, n_jobs=1, cv_seed=0).search(estimator, param_grid, X, y)
+    warm = WarmStartSearch(cv=3, n_jobs=1, cv_seed=0).search(estimator, param_grid, X, y)
+
+    assert warm.best_params == grid.best_params
+    assert warm.best_score == pytest.approx(grid.best_score)
+    np.testing.assert_array_equal(warm.best_estimator.predict(X), grid.best_estimator.predict(X))
+    # One fit per configuration and fold instead of one per n_estimators value
+    assert warm.n_fits == grid.n_fits // len(param_grid["n_estimators"])
+
@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.serving.stream_worker import FileSink, StdinSource, StreamScoringWorker
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+
+
+class StaticLoader:
+    def __init__(self, model):
+        self.model = model
+        self.version = "test"
+
+    def get(self):
+        return self.model
+
+
+@pytest.fixture(scope="module")
+def worker():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.choice([-1, 0, 1], size=(200, 3)), columns=["a", "b", "c"])
+    y = (X["a"] > 0).astype(int)
+    preprocessor = Pipeline([("imputer", KNNImputer())]).fit(X)
+    model = NetworkModel(preprocessor, DecisionTreeClassifier(random_state=0).fit(preprocessor.transform(X), y))
+    return StreamScoringWorker(StdinSource(), FileSink(), model_loader=StaticLoader(model))
+
+
+def _lines(records):
+    return [json.dumps(record).encode() if not isinstance(record, bytes) else record for record in records]
+
+
+def test_batch_is_scored_in_order_with_passthrough_keys(worker):
+    payload, scored, invalid, _ = worker._score(_lines([
+        {"id": 1, "a": 1, "b": 0, "c": -1},
+        {"id": 2, "a": -1, "b": "na", "c": 1},
+        {"id": 3, "a": 1},
+    ]))
+    rows = [json.loads(line) for line in payload.decode().splitlines()]
+    assert (scored, invalid) == (3, 0)
+    assert [row["id"] for row in rows] == [1, 2, 3]
+    assert [row[worker.prediction_column] for row in rows] == [1, 0, 1]
+
+
+def test_bad_row_does_not_reject_the_batch(worker):
+    payload, scored, invalid, _ = worker._score(_lines([
+        {"id": 1, "a": 1, "b": 0, "c": -1},
+        {"id": 2, "a": "not a number", "b": 0, "c": 0},
+        b"{broken json",
+        {"id": 3, "a": -1, "b": 1, "c": 1},
+    ]))
+    rows = [json.loads(line) for line in payload.decode().splitlines()]
+    assert (scored, invalid) == (2, 2)
+    assert [row["id"] for row in rows] == [1, 3]
+    assert [row[worker.prediction_column] for row in rows] == [1, 0]
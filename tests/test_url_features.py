@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.utils.ml_utils.features.url_features import FEATURE_COLUMNS, extract_url_features
+
+LEXICAL_COLUMNS = (
+    "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
+    "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "SSLfinal_State",
+    "port", "HTTPS_token",
+)
+
+# (column, url, expected code); NaN where the URL alone cannot tell
+CASES = [
+    ("having_IP_Address", "http://192.168.1.10/login", -1),
+    ("having_IP_Address", "http://0x7f.0x00.0x00.0x01/", -1),
+    ("having_IP_Address", "http://3232235777/", -1),
+    ("having_IP_Address", "http://[2001:db8::1]/", -1),
+    ("having_IP_Address", "https://example.com/", 1),
+
+    ("URL_Length", "https://example.com/", 1),
+    ("URL_Length", "https://example.com/" + "a" * 40, 0),
+    ("URL_Length", "https://example.com/" + "a" * 80, -1),
+
+    ("Shortining_Service", "https://bit.ly/3xyz", -1),
+    ("Shortining_Service", "http://www.tinyurl.com/abc", -1),
+    ("Shortining_Service", "https://bitly.example.com/", 1),
+
+    ("having_At_Symbol", "http://paypal.com@evil.example/", -1),
+    ("having_At_Symbol", "https://example.com/user", 1),
+
+    ("double_slash_redirecting", "http://example.com//http://evil.example", -1),
+    ("double_slash_redirecting", "https://example.com/path", 1),
+
+    ("Prefix_Suffix", "https://secure-paypal.com/", -1),
+    ("Prefix_Suffix", "https://paypal.com/a-b-c", 1),
+
+    ("having_Sub_Domain", "https://www.example.com/", 1),
+    ("having_Sub_Domain", "https://example.co.uk/", 1),
+    ("having_Sub_Domain", "https://mail.example.com/", 0),
+    ("having_Sub_Domain", "https://a.b.example.com/", -1),
+
+    ("SSLfinal_State", "http://example.com/", -1),
+    ("SSLfinal_State", "https://example.com/", np.nan),
+
+    ("port", "http://example.com:8080/", -1),
+    ("port", "https://example.com:443/", 1),
+    ("port", "https://example.com/", 1),
+
+    ("HTTPS_token", "http://https-paypal.com/", -1),
+    ("HTTPS_token", "https://paypal.com/https", 1),
+]
+
+
+@pytest.mark.parametrize("column, url, expected", CASES)
+def test_lexical_feature_codes(column, url, expected):
+    value = extract_url_features([url])[column].iloc[0]
+    if np.isnan(expected):
+        assert np.isnan(value)
+    else:
+        assert value == expected
+
+
+# Codes each feature can take; https is NaN for SSLfinal_State, checked above
+COLUMN_CODES = {"URL_Length": {-1, 0, 1}, "having_Sub_Domain": {-1, 0, 1}, "SSLfinal_State": {-1}}
+
+
+@pytest.mark.parametrize("column", LEXICAL_COLUMNS)
+def test_every_code_of_a_column_is_covered(column):
+    covered = {code for case_column, _, code in CASES if case_column == column and not np.isnan(code)}
+    assert covered == COLUMN_CODES.get(column, {-1, 1})
+
+
+def test_frame_has_schema_columns_and_index():
+    urls = pd.Series(["https://example.com/", "192.168.0.1"], index=["a", "b"])
+    frame = extract_url_features(urls)
+
+    assert tuple(frame.columns) == FEATURE_COLUMNS
+    assert list(frame.index) == ["a", "b"]
+    # Without a scheme the URL is parsed as if it started with "//"
+    assert frame.loc["b", "having_IP_Address"] == -1
+    # Content, WHOIS and traffic features are left to the imputer
+    assert frame.drop(columns=list(LEXICAL_COLUMNS)).isna().all().all()
+
+
+def test_empty_and_missing_urls_are_all_nan():
+    frame = extract_url_features(["", None, "  "])
+    assert frame.isna().all().all()
+
+
+def test_no_urls():
+    frame = extract_url_features([])
+    assert frame.empty and tuple(frame.columns) == FEATURE_COLUMNS
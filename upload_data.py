@@ -1,11 +1,7 @@
-from pymongo.mongo_client import MongoClient
+from networksecurity.cloud.mongo_client import get_mongo_client
 import pandas as pd
-import os
-from dotenv import load_dotenv
 
-load_dotenv()
-uri = os.getenv('MONGO_DB_URL')
-client = MongoClient(uri)
+client = get_mongo_client()
 
 # Your database and collection (matching your config)
 db = client["Mahesh"]